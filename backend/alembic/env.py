@@ -1,3 +1,5 @@
+import os
+import sys
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -14,11 +16,21 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+# The application modules import each other as top-level packages
+# (``from db import ...``), so make ``backend/app`` importable.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app"))
+
+from db import DatabaseConnection  # noqa: E402
+from db.session import Base  # noqa: E402
+
+target_metadata = Base.metadata
+
+# Migrate the application's own database unless a URL was configured explicitly
+if config.get_main_option("sqlalchemy.url", "").startswith("driver://"):
+    config.set_main_option(
+        "sqlalchemy.url",
+        DatabaseConnection().engine.url.render_as_string(hide_password=False),
+    )
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -65,7 +77,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can only ALTER tables by copying them
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
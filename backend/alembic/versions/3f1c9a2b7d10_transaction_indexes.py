@@ -0,0 +1,35 @@
+"""composite indexes on transactions for monthly lookups
+
+Revision ID: 3f1c9a2b7d10
+Revises:
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a2b7d10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    "ix_transactions_category_type_date": ["category_id", "type", "date"],
+    "ix_transactions_account_date": ["account_id", "date"],
+    "ix_transactions_type_date": ["type", "date"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "transactions", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="transactions", if_exists=True)
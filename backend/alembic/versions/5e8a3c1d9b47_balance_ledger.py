@@ -0,0 +1,64 @@
+"""balance ledger and checkpoints
+
+Revision ID: 5e8a3c1d9b47
+Revises: c4d7e1f05a92
+Create Date: 2026-10-18 16:03:21.730514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8a3c1d9b47"
+down_revision: Union[str, None] = "c4d7e1f05a92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    ledger = op.create_table(
+        "balance_ledger",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "account_id", sa.String(), sa.ForeignKey("accounts.id"), nullable=False
+        ),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("transaction_id", sa.String()),
+        sa.Column("posted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_balance_ledger_account_id", "balance_ledger", ["account_id", "id"])
+    op.create_table(
+        "balance_checkpoints",
+        sa.Column(
+            "account_id", sa.String(), sa.ForeignKey("accounts.id"), primary_key=True
+        ),
+        sa.Column("entry_id", sa.Integer(), primary_key=True),
+        sa.Column("balance", sa.BigInteger(), nullable=False),
+        sa.Column("posted_at", sa.DateTime(), nullable=False),
+    )
+
+    # Seed the ledger with each account's current balance as its opening entry
+    accounts = sa.table(
+        "accounts", sa.column("id", sa.String()), sa.column("balance", sa.BigInteger())
+    )
+    op.execute(
+        ledger.insert().from_select(
+            ["account_id", "amount", "kind", "posted_at"],
+            sa.select(
+                accounts.c.id,
+                accounts.c.balance,
+                sa.literal("opening"),
+                sa.func.current_timestamp(),
+            ).where(accounts.c.balance != 0),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("balance_checkpoints")
+    op.drop_index("ix_balance_ledger_account_id", table_name="balance_ledger")
+    op.drop_table("balance_ledger")
@@ -0,0 +1,37 @@
+"""subscription recurrence: interval, anchor and end date
+
+Revision ID: 6c1e8f3a9d25
+Revises: e2b8d4f6a1c7
+Create Date: 2026-10-18 20:41:09.372518
+
+Existing schedules are anchored on their next payment, which is where their
+day of month would be read from today.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6c1e8f3a9d25"
+down_revision: Union[str, None] = "e2b8d4f6a1c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "subscriptions",
+        sa.Column("interval", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.add_column("subscriptions", sa.Column("anchor", sa.DateTime(), nullable=True))
+    op.add_column("subscriptions", sa.Column("end_date", sa.DateTime(), nullable=True))
+    op.execute("UPDATE subscriptions SET anchor = next_payment")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("subscriptions") as batch:
+        batch.drop_column("end_date")
+        batch.drop_column("anchor")
+        batch.drop_column("interval")
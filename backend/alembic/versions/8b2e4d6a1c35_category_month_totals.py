@@ -0,0 +1,60 @@
+"""category_month_totals rollup table
+
+Revision ID: 8b2e4d6a1c35
+Revises: 3f1c9a2b7d10
+Create Date: 2026-10-18 10:41:07.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e4d6a1c35"
+down_revision: Union[str, None] = "3f1c9a2b7d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    totals = op.create_table(
+        "category_month_totals",
+        sa.Column(
+            "category_id", sa.String(), sa.ForeignKey("categories.id"), primary_key=True
+        ),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Integer(), primary_key=True),
+        sa.Column("type", sa.String(), primary_key=True),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+    # Backfill from existing transactions
+    transactions = sa.table(
+        "transactions",
+        sa.column("category_id", sa.String()),
+        sa.column("date", sa.DateTime()),
+        sa.column("type", sa.String()),
+        sa.column("amount", sa.Float()),
+    )
+    year = sa.cast(sa.extract("year", transactions.c.date), sa.Integer)
+    month = sa.cast(sa.extract("month", transactions.c.date), sa.Integer)
+    op.execute(
+        totals.insert().from_select(
+            ["category_id", "year", "month", "type", "total", "count"],
+            sa.select(
+                transactions.c.category_id,
+                year,
+                month,
+                transactions.c.type,
+                sa.func.sum(transactions.c.amount),
+                sa.func.count(),
+            ).group_by(transactions.c.category_id, year, month, transactions.c.type),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("category_month_totals")
@@ -0,0 +1,33 @@
+"""index on transactions for per-subscription payment history
+
+Revision ID: 9d4f2b6e8a13
+Revises: 5e8a3c1d9b47
+Create Date: 2026-10-18 17:41:09.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f2b6e8a13"
+down_revision: Union[str, None] = "5e8a3c1d9b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_subscription_date",
+        "transactions",
+        ["subscription_id", "date"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transactions_subscription_date", table_name="transactions", if_exists=True
+    )
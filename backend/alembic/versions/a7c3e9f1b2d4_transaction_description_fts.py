@@ -0,0 +1,74 @@
+"""full-text index on transaction descriptions
+
+Revision ID: a7c3e9f1b2d4
+Revises: 9d4f2b6e8a13
+Create Date: 2026-10-18 18:26:52.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1b2d4"
+down_revision: Union[str, None] = "9d4f2b6e8a13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, content='transactions', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO transactions_fts(rowid, description)
+        VALUES (new.rowid, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_au
+    AFTER UPDATE OF description ON transactions
+    BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+        INSERT INTO transactions_fts(rowid, description)
+        VALUES (new.rowid, new.description);
+    END""",
+    # Index the existing history
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TABLE IF EXISTS transactions_fts",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_description_fts "
+            "ON transactions USING gin "
+            "(to_tsvector('simple'::regconfig, coalesce(description, '')))"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_description_fts")
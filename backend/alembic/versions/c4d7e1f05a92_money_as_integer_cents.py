@@ -0,0 +1,131 @@
+"""store money columns as integer cents
+
+Revision ID: c4d7e1f05a92
+Revises: 8b2e4d6a1c35
+Create Date: 2026-10-18 14:12:40.118406
+
+Each Float amount column is converted in place of a new BigInteger column:
+the new column is added, filled in committed chunks (so a large table never
+holds one long write lock), then swapped in for the old one. Re-running after
+an interruption picks up where the previous run stopped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d7e1f05a92"
+down_revision: Union[str, None] = "8b2e4d6a1c35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (primary key columns, money columns)
+MONEY_COLUMNS = {
+    "accounts": (["id"], ["balance"]),
+    "categories": (["id"], ["budget"]),
+    "transactions": (["id"], ["amount"]),
+    "subscriptions": (["id"], ["amount"]),
+    "category_month_totals": (["category_id", "year", "month", "type"], ["total"]),
+}
+CHUNK_SIZE = 50000
+
+
+def _column_types(table_name):
+    inspector = sa.inspect(op.get_bind())
+    return {c["name"]: c["type"] for c in inspector.get_columns(table_name)}
+
+
+def _fill_in_chunks(table_name, key_columns, source, target, expression):
+    # UPDATE ... WHERE key IN (next CHUNK_SIZE unconverted keys), committing
+    # after every chunk, until nothing is left to convert
+    table = sa.table(
+        table_name, *[sa.column(name) for name in key_columns + [source, target]]
+    )
+    keys = sa.tuple_(*[table.c[name] for name in key_columns])
+    pending = (
+        sa.select(*[table.c[name] for name in key_columns])
+        .where(table.c[target].is_(None), table.c[source].is_not(None))
+        .limit(CHUNK_SIZE)
+    )
+    if len(key_columns) == 1:
+        keys, pending = table.c[key_columns[0]], pending.scalar_subquery()
+    statement = (
+        table.update().where(keys.in_(pending)).values({target: sa.text(expression)})
+    )
+    with op.get_context().autocommit_block():
+        while op.get_bind().execute(statement).rowcount:
+            pass
+
+
+def _convert(table_name, key_columns, column, new_type, expression):
+    temporary = f"{column}_converted"
+    existing = _column_types(table_name)
+    if temporary not in existing:
+        if isinstance(existing[column], sa.Integer) == isinstance(new_type, sa.Integer):
+            # Already converted by an earlier, interrupted run
+            return
+        op.add_column(table_name, sa.Column(temporary, new_type, nullable=True))
+    _fill_in_chunks(table_name, key_columns, column, temporary, expression)
+    with op.batch_alter_table(table_name) as batch:
+        batch.drop_column(column)
+        batch.alter_column(
+            temporary, new_column_name=column, existing_type=new_type, nullable=False
+        )
+
+
+def upgrade() -> None:
+    for table_name, (key_columns, columns) in MONEY_COLUMNS.items():
+        for column in columns:
+            _convert(
+                table_name,
+                key_columns,
+                column,
+                sa.BigInteger(),
+                f"CAST(ROUND({column} * 100) AS BIGINT)",
+            )
+
+    # Rebuild the rollup from the converted transactions: rounding each
+    # transaction is exact, rounding float sums per month is not
+    totals = sa.table(
+        "category_month_totals",
+        *[sa.column(name) for name in MONEY_COLUMNS["category_month_totals"][0]],
+        sa.column("total"),
+        sa.column("count"),
+    )
+    transactions = sa.table(
+        "transactions",
+        sa.column("category_id", sa.String()),
+        sa.column("date", sa.DateTime()),
+        sa.column("type", sa.String()),
+        sa.column("amount", sa.BigInteger()),
+    )
+    year = sa.cast(sa.extract("year", transactions.c.date), sa.Integer)
+    month = sa.cast(sa.extract("month", transactions.c.date), sa.Integer)
+    op.execute(totals.delete())
+    op.execute(
+        totals.insert().from_select(
+            ["category_id", "year", "month", "type", "total", "count"],
+            sa.select(
+                transactions.c.category_id,
+                year,
+                month,
+                transactions.c.type,
+                sa.func.sum(transactions.c.amount),
+                sa.func.count(),
+            ).group_by(transactions.c.category_id, year, month, transactions.c.type),
+        )
+    )
+
+
+def downgrade() -> None:
+    for table_name, (key_columns, columns) in MONEY_COLUMNS.items():
+        for column in columns:
+            _convert(
+                table_name,
+                key_columns,
+                column,
+                sa.Float(),
+                f"{column} / 100.0",
+            )
@@ -0,0 +1,38 @@
+"""per-resource version counters for ETags
+
+Revision ID: e2b8d4f6a1c7
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-18 19:02:37.615290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b8d4f6a1c7"
+down_revision: Union[str, None] = "a7c3e9f1b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    resource_versions = op.create_table(
+        "resource_versions",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(
+        resource_versions,
+        [
+            {"name": name, "version": 0}
+            for name in ("accounts", "categories", "transactions", "subscriptions")
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("resource_versions")
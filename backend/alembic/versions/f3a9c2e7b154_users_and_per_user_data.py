@@ -0,0 +1,231 @@
+"""users, and every row owned by one
+
+Revision ID: f3a9c2e7b154
+Revises: 6c1e8f3a9d25
+Create Date: 2026-10-18 23:06:52.804113
+
+Existing data is given to the "default" user, whom requests without an API
+key keep acting as. user_id is added to the owned tables (without rewriting
+them: it comes with a default) and leads their hot indexes; names become
+unique per user. The tables whose primary key gains user_id (the rollup,
+ledger checkpoints and resource versions) are copied into new tables.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c2e7b154"
+down_revision: Union[str, None] = "6c1e8f3a9d25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_USER_ID = "default"
+
+OWNED_TABLES = (
+    "accounts",
+    "categories",
+    "subscriptions",
+    "transactions",
+    "balance_ledger",
+)
+# Tables whose names become unique per user
+NAMED_TABLES = ("accounts", "categories", "subscriptions")
+# (table, old index, old columns, new index, new columns)
+INDEXES = [
+    (
+        "transactions",
+        "ix_transactions_category_type_date",
+        ["category_id", "type", "date"],
+        "ix_transactions_user_category_type_date",
+        ["user_id", "category_id", "type", "date"],
+    ),
+    (
+        "transactions",
+        "ix_transactions_account_date",
+        ["account_id", "date"],
+        "ix_transactions_user_account_date",
+        ["user_id", "account_id", "date"],
+    ),
+    (
+        "transactions",
+        "ix_transactions_type_date",
+        ["type", "date"],
+        "ix_transactions_user_type_date",
+        ["user_id", "type", "date"],
+    ),
+    (
+        "transactions",
+        "ix_transactions_subscription_date",
+        ["subscription_id", "date"],
+        "ix_transactions_user_subscription_date",
+        ["user_id", "subscription_id", "date"],
+    ),
+    (
+        "balance_ledger",
+        "ix_balance_ledger_account_id",
+        ["account_id", "id"],
+        "ix_balance_ledger_user_account_id",
+        ["user_id", "account_id", "id"],
+    ),
+]
+
+
+def _rekeyed_tables():
+    # table -> (columns without user_id, primary key without user_id)
+    return {
+        "category_month_totals": (
+            [
+                sa.Column("category_id", sa.String(), sa.ForeignKey("categories.id")),
+                sa.Column("year", sa.Integer()),
+                sa.Column("month", sa.Integer()),
+                sa.Column("type", sa.String()),
+                sa.Column("total", sa.BigInteger(), nullable=False),
+                sa.Column("count", sa.Integer(), nullable=False),
+            ],
+            ["category_id", "year", "month", "type"],
+        ),
+        "balance_checkpoints": (
+            [
+                sa.Column("account_id", sa.String(), sa.ForeignKey("accounts.id")),
+                sa.Column("entry_id", sa.Integer()),
+                sa.Column("balance", sa.BigInteger(), nullable=False),
+                sa.Column("posted_at", sa.DateTime(), nullable=False),
+            ],
+            ["account_id", "entry_id"],
+        ),
+        "resource_versions": (
+            [
+                sa.Column("name", sa.String()),
+                sa.Column("version", sa.Integer(), nullable=False),
+            ],
+            ["name"],
+        ),
+    }
+
+
+def _is_sqlite():
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def _copy_table(name, columns, primary_key, with_user):
+    # Replace ``name`` by a copy with (or without) user_id leading its
+    # primary key; copied rows belong to the default user
+    user_column = [
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False)
+    ]
+    new = op.create_table(
+        f"{name}_new",
+        *(user_column if with_user else []),
+        *columns,
+        sa.PrimaryKeyConstraint(*(["user_id"] if with_user else []), *primary_key),
+    )
+    names = [column.name for column in columns]
+    old = sa.table(name, *[sa.column(column) for column in names])
+    source = [old.c[column] for column in names]
+    if with_user:
+        names, source = ["user_id"] + names, [sa.literal(DEFAULT_USER_ID)] + source
+    op.execute(new.insert().from_select(names, sa.select(*source)))
+    op.drop_table(name)
+    op.rename_table(f"{name}_new", name)
+    if not _is_sqlite():
+        op.execute(
+            f"ALTER TABLE {name} RENAME CONSTRAINT {name}_new_pkey TO {name}_pkey"
+        )
+
+
+def upgrade() -> None:
+    users = op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("api_key_hash", sa.String(), unique=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.bulk_insert(
+        users,
+        [
+            {
+                "id": DEFAULT_USER_ID,
+                "name": DEFAULT_USER_ID,
+                "created_at": datetime.utcnow(),
+            }
+        ],
+    )
+
+    sqlite = _is_sqlite()
+    for table in OWNED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "user_id", sa.String(), nullable=False, server_default=DEFAULT_USER_ID
+            ),
+        )
+        if not sqlite:
+            # SQLite cannot add the constraint (nor drop the default) in place
+            op.alter_column(table, "user_id", server_default=None)
+            op.create_foreign_key(
+                f"{table}_user_id_fkey", table, "users", ["user_id"], ["id"]
+            )
+
+    for table in NAMED_TABLES:
+        # The unique constraint on name came from ``unique=True``: unnamed on
+        # SQLite (named here for the batch copy), <table>_name_key on Postgres
+        with op.batch_alter_table(
+            table, naming_convention={"uq": "uq_%(table_name)s_%(column_0_name)s"}
+        ) as batch:
+            batch.drop_constraint(
+                f"uq_{table}_name" if sqlite else f"{table}_name_key", type_="unique"
+            )
+            batch.create_unique_constraint(f"uq_{table}_user_name", ["user_id", "name"])
+
+    for table, old_index, _, new_index, columns in INDEXES:
+        op.drop_index(old_index, table_name=table)
+        op.create_index(new_index, table, columns)
+    op.create_index(
+        "ix_subscriptions_user_next_payment",
+        "subscriptions",
+        ["user_id", "next_payment"],
+    )
+
+    for name, (columns, primary_key) in _rekeyed_tables().items():
+        _copy_table(name, columns, primary_key, with_user=True)
+
+
+def downgrade() -> None:
+    others = op.get_bind().scalar(
+        sa.text("SELECT count(*) FROM users WHERE id != :id"), {"id": DEFAULT_USER_ID}
+    )
+    if others:
+        raise RuntimeError(
+            "Users other than the default one exist; downgrading would merge "
+            "their data (and clash on names). Remove them first."
+        )
+
+    sqlite = _is_sqlite()
+    for name, (columns, primary_key) in _rekeyed_tables().items():
+        _copy_table(name, columns, primary_key, with_user=False)
+
+    op.drop_index("ix_subscriptions_user_next_payment", table_name="subscriptions")
+    for table, old_index, columns, new_index, _ in INDEXES:
+        op.drop_index(new_index, table_name=table)
+        op.create_index(old_index, table, columns)
+
+    for table in NAMED_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(f"uq_{table}_user_name", type_="unique")
+            batch.create_unique_constraint(
+                f"uq_{table}_name" if sqlite else f"{table}_name_key", ["name"]
+            )
+
+    for table in OWNED_TABLES:
+        if not sqlite:
+            op.drop_constraint(f"{table}_user_id_fkey", table, type_="foreignkey")
+        # A plain ALTER TABLE .. DROP COLUMN (SQLite 3.35+): a batch copy of
+        # transactions would lose the full-text index triggers
+        op.drop_column(table, "user_id")
+
+    op.drop_table("users")
@@ -0,0 +1,49 @@
+# fortuna/backend/app/api/api.py
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+from core.config import get_settings
+from db.async_session import AsyncDatabaseConnection
+from api.errors import add_exception_handlers
+from api.v1.REST import accounts, auth, categories, subscriptions, transactions
+from api.v1.graphql.schema import graphql_router
+from utils.background_tasks import scheduler
+from utils.cache import cache_stats
+from utils.instrumentation import render_prometheus
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().scheduler_enabled:
+        await scheduler.start()
+    yield
+    await scheduler.stop()
+    await AsyncDatabaseConnection().dispose()
+
+
+api_router = APIRouter(prefix="/api/v1")
+api_router.include_router(auth.router)
+api_router.include_router(accounts.router)
+api_router.include_router(categories.router)
+api_router.include_router(transactions.router)
+api_router.include_router(subscriptions.router)
+api_router.include_router(graphql_router, prefix="/graphql", tags=["graphql"])
+
+
+@api_router.get("/cache/stats", tags=["monitoring"])
+async def get_cache_stats():
+    # Hit/miss counters of the in-process entity and response caches
+    return cache_stats()
+
+
+app = FastAPI(title="Fortuna", lifespan=lifespan)
+app.include_router(api_router)
+add_exception_handlers(app)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Per-service-method SQL histograms for Prometheus scraping
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,76 @@
+# fortuna/backend/app/api/conditional.py
+import hashlib
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import get_settings
+from db import versions
+from db.tenancy import current_user
+from utils.cache import response_cache
+
+_settings = get_settings()
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def make_etag(
+    request: Request, resource_versions: Sequence[int], user_id: Optional[str]
+) -> str:
+    # The versions plus a digest of the user and the normalised URL, so every
+    # page and filter of a resource has its own tag and the tag can key the
+    # cache. Versions are per user: without the user, two users' tags (and
+    # cached bodies) could collide.
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = f"{user_id}\n{request.url.path}?{query}".encode()
+    digest = hashlib.blake2b(key, digest_size=8).hexdigest()
+    return f'W/"{".".join(map(str, resource_versions))}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires (RFC 9110, 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+async def conditional_get(
+    request: Request,
+    db: AsyncSession,
+    resources: Sequence[str],
+    model: Any,
+    load: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Answer a GET from the version counters of ``resources`` if possible.
+
+    One primary key lookup gives the ETag; a matching ``If-None-Match`` gets
+    a 304 and a known ETag the cached body, neither calling ``load``.
+    Otherwise ``load()``'s result is serialized as ``model`` (what
+    ``response_model`` would do) and cached. The versions are read before
+    the data, so a body is never older than the tag it is stored under.
+    """
+    current = await db.run_sync(lambda s: versions.current(s, resources))
+    etag = make_etag(request, current, current_user(db))
+    # Clients may keep the body but must revalidate before using it
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = response_cache.get(etag)
+    if body is None:
+        adapter = _adapter(model)
+        body = adapter.dump_json(
+            adapter.validate_python(await load(), from_attributes=True)
+        )
+        if len(body) <= _settings.response_cache_max_bytes:
+            response_cache.set(etag, body)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,70 @@
+# fortuna/backend/app/api/deps.py
+from typing import AsyncIterator, Optional
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import get_settings
+from db.async_session import AsyncDatabaseConnection
+from db.tenancy import DEFAULT_USER_ID
+from services import UserService
+
+_settings = get_settings()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+async def get_users_db() -> AsyncIterator[AsyncSession]:
+    # Session without a user on the main database, for the users table
+    async with AsyncDatabaseConnection().get_session(None) as session:
+        yield session
+
+
+async def get_user_id(
+    authorization: Optional[str] = Header(None),
+    users_db: AsyncSession = Depends(get_users_db),
+) -> str:
+    """The user a request acts for, from ``Authorization: Bearer <api key>``.
+
+    Requests without the header act as the default user, unless
+    FORTUNA_AUTH_REQUIRED is set. Known keys are cached, so authenticating
+    is usually no query at all.
+    """
+    return await _authenticate(authorization, users_db, _settings.auth_required)
+
+
+async def get_authenticated_user_id(
+    authorization: Optional[str] = Header(None),
+    users_db: AsyncSession = Depends(get_users_db),
+) -> str:
+    # Like get_user_id, but a key is required even when anonymous requests
+    # are allowed: for routes acting on the key itself
+    return await _authenticate(authorization, users_db, required=True)
+
+
+async def _authenticate(
+    authorization: Optional[str], users_db: AsyncSession, required: bool
+) -> str:
+    if authorization is None:
+        if required:
+            raise _unauthorized("Not authenticated")
+        return DEFAULT_USER_ID
+    scheme, _, api_key = authorization.partition(" ")
+    api_key = api_key.strip()
+    if scheme.lower() != "bearer" or not api_key:
+        raise _unauthorized("Invalid authorization header")
+    user_id = await users_db.run_sync(lambda s: UserService(s).authenticate(api_key))
+    if user_id is None:
+        raise _unauthorized("Invalid API key")
+    return user_id
+
+
+async def get_db(user_id: str = Depends(get_user_id)) -> AsyncIterator[AsyncSession]:
+    # One async session per request, acting for the request's user (every
+    # query is limited to their rows, see db/tenancy.py). The services are
+    # synchronous and run via ``session.run_sync``, which drives them on the
+    # async driver without blocking the event loop.
+    async with AsyncDatabaseConnection().get_session(user_id) as session:
+        yield session
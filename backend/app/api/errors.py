@@ -0,0 +1,26 @@
+# fortuna/backend/app/api/errors.py
+from typing import Dict, Type
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from core.exceptions import FortunaError, InvalidInputError, NotFoundError
+
+# Most specific first: the first class the error is an instance of wins
+STATUS_CODES: Dict[Type[FortunaError], int] = {
+    NotFoundError: 404,
+    InvalidInputError: 400,
+}
+
+
+def status_code_for(error: FortunaError) -> int:
+    return next(
+        (code for cls, code in STATUS_CODES.items() if isinstance(error, cls)), 500
+    )
+
+
+async def _service_error(request: Request, error: FortunaError) -> JSONResponse:
+    # The body HTTPException would have produced: {"detail": ...}
+    return JSONResponse({"detail": error.detail}, status_code=status_code_for(error))
+
+
+def add_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(FortunaError, _service_error)
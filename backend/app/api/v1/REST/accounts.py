@@ -0,0 +1,158 @@
+# fortuna/backend/app/api/v1/REST/accounts.py
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.conditional import conditional_get
+from api.deps import get_db
+from schemas import Account, AccountCreate, AccountUpdate, AccountTransfer, Money
+from services import AccountService, ForecastService
+
+router = APIRouter(prefix="/accounts", tags=["accounts"])
+
+
+class AccountBalance(BaseModel):
+    account_id: str
+    balance: Money
+    # Only entries recorded before this time, not a transaction-date cutoff
+    posted_before: Optional[datetime] = None
+
+
+class TransferSummary(BaseModel):
+    transfers: int
+    total_amount: Money
+    account_deltas: Dict[str, Money]
+
+    class Config:
+        from_attributes = True
+
+
+class ForecastPoint(BaseModel):
+    day: date
+    balance: Money
+
+
+class AccountForecast(BaseModel):
+    account_id: str
+    lowest_balance: Money
+    lowest_on: date
+    points: List[ForecastPoint]
+
+
+class BalanceForecast(BaseModel):
+    start: date
+    end: date
+    accounts: List[AccountForecast]
+
+
+@router.get("", response_model=List[Account])
+async def list_accounts(request: Request, db: AsyncSession = Depends(get_db)):
+    async def load():
+        return await db.run_sync(lambda s: AccountService(s).get_all_accounts())
+
+    return await conditional_get(request, db, ["accounts"], List[Account], load)
+
+
+@router.post("", response_model=Account, status_code=201)
+async def create_account(account: AccountCreate, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(lambda s: AccountService(s).create_account(account))
+
+
+@router.post("/transfer", status_code=204)
+async def transfer_between_accounts(
+    transfer: AccountTransfer, db: AsyncSession = Depends(get_db)
+):
+    await db.run_sync(lambda s: AccountService(s).transfer_between_accounts(transfer))
+
+
+@router.post("/transfers", response_model=TransferSummary)
+async def transfer_batch(
+    transfers: List[AccountTransfer], db: AsyncSession = Depends(get_db)
+):
+    # All transfers are applied in one commit, or none of them
+    summary = await db.run_sync(lambda s: AccountService(s).transfer_batch(transfers))
+    return TransferSummary.model_validate(summary)
+
+
+@router.get("/forecast", response_model=BalanceForecast)
+async def forecast_balances(
+    months: int = Query(12, ge=1, le=60),
+    account_id: Optional[str] = None,
+    history_months: int = Query(6, ge=1, le=60),
+    daily: bool = Query(False, description="Every day instead of month ends"),
+    db: AsyncSession = Depends(get_db),
+):
+    # Projected balances from subscriptions, category budgets and income
+    forecast = await db.run_sync(
+        lambda s: ForecastService(s).forecast(months, account_id, history_months)
+    )
+    if daily:
+        days, balances = forecast.dates, forecast.balances
+    else:
+        days, balances = forecast.month_ends()
+    days = days.tolist()
+    lowest, lowest_on = forecast.lowest()
+    return BalanceForecast(
+        start=forecast.start,
+        end=forecast.end,
+        accounts=[
+            AccountForecast(
+                account_id=id,
+                lowest_balance=round(float(lowest[row]), 2),
+                lowest_on=lowest_on[row].item(),
+                points=[
+                    ForecastPoint(day=day, balance=balance)
+                    for day, balance in zip(days, balances[row].round(2).tolist())
+                ],
+            )
+            for row, id in enumerate(forecast.account_ids)
+        ],
+    )
+
+
+@router.get("/{account_id}", response_model=Account)
+async def get_account(
+    account_id: str, request: Request, db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        account = await db.run_sync(
+            lambda s: AccountService(s).get_account(account_id)
+        )
+        if not account:
+            raise HTTPException(status_code=404, detail="Account not found")
+        return account
+
+    return await conditional_get(request, db, ["accounts"], Account, load)
+
+
+@router.get("/{account_id}/balance", response_model=AccountBalance)
+async def get_account_balance(
+    account_id: str,
+    request: Request,
+    posted_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        balance = await db.run_sync(
+            lambda s: AccountService(s).get_balance(account_id, posted_before)
+        )
+        return AccountBalance(
+            account_id=account_id, balance=balance, posted_before=posted_before
+        )
+
+    return await conditional_get(request, db, ["accounts"], AccountBalance, load)
+
+
+@router.patch("/{account_id}", response_model=Account)
+async def update_account(
+    account_id: str, account: AccountUpdate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: AccountService(s).update_account(account_id, account)
+    )
+
+
+@router.delete("/{account_id}", status_code=204)
+async def delete_account(account_id: str, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(lambda s: AccountService(s).delete_account(account_id))
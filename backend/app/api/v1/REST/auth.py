@@ -0,0 +1,31 @@
+# fortuna/backend/app/api/v1/REST/auth.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.deps import get_authenticated_user_id, get_user_id, get_users_db
+from schemas import User, UserWithKey
+from services import UserService
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.get("/me", response_model=User)
+async def read_current_user(
+    user_id: str = Depends(get_user_id),
+    users_db: AsyncSession = Depends(get_users_db),
+):
+    user = await users_db.run_sync(lambda s: UserService(s).get_user(user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.post("/me/api-key", response_model=UserWithKey)
+async def rotate_api_key(
+    user_id: str = Depends(get_authenticated_user_id),
+    users_db: AsyncSession = Depends(get_users_db),
+):
+    # The new key is in the response only; the old one stops working. Needs
+    # the current key: an anonymous request (acting as the default user)
+    # must not take over the default user's key. Without one, issue it with
+    # ``cli.py users rotate-key``.
+    return await users_db.run_sync(lambda s: UserService(s).rotate_api_key(user_id))
@@ -0,0 +1,202 @@
+# fortuna/backend/app/api/v1/REST/categories.py
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.conditional import conditional_get
+from api.deps import get_db
+from schemas import (
+    Category,
+    CategoryCreate,
+    CategoryUpdate,
+    Money,
+    Page,
+    Transaction,
+)
+from services import CategoryService
+
+router = APIRouter(prefix="/categories", tags=["categories"])
+
+
+class CategoryStatus(BaseModel):
+    category_id: str
+    year: int
+    month: int
+    total: Money
+    remaining: Money
+    percentage: float
+
+
+class CategoryTotal(BaseModel):
+    category_id: str
+    total: Money
+
+
+class DashboardCategory(BaseModel):
+    id: str
+    name: str
+    type: str
+    budget: Money
+    # One value per entry of Dashboard.months
+    totals: List[Money]
+    remaining: List[Money]
+    percentages: List[float]
+
+    class Config:
+        from_attributes = True
+
+
+class Dashboard(BaseModel):
+    months: List[str]
+    categories: List[DashboardCategory]
+
+
+def _parse_month(value: str) -> Tuple[int, int]:
+    try:
+        year, month = (int(part) for part in value.split("-"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {value!r}")
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {value!r}")
+    return year, month
+
+
+@router.get("", response_model=List[Category])
+async def list_categories(request: Request, db: AsyncSession = Depends(get_db)):
+    async def load():
+        return await db.run_sync(lambda s: CategoryService(s).get_all_categories())
+
+    return await conditional_get(request, db, ["categories"], List[Category], load)
+
+
+@router.post("", response_model=Category, status_code=201)
+async def create_category(
+    category: CategoryCreate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(lambda s: CategoryService(s).create_category(category))
+
+
+@router.get("/dashboard", response_model=Dashboard)
+async def get_dashboard(
+    request: Request,
+    start: str = Query(..., description="First month, YYYY-MM", examples=["2024-01"]),
+    end: Optional[str] = Query(
+        None, description="Last month, YYYY-MM (default: start)", examples=["2024-12"]
+    ),
+    type: Optional[str] = Query(None, examples=["expense"]),
+    db: AsyncSession = Depends(get_db),
+):
+    # Budget status of every category for one month or a range of months
+    start_month = _parse_month(start)
+    end_month = _parse_month(end) if end else start_month
+    span = (end_month[0] - start_month[0]) * 12 + end_month[1] - start_month[1]
+    if span >= 120:
+        raise HTTPException(status_code=400, detail="At most 120 months at a time")
+
+    async def load():
+        dashboard = await db.run_sync(
+            lambda s: CategoryService(s).get_dashboard(start_month, end_month, type)
+        )
+        return Dashboard(
+            months=[f"{year}-{month:02d}" for year, month in dashboard.months],
+            categories=[
+                DashboardCategory.model_validate(row) for row in dashboard.categories
+            ],
+        )
+
+    return await conditional_get(request, db, ["categories"], Dashboard, load)
+
+
+@router.get("/{category_id}", response_model=Category)
+async def get_category(
+    category_id: str, request: Request, db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        category = await db.run_sync(
+            lambda s: CategoryService(s).get_category_by_id(category_id)
+        )
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return category
+
+    return await conditional_get(request, db, ["categories"], Category, load)
+
+
+@router.patch("/{category_id}", response_model=Category)
+async def update_category(
+    category_id: str, category: CategoryUpdate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: CategoryService(s).update_category(category_id, category)
+    )
+
+
+@router.delete("/{category_id}", status_code=204)
+async def delete_category(category_id: str, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(lambda s: CategoryService(s).delete_category(category_id))
+
+
+@router.get("/{category_id}/status", response_model=CategoryStatus)
+async def get_monthly_status(
+    category_id: str,
+    request: Request,
+    year: int = Query(..., examples=[2023]),
+    month: int = Query(..., ge=1, le=12, examples=[1]),
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        total, remaining, percentage = await db.run_sync(
+            lambda s: CategoryService(s).get_monthly_status(category_id, year, month)
+        )
+        return CategoryStatus(
+            category_id=category_id,
+            year=year,
+            month=month,
+            total=total,
+            remaining=remaining,
+            percentage=percentage,
+        )
+
+    return await conditional_get(request, db, ["categories"], CategoryStatus, load)
+
+
+@router.get("/{category_id}/total", response_model=CategoryTotal)
+async def get_total(
+    category_id: str, request: Request, db: AsyncSession = Depends(get_db)
+):
+    # All-time aggregate over the raw transactions (report query)
+    async def load():
+        total = await db.run_sync(
+            lambda s: CategoryService(s).get_total_transactions_in_category(
+                category_id
+            )
+        )
+        return CategoryTotal(category_id=category_id, total=total)
+
+    return await conditional_get(
+        request, db, ["categories", "transactions"], CategoryTotal, load
+    )
+
+
+@router.get("/{category_id}/transactions", response_model=Page[Transaction])
+async def list_category_transactions(
+    category_id: str,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        return await db.run_sync(
+            lambda s: CategoryService(s).list_transactions_in_category(
+                category_id, limit, cursor, start_date, end_date, type
+            )
+        )
+
+    return await conditional_get(
+        request, db, ["categories", "transactions"], Page[Transaction], load
+    )
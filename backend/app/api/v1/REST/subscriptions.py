@@ -0,0 +1,153 @@
+# fortuna/backend/app/api/v1/REST/subscriptions.py
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.conditional import conditional_get
+from api.deps import get_db
+from schemas import (
+    Money,
+    Page,
+    Subscription,
+    SubscriptionCreate,
+    SubscriptionUpdate,
+    Transaction,
+)
+from services import SubscriptionService
+
+router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
+
+
+class DuePaymentsSummary(BaseModel):
+    subscriptions: int
+    transactions: int
+    total_amount: Money
+    batches: int
+    account_deltas: Dict[str, Money]
+    skipped: List[Tuple[str, str]]
+
+    class Config:
+        from_attributes = True
+
+
+class SubscriptionTransactions(BaseModel):
+    subscription: Subscription
+    transactions: List[Transaction]
+
+    class Config:
+        from_attributes = True
+
+
+@router.get("", response_model=Page[Subscription])
+async def list_subscriptions(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    active: Optional[bool] = None,
+    account_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        return await db.run_sync(
+            lambda s: SubscriptionService(s).list_subscriptions(
+                limit, cursor, active, account_id, category_id
+            )
+        )
+
+    return await conditional_get(
+        request, db, ["subscriptions"], Page[Subscription], load
+    )
+
+
+@router.post("", response_model=Subscription, status_code=201)
+async def create_subscription(
+    subscription: SubscriptionCreate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: SubscriptionService(s).create_subscription(subscription)
+    )
+
+
+@router.post("/process-due", response_model=DuePaymentsSummary)
+async def process_due_payments(
+    batch_size: int = Query(500, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db),
+):
+    summary = await db.run_sync(
+        lambda s: SubscriptionService(s).process_due_payments_batch(
+            batch_size=batch_size
+        )
+    )
+    return DuePaymentsSummary.model_validate(summary)
+
+
+@router.get("/transactions", response_model=List[SubscriptionTransactions])
+async def get_subscriptions_with_transactions(
+    request: Request,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        return await db.run_sync(
+            lambda s: SubscriptionService(s).get_subscriptions_with_transactions(
+                start_date, end_date, limit, active
+            )
+        )
+
+    return await conditional_get(
+        request,
+        db,
+        ["subscriptions", "transactions"],
+        List[SubscriptionTransactions],
+        load,
+    )
+
+
+@router.get("/{subscription_id}", response_model=Subscription)
+async def get_subscription(subscription_id: str, db: AsyncSession = Depends(get_db)):
+    subscription = await db.run_sync(
+        lambda s: SubscriptionService(s).get_subscription(subscription_id)
+    )
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return subscription
+
+
+@router.patch("/{subscription_id}", response_model=Subscription)
+async def update_subscription(
+    subscription_id: str,
+    subscription: SubscriptionUpdate,
+    db: AsyncSession = Depends(get_db),
+):
+    return await db.run_sync(
+        lambda s: SubscriptionService(s).update_subscription(
+            subscription_id, subscription
+        )
+    )
+
+
+@router.delete("/{subscription_id}", status_code=204)
+async def delete_subscription(
+    subscription_id: str,
+    delete_transactions: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    await db.run_sync(
+        lambda s: SubscriptionService(s).delete_subscription(
+            subscription_id, delete_transactions=delete_transactions
+        )
+    )
+
+
+@router.get("/{subscription_id}/transactions", response_model=List[Transaction])
+async def get_subscription_transactions(
+    subscription_id: str, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: SubscriptionService(s).get_subscription_transactions(subscription_id)
+    )
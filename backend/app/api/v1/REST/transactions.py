@@ -0,0 +1,209 @@
+# fortuna/backend/app/api/v1/REST/transactions.py
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.conditional import conditional_get
+from api.deps import get_db, get_user_id
+from db.async_session import AsyncDatabaseConnection
+from schemas import (
+    Expense,
+    ExpenseCreate,
+    ExpenseUpdate,
+    Income,
+    IncomeCreate,
+    IncomeUpdate,
+    Page,
+    Transaction,
+)
+from services import (
+    ExpenseService,
+    ExportService,
+    IncomeService,
+    SearchService,
+    TransactionService,
+)
+from services.export_service import EXPORT_FORMATS, MEDIA_TYPES, ExportEncoder
+
+router = APIRouter(prefix="/transactions", tags=["transactions"])
+
+
+@router.get("/expenses", response_model=Page[Expense])
+async def list_expenses(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    account_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        return await db.run_sync(
+            lambda s: ExpenseService(s).list_expenses(
+                limit, cursor, start_date, end_date, account_id, category_id
+            )
+        )
+
+    return await conditional_get(request, db, ["transactions"], Page[Expense], load)
+
+
+@router.post("/expenses", response_model=Expense, status_code=201)
+async def create_expense(expense: ExpenseCreate, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(lambda s: ExpenseService(s).create_expense(expense))
+
+
+@router.get("/expenses/{expense_id}", response_model=Expense)
+async def get_expense(expense_id: str, db: AsyncSession = Depends(get_db)):
+    expense = await db.run_sync(lambda s: ExpenseService(s).get_expense(expense_id))
+    if not expense:
+        raise HTTPException(status_code=404, detail="Expense not found")
+    return expense
+
+
+@router.patch("/expenses/{expense_id}", response_model=Expense)
+async def update_expense(
+    expense_id: str, expense: ExpenseUpdate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: ExpenseService(s).update_expense(expense_id, expense)
+    )
+
+
+@router.delete("/expenses/{expense_id}", status_code=204)
+async def delete_expense(expense_id: str, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(lambda s: ExpenseService(s).delete_expense(expense_id))
+
+
+@router.get("/incomes", response_model=Page[Income])
+async def list_incomes(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    account_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def load():
+        return await db.run_sync(
+            lambda s: IncomeService(s).list_incomes(
+                limit, cursor, start_date, end_date, account_id, category_id
+            )
+        )
+
+    return await conditional_get(request, db, ["transactions"], Page[Income], load)
+
+
+@router.post("/incomes", response_model=Income, status_code=201)
+async def create_income(income: IncomeCreate, db: AsyncSession = Depends(get_db)):
+    return await db.run_sync(lambda s: IncomeService(s).create_income(income))
+
+
+@router.get("/incomes/{income_id}", response_model=Income)
+async def get_income(income_id: str, db: AsyncSession = Depends(get_db)):
+    income = await db.run_sync(lambda s: IncomeService(s).get_income(income_id))
+    if not income:
+        raise HTTPException(status_code=404, detail="Income not found")
+    return income
+
+
+@router.patch("/incomes/{income_id}", response_model=Income)
+async def update_income(
+    income_id: str, income: IncomeUpdate, db: AsyncSession = Depends(get_db)
+):
+    return await db.run_sync(
+        lambda s: IncomeService(s).update_income(income_id, income)
+    )
+
+
+@router.delete("/incomes/{income_id}", status_code=204)
+async def delete_income(income_id: str, db: AsyncSession = Depends(get_db)):
+    await db.run_sync(lambda s: IncomeService(s).delete_income(income_id))
+
+
+@router.get("/search", response_model=List[Transaction])
+async def search_transactions(
+    q: str = Query(..., min_length=1, description='Words, "phrases", prefix*'),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    account_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    return await db.run_sync(
+        lambda s: SearchService(s).search(
+            q,
+            start_date,
+            end_date,
+            min_amount,
+            max_amount,
+            account_id,
+            category_id,
+            type,
+            limit,
+            offset,
+        )
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", enum=list(EXPORT_FORMATS)),
+    gzip: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    account_id: Optional[str] = None,
+    category_id: Optional[str] = None,
+    type: Optional[str] = None,
+    chunk_size: int = Query(5000, ge=100, le=100000),
+    user_id: str = Depends(get_user_id),
+):
+    # Fail before the first byte (unknown format, no pyarrow), not mid-stream
+    try:
+        encoder = ExportEncoder(format, gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = ExportService.export_query(
+        start_date, end_date, account_id, category_id, type
+    ).execution_options(yield_per=chunk_size)
+
+    async def body():
+        # The stream outlives the request handler, so it opens its own
+        # session instead of using the get_db dependency
+        async with AsyncDatabaseConnection().get_session(user_id) as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                data = encoder.encode(rows)
+                if data:
+                    yield data
+        yield encoder.finish()
+
+    filename, media_type = f"transactions.{format}", MEDIA_TYPES[format]
+    if gzip and format != "parquet":
+        # Parquet compresses internally; CSV / JSONL become .gz files
+        filename, media_type = filename + ".gz", "application/gzip"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/{transaction_id}", response_model=Transaction)
+async def get_transaction(transaction_id: str, db: AsyncSession = Depends(get_db)):
+    transaction = await db.run_sync(
+        lambda s: TransactionService(s).get_transaction(transaction_id)
+    )
+    if not transaction:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return transaction
@@ -0,0 +1,127 @@
+# fortuna/backend/app/api/v1/graphql/limits.py
+from typing import Any, Dict, Optional
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+from strawberry.extensions import SchemaExtension
+
+
+class QueryComplexityLimiter(SchemaExtension):
+    """Rejects queries that could return more than ``max_complexity``
+    objects, before anything is executed.
+
+    The cost model: every object field costs 1 plus the cost of its own
+    selection; scalar fields are free. A list field multiplies that by its
+    ``limit`` argument (or that argument's default; lists without one count
+    once). The query's cost is the sum over its top-level fields, so
+    ``accounts(limit: 50) { transactions(limit: 100) { category { id } } }``
+    costs 50 * (1 + 100 * (1 + 1)) = 10050.
+
+    With the schema's defaults (50 for top-level lists, 10 for nested ones)
+    and the default maximum of 5000, the basic nested shape fits without
+    limits: ``accounts { transactions { category { id } } }`` costs
+    50 * (1 + 10 * 2) = 1050 and ``categories { transactions { id } }``
+    50 * (1 + 10) = 550. DataLoaders bound the number of SQL statements per
+    nesting level; this bounds the rows behind them.
+    """
+
+    def __init__(self, max_complexity: int):
+        self.max_complexity = max_complexity
+
+    def on_validate(self):
+        # Runs before the standard validation: an error here stops the query
+        context = self.execution_context
+        document = context.graphql_document
+        if document is not None:
+            schema = context.schema._schema
+            fragments = {
+                d.name.value: d
+                for d in document.definitions
+                if isinstance(d, FragmentDefinitionNode)
+            }
+            variables = context.variables or {}
+            for definition in document.definitions:
+                if not isinstance(definition, OperationDefinitionNode):
+                    continue
+                root = schema.get_root_type(definition.operation)
+                cost = _cost(
+                    definition.selection_set, root, schema, fragments, variables
+                )
+                if cost > self.max_complexity:
+                    context.pre_execution_errors = [
+                        GraphQLError(
+                            f"Query complexity {cost} exceeds the maximum of "
+                            f"{self.max_complexity}; lower the list limits or "
+                            f"select fewer nested lists"
+                        )
+                    ]
+                    break
+        yield
+
+
+def _cost(
+    selection_set: Optional[SelectionSetNode],
+    parent: Any,
+    schema,
+    fragments: Dict[str, FragmentDefinitionNode],
+    variables: Dict[str, Any],
+) -> int:
+    if selection_set is None or not isinstance(parent, GraphQLObjectType):
+        return 0
+    total = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            field = parent.fields.get(selection.name.value)
+            if field is None:
+                # Introspection or an unknown field (reported by validation)
+                continue
+            named = get_named_type(field.type)
+            if not isinstance(named, GraphQLObjectType):
+                continue
+            each = 1 + _cost(
+                selection.selection_set, named, schema, fragments, variables
+            )
+            if is_list_type(get_nullable_type(field.type)):
+                each *= _limit(selection, field, variables)
+            total += each
+        elif isinstance(selection, InlineFragmentNode):
+            condition = selection.type_condition
+            target = schema.get_type(condition.name.value) if condition else parent
+            total += _cost(
+                selection.selection_set, target, schema, fragments, variables
+            )
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                target = schema.get_type(fragment.type_condition.name.value)
+                total += _cost(
+                    fragment.selection_set, target, schema, fragments, variables
+                )
+    return total
+
+
+def _limit(node: FieldNode, field, variables: Dict[str, Any]) -> int:
+    argument = field.args.get("limit")
+    default = argument.default_value if argument is not None else None
+    for arg in node.arguments or ():
+        if arg.name.value != "limit":
+            continue
+        if isinstance(arg.value, IntValueNode):
+            return int(arg.value.value)
+        if isinstance(arg.value, VariableNode):
+            value = variables.get(arg.value.name.value, default)
+            return value if isinstance(value, int) else 1
+    # Lists without a limit argument are counted once
+    return default if isinstance(default, int) else 1
@@ -0,0 +1,98 @@
+# fortuna/backend/app/api/v1/graphql/loaders.py
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from strawberry.dataloader import DataLoader
+from db import (
+    Account as AccountModel,
+    Category as CategoryModel,
+    Subscription as SubscriptionModel,
+    Transaction as TransactionModel,
+)
+
+# (parent id, limit): children are fetched newest / first N per parent
+ChildrenKey = Tuple[str, int]
+
+
+class Loaders:
+    """Per-request DataLoaders behind every relationship resolver.
+
+    Loads requested in the same tick are batched into one ``IN`` query, so
+    a relationship costs one statement per nesting level of the query, not
+    one per parent row. Collections are capped per parent in SQL with a
+    ``row_number()`` window. Built per request, so nothing is cached across
+    requests.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        # An AsyncSession cannot run two statements at once; loaders of
+        # different relationships dispatch concurrently
+        self._lock = asyncio.Lock()
+        self.account = DataLoader(self._by_id(AccountModel))
+        self.category = DataLoader(self._by_id(CategoryModel))
+        self.subscription = DataLoader(self._by_id(SubscriptionModel))
+
+        newest = (TransactionModel.date.desc(), TransactionModel.id.desc())
+        by_name = (SubscriptionModel.name, SubscriptionModel.id)
+        self.transactions_by_account = DataLoader(
+            self._children(TransactionModel, TransactionModel.account_id, newest)
+        )
+        self.transactions_by_category = DataLoader(
+            self._children(TransactionModel, TransactionModel.category_id, newest)
+        )
+        self.transactions_by_subscription = DataLoader(
+            self._children(TransactionModel, TransactionModel.subscription_id, newest)
+        )
+        self.subscriptions_by_account = DataLoader(
+            self._children(SubscriptionModel, SubscriptionModel.account_id, by_name)
+        )
+        self.subscriptions_by_category = DataLoader(
+            self._children(SubscriptionModel, SubscriptionModel.category_id, by_name)
+        )
+
+    async def scalars(self, stmt) -> list:
+        async with self._lock:
+            return list(await self.session.scalars(stmt))
+
+    def _by_id(self, model):
+        async def load(ids: List[str]) -> List[Optional[object]]:
+            rows = await self.scalars(select(model).where(model.id.in_(ids)))
+            by_id = {row.id: row for row in rows}
+            return [by_id.get(id) for id in ids]
+
+        return load
+
+    def _children(self, model, parent_column, order_by: Sequence):
+        async def load(keys: List[ChildrenKey]) -> List[list]:
+            # Normally every key shares the field's limit: a single query
+            parents_by_limit: Dict[int, List[str]] = defaultdict(list)
+            for parent_id, limit in keys:
+                parents_by_limit[limit].append(parent_id)
+            children: Dict[ChildrenKey, list] = defaultdict(list)
+            for limit, parent_ids in parents_by_limit.items():
+                ranked = (
+                    select(
+                        model,
+                        func.row_number()
+                        .over(partition_by=parent_column, order_by=order_by)
+                        .label("rank"),
+                    )
+                    .where(parent_column.in_(parent_ids))
+                    .subquery()
+                )
+                row = aliased(model, ranked)
+                rows = await self.scalars(
+                    select(row)
+                    .where(ranked.c.rank <= limit)
+                    .order_by(ranked.c[parent_column.key], ranked.c.rank)
+                )
+                for child in rows:
+                    children[(getattr(child, parent_column.key), limit)].append(child)
+            return [children.get(key, []) for key in keys]
+
+        return load
+
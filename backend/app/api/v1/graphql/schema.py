@@ -0,0 +1,276 @@
+# fortuna/backend/app/api/v1/graphql/schema.py
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+import strawberry
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.extensions import QueryDepthLimiter
+from strawberry.fastapi import BaseContext, GraphQLRouter
+from api.deps import get_db
+from core.config import get_settings
+from db import (
+    Account as AccountModel,
+    Category as CategoryModel,
+    Subscription as SubscriptionModel,
+    Transaction as TransactionModel,
+)
+from services.pagination import encode_cursor, keyset_after
+from .limits import QueryComplexityLimiter
+from .loaders import Loaders
+
+# Default limits of the top-level lists and of the lists nested in an
+# object; with these, a query nesting one list in each top-level list stays
+# well within the default complexity limit (QueryComplexityLimiter)
+DEFAULT_LIMIT = 50
+NESTED_LIMIT = 10
+MAX_LIMIT = 500
+# OFFSET still reads every skipped row; deeper transaction pages use the
+# keyset cursor (``after``)
+MAX_OFFSET = 10_000
+
+
+class Context(BaseContext):
+    def __init__(self, loaders: Loaders):
+        super().__init__()
+        self.loaders = loaders
+
+
+def _limit(limit: int) -> int:
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def _offset(offset: int) -> int:
+    if not 0 <= offset <= MAX_OFFSET:
+        raise ValueError(
+            f"offset must be between 0 and {MAX_OFFSET}; page transactions "
+            "with after"
+        )
+    return offset
+
+
+# Resolvers receive the ORM row as ``self``; relationships are never
+# touched directly (they raise on lazy load), every one goes through a
+# DataLoader.
+
+
+@strawberry.type
+class Account:
+    id: strawberry.ID
+    name: str
+    balance: Decimal
+
+    @strawberry.field
+    async def transactions(
+        self, info: strawberry.Info, limit: int = NESTED_LIMIT
+    ) -> List["Transaction"]:
+        loader = info.context.loaders.transactions_by_account
+        return await loader.load((self.id, _limit(limit)))
+
+    @strawberry.field
+    async def subscriptions(
+        self, info: strawberry.Info, limit: int = NESTED_LIMIT
+    ) -> List["Subscription"]:
+        loader = info.context.loaders.subscriptions_by_account
+        return await loader.load((self.id, _limit(limit)))
+
+
+@strawberry.type
+class Category:
+    id: strawberry.ID
+    name: str
+    budget: Decimal
+    type: str
+
+    @strawberry.field
+    async def transactions(
+        self, info: strawberry.Info, limit: int = NESTED_LIMIT
+    ) -> List["Transaction"]:
+        loader = info.context.loaders.transactions_by_category
+        return await loader.load((self.id, _limit(limit)))
+
+    @strawberry.field
+    async def subscriptions(
+        self, info: strawberry.Info, limit: int = NESTED_LIMIT
+    ) -> List["Subscription"]:
+        loader = info.context.loaders.subscriptions_by_category
+        return await loader.load((self.id, _limit(limit)))
+
+
+@strawberry.type
+class Transaction:
+    id: strawberry.ID
+    date: datetime
+    amount: Decimal
+    description: Optional[str]
+    type: str
+    account_id: strawberry.ID
+    category_id: strawberry.ID
+    subscription_id: Optional[strawberry.ID]
+
+    @strawberry.field
+    def cursor(self) -> str:
+        # Pass as ``after`` to continue the transactions list from this row
+        return encode_cursor(self.date, self.id)
+
+    @strawberry.field
+    async def account(self, info: strawberry.Info) -> Optional[Account]:
+        return await info.context.loaders.account.load(self.account_id)
+
+    @strawberry.field
+    async def category(self, info: strawberry.Info) -> Optional[Category]:
+        return await info.context.loaders.category.load(self.category_id)
+
+    @strawberry.field
+    async def subscription(self, info: strawberry.Info) -> Optional["Subscription"]:
+        if self.subscription_id is None:
+            return None
+        return await info.context.loaders.subscription.load(self.subscription_id)
+
+
+@strawberry.type
+class Subscription:
+    id: strawberry.ID
+    name: str
+    amount: Decimal
+    frequency: str
+    next_payment: datetime
+    active: bool
+    account_id: strawberry.ID
+    category_id: strawberry.ID
+
+    @strawberry.field
+    async def account(self, info: strawberry.Info) -> Optional[Account]:
+        return await info.context.loaders.account.load(self.account_id)
+
+    @strawberry.field
+    async def category(self, info: strawberry.Info) -> Optional[Category]:
+        return await info.context.loaders.category.load(self.category_id)
+
+    @strawberry.field
+    async def transactions(
+        self, info: strawberry.Info, limit: int = NESTED_LIMIT
+    ) -> List[Transaction]:
+        loader = info.context.loaders.transactions_by_subscription
+        return await loader.load((self.id, _limit(limit)))
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def accounts(
+        self, info: strawberry.Info, limit: int = DEFAULT_LIMIT, offset: int = 0
+    ) -> List[Account]:
+        return await info.context.loaders.scalars(
+            select(AccountModel)
+            .order_by(AccountModel.name)
+            .limit(_limit(limit))
+            .offset(_offset(offset))
+        )
+
+    @strawberry.field
+    async def account(
+        self, info: strawberry.Info, id: strawberry.ID
+    ) -> Optional[Account]:
+        return await info.context.loaders.account.load(id)
+
+    @strawberry.field
+    async def categories(
+        self,
+        info: strawberry.Info,
+        type: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> List[Category]:
+        stmt = select(CategoryModel).order_by(CategoryModel.name)
+        if type is not None:
+            stmt = stmt.where(CategoryModel.type == type)
+        return await info.context.loaders.scalars(
+            stmt.limit(_limit(limit)).offset(_offset(offset))
+        )
+
+    @strawberry.field
+    async def category(
+        self, info: strawberry.Info, id: strawberry.ID
+    ) -> Optional[Category]:
+        return await info.context.loaders.category.load(id)
+
+    @strawberry.field
+    async def subscriptions(
+        self,
+        info: strawberry.Info,
+        active: Optional[bool] = None,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> List[Subscription]:
+        stmt = select(SubscriptionModel).order_by(
+            SubscriptionModel.name, SubscriptionModel.id
+        )
+        if active is not None:
+            stmt = stmt.where(SubscriptionModel.active == active)
+        return await info.context.loaders.scalars(
+            stmt.limit(_limit(limit)).offset(_offset(offset))
+        )
+
+    @strawberry.field
+    async def subscription(
+        self, info: strawberry.Info, id: strawberry.ID
+    ) -> Optional[Subscription]:
+        return await info.context.loaders.subscription.load(id)
+
+    @strawberry.field
+    async def transactions(
+        self,
+        info: strawberry.Info,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[strawberry.ID] = None,
+        category_id: Optional[strawberry.ID] = None,
+        type: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> List[Transaction]:
+        # Newest first, like the REST listings; ``after`` is the cursor of
+        # the last transaction already seen
+        stmt = select(TransactionModel).order_by(
+            TransactionModel.date.desc(), TransactionModel.id.desc()
+        )
+        if after is not None:
+            stmt = stmt.where(
+                keyset_after(TransactionModel.date, TransactionModel.id, after)
+            )
+        if start_date is not None:
+            stmt = stmt.where(TransactionModel.date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(TransactionModel.date < end_date)
+        if account_id is not None:
+            stmt = stmt.where(TransactionModel.account_id == account_id)
+        if category_id is not None:
+            stmt = stmt.where(TransactionModel.category_id == category_id)
+        if type is not None:
+            stmt = stmt.where(TransactionModel.type == type)
+        return await info.context.loaders.scalars(
+            stmt.limit(_limit(limit)).offset(_offset(offset))
+        )
+
+
+_settings = get_settings()
+
+schema = strawberry.Schema(
+    query=Query,
+    extensions=[
+        QueryDepthLimiter(max_depth=_settings.graphql_max_depth),
+        QueryComplexityLimiter(max_complexity=_settings.graphql_max_complexity),
+    ],
+)
+
+
+async def get_context(db: AsyncSession = Depends(get_db)) -> Context:
+    return Context(Loaders(db))
+
+
+graphql_router = GraphQLRouter(schema, context_getter=get_context)
@@ -0,0 +1 @@
+# fortuna/backend/app/benchmarks/__init__.py
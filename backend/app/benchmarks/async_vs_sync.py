@@ -0,0 +1,159 @@
+# fortuna/backend/app/benchmarks/async_vs_sync.py
+"""Throughput of the async REST layer against a sync-session baseline.
+
+Clients looping on a slow report (all-time category total) run next to a
+client doing fast single-account lookups, against two ASGI apps sharing
+one seeded SQLite database:
+
+* ``async``: the real API, services driven through ``AsyncSession.run_sync``
+* ``sync``: the same handlers calling the services on a plain sync
+  session, i.e. blocking the event loop while a query runs
+
+Usage (from backend/app)::
+
+    python -m benchmarks.async_vs_sync --rows 200000 --duration 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed(rows):
+    from db.init_db import init_database
+    from db import DatabaseConnection
+    from schemas import AccountCreate, CategoryCreate
+    from services import AccountService, CategoryService, ImportService
+
+    init_database()
+    db = DatabaseConnection().get_session()
+    account = AccountService(db).create_account(
+        AccountCreate(name="Bench", balance=0.0)
+    )
+    category = CategoryService(db).create_category(
+        CategoryCreate(name="Bench", budget=0.0, type="expense")
+    )
+    ImportService(db).import_rows(
+        (
+            (
+                i,
+                {
+                    "date": f"2020-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                    "amount": str(-(1 + i % 50)),
+                    "account": account.id,
+                    "category": category.id,
+                },
+            )
+            for i in range(rows)
+        ),
+        batch_size=10000,
+    )
+    ids = account.id, category.id
+    DatabaseConnection().close_session()
+    return ids
+
+
+def build_sync_app():
+    # Baseline: async handlers that call the services on a sync session
+    from fastapi import FastAPI
+    from db import DatabaseConnection
+    from schemas import Account
+    from services import AccountService, CategoryService
+
+    app = FastAPI()
+
+    @app.get("/api/v1/accounts/{account_id}", response_model=Account)
+    async def get_account(account_id: str):
+        return AccountService(DatabaseConnection().get_session()).get_account(
+            account_id
+        )
+
+    @app.get("/api/v1/categories/{category_id}/total")
+    async def get_total(category_id: str):
+        service = CategoryService(DatabaseConnection().get_session())
+        total = service.get_total_transactions_in_category(category_id)
+        return {"category_id": category_id, "total": total}
+
+    return app
+
+
+async def run_load(app, account_id, category_id, duration, report_workers):
+    import httpx
+
+    lookup_latencies = []
+    reports = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+        # The in-process transport never suspends on its own, so each client
+        # yields between requests the way a network round trip would.
+
+        async def report_worker():
+            nonlocal reports
+            while time.perf_counter() < deadline:
+                response = await client.get(f"/api/v1/categories/{category_id}/total")
+                response.raise_for_status()
+                reports += 1
+                await asyncio.sleep(0)
+
+        async def lookup_worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(f"/api/v1/accounts/{account_id}")
+                response.raise_for_status()
+                lookup_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(
+            lookup_worker(), *(report_worker() for _ in range(report_workers))
+        )
+    return {
+        "reports_per_sec": reports / duration,
+        "lookups_per_sec": len(lookup_latencies) / duration,
+        "lookup_p50_ms": statistics.median(lookup_latencies) * 1000,
+        "lookup_p99_ms": _percentile(lookup_latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per app")
+    parser.add_argument(
+        "--report-workers", type=int, default=2, help="Clients looping on the report"
+    )
+    args = parser.parse_args()
+
+    # Benchmark against a throwaway database
+    data_dir = tempfile.mkdtemp(prefix="fortuna-bench-")
+    os.environ["FORTUNA_DATA_DIR"] = data_dir
+    account_id, category_id = seed(args.rows)
+
+    from api.api import app as async_app
+
+    apps = {"sync": build_sync_app(), "async": async_app}
+    print(
+        f"{args.rows} transactions, {args.report_workers} report clients "
+        f"+ 1 lookup client, {args.duration:.0f}s per app"
+    )
+    for name, app in apps.items():
+        result = asyncio.run(
+            run_load(app, account_id, category_id, args.duration, args.report_workers)
+        )
+        print(
+            f"{name:>5}: lookups {result['lookups_per_sec']:8.1f}/s  "
+            f"p50 {result['lookup_p50_ms']:7.2f} ms  "
+            f"p99 {result['lookup_p99_ms']:7.2f} ms  "
+            f"reports {result['reports_per_sec']:5.2f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
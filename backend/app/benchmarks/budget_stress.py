@@ -0,0 +1,223 @@
+# fortuna/backend/app/benchmarks/budget_stress.py
+"""Concurrency stress test for monthly budget enforcement.
+
+Several worker processes (like several uvicorn workers) race to create
+expenses in one category until its monthly budget is used up. Afterwards
+the run checks that the budget was never overshot, and that the rollup,
+transactions and account balance agree with the expenses that were
+accepted. Exits 1 on any violation; tests/test_budget_stress.py runs it
+as part of the test suite through :func:`run`.
+
+``--naive`` swaps in the old read-the-total-then-insert check, only to
+demonstrate the overshoot the conditional UPDATE prevents.
+
+Usage (from backend/app)::
+
+    python -m benchmarks.budget_stress --workers 8 --attempts 200
+    python -m benchmarks.budget_stress --database-url postgresql://localhost/fortuna_stress
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+DATE = datetime(2025, 3, 15)
+
+
+@dataclass
+class StressResult:
+    accepted: int
+    rejected: int
+    errors: int
+    # Month total of the category once every worker is done
+    total: Decimal
+    elapsed: float
+    problems: List[str] = field(default_factory=list)
+
+
+def seed(budget: Decimal):
+    from db import DatabaseConnection
+    from schemas import AccountCreate, CategoryCreate
+    from services import AccountService, CategoryService
+
+    connection = DatabaseConnection()
+    connection.create_tables()
+    db = connection.get_session()
+    # Names are unique per user: a fresh pair for every run on the database
+    name = f"Stress {uuid.uuid4().hex[:8]}"
+    account = AccountService(db).create_account(
+        AccountCreate(name=name, balance=budget * 10)
+    )
+    category = CategoryService(db).create_category(
+        CategoryCreate(name=name, budget=budget, type="expense")
+    )
+    ids = account.id, category.id
+    connection.close_session()
+    return ids
+
+
+def _naive_create(service, data):
+    # create_expense as it was before budget reservations: read the total,
+    # compare, then write, leaving a window for other writers in between
+    from core.exceptions import InvalidInputError
+    from db import Transaction as TransactionModel
+
+    category = service.categories.get_category_ref(data.category_id)
+    total = service.totals.get_total(
+        data.category_id, data.date.year, data.date.month, "expense"
+    )
+    if total + data.amount > category.budget:
+        raise InvalidInputError("Category budget exceeded")
+    time.sleep(0.001)
+    transaction = TransactionModel(
+        id=str(uuid.uuid4()), type="expense", **data.model_dump()
+    )
+    service.db.add(transaction)
+    service.totals.record_transaction(transaction)
+    service.accounts.adjust_balance(
+        data.account_id, -data.amount, "expense", transaction.id
+    )
+    service.db.commit()
+
+
+def worker(account_id, category_id, amount, attempts, naive, start, results):
+    from core.exceptions import FortunaError
+    from db import DatabaseConnection
+    from schemas import ExpenseCreate
+    from services import ExpenseService
+
+    service = ExpenseService(DatabaseConnection().get_session())
+    data = ExpenseCreate(
+        date=DATE,
+        amount=amount,
+        description="stress",
+        account_id=account_id,
+        category_id=category_id,
+    )
+    accepted = rejected = errors = 0
+    start.wait()  # every worker set up: start together
+    for _ in range(attempts):
+        try:
+            if naive:
+                _naive_create(service, data)
+            else:
+                service.create_expense(data)
+            accepted += 1
+        except FortunaError as e:
+            if "budget" in str(e.detail):
+                rejected += 1
+            else:
+                errors += 1
+                print(f"worker {os.getpid()}: {e.detail}", file=sys.stderr)
+    results.put((accepted, rejected, errors))
+
+
+def check(account_id, category_id, budget, amount, accepted, opening):
+    from sqlalchemy import func
+    from db import DatabaseConnection, Transaction as TransactionModel
+    from services import AccountService, CategoryTotalsService
+
+    db = DatabaseConnection().get_session()
+    totals = CategoryTotalsService(db)
+    total = totals.get_total(category_id, DATE.year, DATE.month, "expense")
+    spent, count = db.query(
+        func.sum(TransactionModel.amount), func.count()
+    ).filter(TransactionModel.category_id == category_id).one()
+    balance = AccountService(db).get_account(account_id).balance
+
+    problems = []
+    if total > budget:
+        problems.append(f"budget overshot: {total} > {budget}")
+    if count != accepted or total != amount * accepted:
+        problems.append(
+            f"rollup {total} / {count} rows disagrees with {accepted} accepted"
+        )
+    if spent != total:
+        problems.append(f"transactions sum {spent} != rollup {total}")
+    if balance != opening - total:
+        problems.append(f"balance {balance} != {opening - total}")
+    if totals.verify():
+        problems.append("category_month_totals does not match transactions")
+    return total, problems
+
+
+def run(
+    workers: int,
+    attempts: int,
+    budget: Decimal,
+    amount: Decimal,
+    naive: bool = False,
+) -> StressResult:
+    """Race ``workers`` processes of ``attempts`` expenses each against a new
+    category with ``budget``, on the database the environment configures
+    (the workers are spawned and read it from there too).
+    """
+    account_id, category_id = seed(budget)
+
+    context = multiprocessing.get_context("spawn")
+    start, results = context.Barrier(workers + 1), context.Queue()
+    processes = [
+        context.Process(
+            target=worker,
+            args=(account_id, category_id, amount, attempts, naive, start, results),
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    start.wait()
+    started = time.perf_counter()
+    outcomes = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    accepted, rejected, errors = (sum(column) for column in zip(*outcomes))
+    total, problems = check(
+        account_id, category_id, budget, amount, accepted, budget * 10
+    )
+    if errors:
+        problems.append(f"{errors} expenses failed for reasons other than the budget")
+    return StressResult(accepted, rejected, errors, total, elapsed, problems)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=100, help="Per worker")
+    parser.add_argument("--budget", type=Decimal, default=Decimal("1000.00"))
+    parser.add_argument("--amount", type=Decimal, default=Decimal("7.30"))
+    parser.add_argument(
+        "--naive", action="store_true", help="Demonstrate the unguarded check"
+    )
+    parser.add_argument(
+        "--database-url", help="Empty database to use (default: a temporary SQLite file)"
+    )
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["FORTUNA_DATABASE_URL"] = args.database_url
+    else:
+        os.environ["FORTUNA_DATA_DIR"] = tempfile.mkdtemp(prefix="fortuna-stress-")
+    result = run(args.workers, args.attempts, args.budget, args.amount, args.naive)
+    print(
+        f"{args.workers} workers x {args.attempts} attempts in {result.elapsed:.2f}s: "
+        f"{result.accepted} accepted, {result.rejected} over budget, "
+        f"{result.errors} errors; spent {result.total} of {args.budget}"
+    )
+    for problem in result.problems:
+        print(f"FAIL: {problem}")
+    if result.problems:
+        sys.exit(1)
+    print("OK: budget held under concurrent writers.")
+
+
+if __name__ == "__main__":
+    main()
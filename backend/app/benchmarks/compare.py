@@ -0,0 +1,89 @@
+# fortuna/backend/app/benchmarks/compare.py
+"""Compare two ``benchmarks.run`` result files.
+
+A benchmark regresses when its p50 latency grows, or its query count per
+operation rises, by more than the threshold. Exits 1 on any regression, so
+it can gate CI.
+
+Usage (from backend/app)::
+
+    python -m benchmarks.compare base.json new.json --threshold 0.10
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    base: Dict[str, dict], new: Dict[str, dict], threshold: float
+) -> List[Tuple[str, dict, dict, List[str]]]:
+    # (name, base result, new result, regressions) for benchmarks in both runs
+    rows = []
+    for name in base.keys() & new.keys():
+        before, after = base[name], new[name]
+        regressions = []
+        if after["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            regressions.append("p50")
+        if after["queries_per_op"] > before["queries_per_op"] * (1 + threshold):
+            regressions.append("queries")
+        rows.append((name, before, after, regressions))
+    return sorted(rows)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before:+6.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed relative slowdown"
+    )
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    for key in ("seed", "transactions"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(
+                f"warning: runs used different {key} "
+                f"({base['meta'].get(key)} vs {new['meta'].get(key)})"
+            )
+
+    rows = compare(base["results"], new["results"], args.threshold)
+    print(
+        f"{'benchmark':<26}{'p50 ms':>10}{'new':>10}{'change':>9}"
+        f"{'ops/s':>11}{'new':>11}{'queries':>9}{'new':>6}"
+    )
+    regressed = 0
+    for name, before, after, regressions in rows:
+        regressed += bool(regressions)
+        print(
+            f"{name:<26}{before['p50_ms']:>10.3f}{after['p50_ms']:>10.3f}"
+            f"{_change(before['p50_ms'], after['p50_ms']):>9}"
+            f"{before['ops_per_sec']:>11.1f}{after['ops_per_sec']:>11.1f}"
+            f"{before['queries_per_op']:>9.1f}{after['queries_per_op']:>6.1f}"
+            + (f"  REGRESSION ({', '.join(regressions)})" if regressions else "")
+        )
+    for name in sorted(base["results"].keys() - new["results"].keys()):
+        print(f"{name:<26}missing from {args.new}")
+    for name in sorted(new["results"].keys() - base["results"].keys()):
+        print(f"{name:<26}new benchmark")
+
+    if regressed:
+        print(f"{regressed} benchmarks regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
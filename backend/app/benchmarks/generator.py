@@ -0,0 +1,238 @@
+# fortuna/backend/app/benchmarks/generator.py
+"""Seeded synthetic dataset: accounts, categories, subscriptions and history.
+
+The same seed and sizes always produce the same rows (ids included), so two
+benchmark runs on different commits measure the same data. Rows are written
+with chunked executemany inserts; balances, the balance ledger, the monthly
+rollup and ledger checkpoints are filled in so every service sees a
+consistent database.
+
+Usage (from backend/app)::
+
+    python -m benchmarks.generator --transactions 1000000 --output /tmp/bench.db
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+ACCOUNT_NAMES = ["Checking", "Savings", "Credit Card", "Cash", "Joint", "Travel"]
+# name -> (monthly budget, typical amount); amounts are log-normal around it
+EXPENSE_CATEGORIES = {
+    "Groceries": (600, 45),
+    "Rent": (1500, 1400),
+    "Utilities": (250, 80),
+    "Transport": (200, 25),
+    "Dining": (300, 30),
+    "Entertainment": (150, 20),
+    "Health": (200, 60),
+    "Shopping": (400, 55),
+    "Travel": (500, 180),
+    "Subscriptions": (120, 12),
+}
+INCOME_CATEGORIES = {
+    "Salary": (4000, 3500),
+    "Freelance": (1000, 400),
+    "Interest": (20, 5),
+    "Refunds": (100, 30),
+}
+MERCHANTS = [
+    "Amazon", "Tesco", "Lidl", "Shell", "Uber", "Netflix", "Spotify", "IKEA",
+    "Pharmacy", "Cinema", "Airline", "Hotel", "Cafe", "Bakery", "Gym",
+]
+SUBSCRIPTION_NAMES = ["Netflix", "Spotify", "Gym", "Cloud Storage", "News", "Phone"]
+FREQUENCIES = ["weekly", "monthly", "monthly", "monthly", "yearly"]
+# Fixed "today" so datasets do not depend on when they are generated
+DEFAULT_END = datetime(2025, 1, 1)
+
+
+@dataclass
+class Dataset:
+    seed: int
+    transactions: int
+    end: datetime
+    account_ids: List[str] = field(default_factory=list)
+    # (id, type)
+    categories: List[Tuple[str, str]] = field(default_factory=list)
+    subscription_ids: List[str] = field(default_factory=list)
+
+    def category_ids(self, type: str) -> List[str]:
+        return [category_id for category_id, type_ in self.categories if type_ == type]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _amount(rng: random.Random, typical: float) -> Decimal:
+    value = rng.lognormvariate(0, 0.6) * typical
+    return Decimal(max(1, round(value * 100))) / 100
+
+
+def generate(
+    db,
+    transactions: int = 10_000,
+    accounts: int = 4,
+    subscriptions: int = 200,
+    months: int = 36,
+    seed: int = 42,
+    end: datetime = DEFAULT_END,
+    chunk_size: int = 50_000,
+    progress: bool = False,
+) -> Dataset:
+    """Fill an empty database (or a user with no data yet) through ``db``, a
+    Session acting for that user, and describe it. Users sharing a database
+    need different seeds: the ids come from the seed.
+    """
+    from sqlalchemy import insert
+    from db import Account, Category, Subscription, Transaction
+    from db.tenancy import require_user
+    from services import CategoryTotalsService, LedgerService
+
+    user_id = require_user(db)
+    rng = random.Random(seed)
+    dataset = Dataset(seed=seed, transactions=transactions, end=end)
+    start = end - timedelta(days=30 * months)
+    span = (end - start).total_seconds()
+
+    account_rows = []
+    for i in range(accounts):
+        name = ACCOUNT_NAMES[i % len(ACCOUNT_NAMES)]
+        if i >= len(ACCOUNT_NAMES):
+            name = f"{name} {i // len(ACCOUNT_NAMES) + 1}"
+        account_rows.append(
+            {"id": _uuid(rng), "user_id": user_id, "name": name, "balance": Decimal(0)}
+        )
+    dataset.account_ids = [row["id"] for row in account_rows]
+
+    typical: Dict[str, float] = {}
+    category_rows = []
+    for type_, categories in (
+        ("expense", EXPENSE_CATEGORIES),
+        ("income", INCOME_CATEGORIES),
+    ):
+        for name, (budget, amount) in categories.items():
+            category_id = _uuid(rng)
+            # Generous budgets: history is not subject to budget checks
+            category_rows.append(
+                {
+                    "id": category_id,
+                    "user_id": user_id,
+                    "name": name,
+                    "budget": budget * 10,
+                    "type": type_,
+                }
+            )
+            typical[category_id] = amount
+            dataset.categories.append((category_id, type_))
+    expense_ids = dataset.category_ids("expense")
+    income_ids = dataset.category_ids("income")
+
+    subscription_rows = []
+    for i in range(subscriptions):
+        base = SUBSCRIPTION_NAMES[i % len(SUBSCRIPTION_NAMES)]
+        subscription_rows.append(
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "name": f"{base} {i + 1}",
+                "amount": _amount(rng, 12),
+                "frequency": rng.choice(FREQUENCIES),
+                # Spread around "today": about a third are already due
+                "next_payment": end + timedelta(days=rng.uniform(-15, 30)),
+                "active": rng.random() < 0.9,
+                "category_id": rng.choice(expense_ids),
+                "account_id": rng.choice(dataset.account_ids),
+            }
+        )
+    dataset.subscription_ids = [row["id"] for row in subscription_rows]
+
+    db.execute(insert(Account.__table__), account_rows)
+    db.execute(insert(Category.__table__), category_rows)
+    if subscription_rows:
+        db.execute(insert(Subscription.__table__), subscription_rows)
+    db.commit()
+
+    ledger = LedgerService(db)
+    balances = {account_id: Decimal(0) for account_id in dataset.account_ids}
+    started = time.perf_counter()
+    written = 0
+    while written < transactions:
+        rows, entries = [], []
+        for _ in range(min(chunk_size, transactions - written)):
+            # Roughly one income per eight transactions
+            if rng.random() < 0.125:
+                type_, category_id = "income", rng.choice(income_ids)
+            else:
+                type_, category_id = "expense", rng.choice(expense_ids)
+            account_id = rng.choice(dataset.account_ids)
+            amount = _amount(rng, typical[category_id])
+            transaction_id = _uuid(rng)
+            rows.append(
+                {
+                    "id": transaction_id,
+                    "user_id": user_id,
+                    "date": start + timedelta(seconds=int(rng.random() * span)),
+                    "amount": amount,
+                    "description": rng.choice(MERCHANTS),
+                    "type": type_,
+                    "account_id": account_id,
+                    "category_id": category_id,
+                }
+            )
+            delta = amount if type_ == "income" else -amount
+            balances[account_id] += delta
+            entries.append((account_id, delta, type_, transaction_id))
+        db.execute(insert(Transaction.__table__), rows)
+        ledger.post_many(entries)
+        db.commit()
+        written += len(rows)
+        if progress:
+            rate = written / (time.perf_counter() - started)
+            print(f"  {written}/{transactions} transactions ({rate:,.0f}/s)")
+
+    for account_id, balance in balances.items():
+        db.query(Account).filter(Account.id == account_id).update({"balance": balance})
+    db.commit()
+    CategoryTotalsService(db).rebuild()
+    ledger.create_checkpoints(every=1000)
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--subscriptions", type=int, default=200)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="SQLite file to create")
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        parser.error(f"{args.output} already exists")
+    os.environ["FORTUNA_DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.output)}"
+    from db import DatabaseConnection
+
+    connection = DatabaseConnection()
+    connection.create_tables()
+    started = time.perf_counter()
+    generate(
+        connection.get_session(),
+        transactions=args.transactions,
+        accounts=args.accounts,
+        subscriptions=args.subscriptions,
+        months=args.months,
+        seed=args.seed,
+        progress=True,
+    )
+    print(f"Wrote {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# fortuna/backend/app/benchmarks/import_time.py
+"""Startup import-time budget for the command-line entry points.
+
+Imports ``main`` (the interactive menu, ``python main.py``) and ``cli`` (the
+typer maintenance CLI) in fresh interpreters under ``python -X importtime``
+and reports the median cumulative import time of each, with its slowest
+direct imports. Exits 1 when an entry point goes over its budget or pulls
+in a module only the API or one command needs (FastAPI, NumPy, ...).
+
+Usage (from backend/app)::
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --budget-ms 400
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ENTRY_POINTS = ("main", "cli")
+# Median import time allowed per entry point
+DEFAULT_BUDGET_MS = 700
+# Only the API server or a single command may import these
+FORBIDDEN = ("fastapi", "starlette", "uvicorn", "numpy", "strawberry", "pyarrow")
+
+# (self us, cumulative us, depth, module) per line of -X importtime output
+ImportRow = Tuple[int, int, int, str]
+
+
+def parse(stderr: str) -> List[ImportRow]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def measure(module: str) -> List[ImportRow]:
+    # A fresh interpreter per run: nothing is imported yet
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse(result.stderr)
+
+
+def total_ms(rows: List[ImportRow], module: str) -> float:
+    return next(row[1] for row in rows if row[3] == module) / 1000
+
+
+def children(rows: List[ImportRow], module: str) -> Dict[str, int]:
+    # Cumulative time of each direct import of ``module``: importtime prints
+    # a module after everything it imported, one level deeper
+    index = next(i for i, row in enumerate(rows) if row[3] == module)
+    depth = rows[index][2]
+    found = {}
+    for _, cumulative, row_depth, name in reversed(rows[:index]):
+        if row_depth <= depth:
+            break
+        if row_depth == depth + 1:
+            found[name] = cumulative
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports shown")
+    args = parser.parse_args()
+
+    problems = []
+    for module in ENTRY_POINTS:
+        runs = [measure(module) for _ in range(args.runs)]
+        totals = [total_ms(rows, module) for rows in runs]
+        median = statistics.median(totals)
+        print(
+            f"{module:<6} median {median:7.1f} ms  min {min(totals):7.1f} ms  "
+            f"budget {args.budget_ms:.0f} ms"
+        )
+        # Slowest direct imports, from the run closest to the median
+        rows = min(runs, key=lambda rows: abs(total_ms(rows, module) - median))
+        slowest = sorted(children(rows, module).items(), key=lambda item: -item[1])
+        for name, cumulative in slowest[: args.top]:
+            print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+        if median > args.budget_ms:
+            problems.append(
+                f"{module}: {median:.1f} ms, over the {args.budget_ms:.0f} ms budget"
+            )
+        imported = {row[3] for rows in runs for row in rows}
+        for name in FORBIDDEN:
+            if name in imported:
+                problems.append(f"{module}: imports {name}")
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        sys.exit(1)
+    print("OK: entry points start within budget.")
+
+
+if __name__ == "__main__":
+    main()
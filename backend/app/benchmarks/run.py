@@ -0,0 +1,509 @@
+# fortuna/backend/app/benchmarks/run.py
+"""Service hot-path benchmarks on a seeded synthetic dataset.
+
+Each benchmark times single operations against the service layer and
+reports ops/sec, p50/p99 latency and SQL statements per operation. Results
+are written as JSON for ``benchmarks.compare``.
+
+Usage (from backend/app)::
+
+    python -m benchmarks.run --transactions 100000 --output base.json
+    python -m benchmarks.run --dataset /tmp/bench.db --only create_expense
+
+The benchmarks act as the default user. ``--other-user-transactions N``
+also gives a second user N transactions in the same database, to check
+that a heavy user does not slow down everyone else's operations.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# name -> (factory, default iterations); a factory takes the Context and
+# returns ``op`` or ``(setup, op)``, where ``setup`` runs untimed before each op
+BENCHMARKS: Dict[str, Tuple[Callable, int]] = {}
+
+
+def benchmark(name: str, iterations: int = 200):
+    def register(factory):
+        BENCHMARKS[name] = (factory, iterations)
+        return factory
+
+    return register
+
+
+@dataclass
+class Context:
+    db: Any
+    dataset: Any
+    rng: random.Random
+
+    def month(self) -> Tuple[int, int]:
+        # A random month inside the generated history
+        date = self.dataset.end - timedelta(days=self.rng.uniform(1, 360))
+        return date.year, date.month
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def _bench_category(ctx: Context, type: str):
+    # Budget checks always pass: a fresh category with an unreachable budget
+    from schemas import CategoryCreate
+    from services import CategoryService
+
+    return CategoryService(ctx.db).create_category(
+        CategoryCreate(name=f"Bench {type} {ctx.rng.random()}", budget=10**9, type=type)
+    )
+
+
+def _expense(ctx: Context, category_id: str, account_id: Optional[str] = None):
+    from schemas import ExpenseCreate
+
+    return ExpenseCreate(
+        date=ctx.dataset.end + timedelta(days=40),
+        amount=round(ctx.rng.uniform(1, 100), 2),
+        description="bench",
+        account_id=account_id or ctx.rng.choice(ctx.dataset.account_ids),
+        category_id=category_id,
+    )
+
+
+@benchmark("create_expense", iterations=500)
+def create_expense(ctx: Context):
+    from services import ExpenseService
+
+    category = _bench_category(ctx, "expense")
+    service = ExpenseService(ctx.db)
+    return lambda: service.create_expense(_expense(ctx, category.id))
+
+
+@benchmark("create_income", iterations=500)
+def create_income(ctx: Context):
+    from schemas import IncomeCreate
+    from services import IncomeService
+
+    category = _bench_category(ctx, "income")
+    service = IncomeService(ctx.db)
+    return lambda: service.create_income(
+        IncomeCreate(
+            date=ctx.dataset.end + timedelta(days=40),
+            amount=round(ctx.rng.uniform(1, 100), 2),
+            description="bench",
+            account_id=ctx.rng.choice(ctx.dataset.account_ids),
+            category_id=category.id,
+        )
+    )
+
+
+@benchmark("update_expense", iterations=500)
+def update_expense(ctx: Context):
+    from schemas import ExpenseUpdate
+    from services import ExpenseService
+
+    service = ExpenseService(ctx.db)
+    expense = service.create_expense(_expense(ctx, _bench_category(ctx, "expense").id))
+    return lambda: service.update_expense(
+        expense.id, ExpenseUpdate(amount=round(ctx.rng.uniform(1, 100), 2))
+    )
+
+
+@benchmark("delete_expense", iterations=300)
+def delete_expense(ctx: Context):
+    from services import ExpenseService
+
+    service = ExpenseService(ctx.db)
+    category = _bench_category(ctx, "expense")
+    created = []
+
+    def setup():
+        created.append(service.create_expense(_expense(ctx, category.id)).id)
+
+    return setup, lambda: service.delete_expense(created.pop())
+
+
+@benchmark("get_monthly_total", iterations=2000)
+def get_monthly_total(ctx: Context):
+    from services import CategoryService
+
+    service = CategoryService(ctx.db)
+    categories = ctx.dataset.category_ids("expense")
+    return lambda: service.get_monthly_total(ctx.rng.choice(categories), *ctx.month())
+
+
+@benchmark("get_monthly_status", iterations=2000)
+def get_monthly_status(ctx: Context):
+    from services import CategoryService
+
+    service = CategoryService(ctx.db)
+    categories = ctx.dataset.category_ids("expense")
+    return lambda: service.get_monthly_status(ctx.rng.choice(categories), *ctx.month())
+
+
+@benchmark("can_add_transaction", iterations=2000)
+def can_add_transaction(ctx: Context):
+    from services import CategoryService
+
+    service = CategoryService(ctx.db)
+    categories = ctx.dataset.category_ids("expense")
+    return lambda: service.can_add_transaction(
+        ctx.rng.choice(categories), 10, ctx.dataset.end - timedelta(days=10)
+    )
+
+
+@benchmark("dashboard_12_months", iterations=200)
+def dashboard_12_months(ctx: Context):
+    from services import CategoryService
+
+    service = CategoryService(ctx.db)
+    end = ctx.dataset.end - timedelta(days=1)
+    start = (end.year - 1, end.month % 12 + 1) if end.month < 12 else (end.year, 1)
+    return lambda: service.get_dashboard(start, (end.year, end.month))
+
+
+@benchmark("list_expenses_page", iterations=500)
+def list_expenses_page(ctx: Context):
+    from services import ExpenseService
+
+    service = ExpenseService(ctx.db)
+    return lambda: service.list_expenses(
+        limit=50, account_id=ctx.rng.choice(ctx.dataset.account_ids)
+    )
+
+
+@benchmark("iter_expenses_1000", iterations=50)
+def iter_expenses_1000(ctx: Context):
+    from itertools import islice
+    from services import ExpenseService
+
+    service = ExpenseService(ctx.db)
+
+    def op():
+        rows = list(islice(service.iter_expenses(chunk_size=1000), 1000))
+        ctx.db.expunge_all()
+        return rows
+
+    return op
+
+
+@benchmark("category_all_time_total", iterations=20)
+def category_all_time_total(ctx: Context):
+    from services import CategoryService
+
+    service = CategoryService(ctx.db)
+    categories = ctx.dataset.category_ids("expense")
+    return lambda: service.get_total_transactions_in_category(ctx.rng.choice(categories))
+
+
+@benchmark("process_due_payments", iterations=50)
+def process_due_payments(ctx: Context):
+    from db import Subscription
+    from services import SubscriptionService
+
+    service = SubscriptionService(ctx.db)
+    now = ctx.dataset.end
+    ids = ctx.dataset.subscription_ids
+
+    def setup():
+        # Make 50 subscriptions due exactly once
+        due = ctx.rng.sample(ids, min(50, len(ids)))
+        ctx.db.query(Subscription).filter(Subscription.id.in_(due)).update(
+            {"next_payment": now - timedelta(hours=1), "active": True},
+            synchronize_session=False,
+        )
+        ctx.db.commit()
+
+    return setup, lambda: service.process_due_payments_batch(now=now)
+
+
+@benchmark("import_1000_rows", iterations=20)
+def import_1000_rows(ctx: Context):
+    from services import ImportService
+
+    service = ImportService(ctx.db)
+    category = _bench_category(ctx, "expense")
+
+    def op():
+        rows = (
+            (
+                line,
+                {
+                    "date": (ctx.dataset.end + timedelta(days=40)).isoformat(),
+                    "amount": f"-{ctx.rng.uniform(1, 100):.2f}",
+                    "account": ctx.rng.choice(ctx.dataset.account_ids),
+                    "category": category.id,
+                },
+            )
+            for line in range(1000)
+        )
+        return service.import_rows(rows, batch_size=1000)
+
+    return op
+
+
+@benchmark("account_lookup_cached", iterations=5000)
+def account_lookup_cached(ctx: Context):
+    from services import AccountService
+
+    service = AccountService(ctx.db)
+    return lambda: service.get_account_ref(ctx.rng.choice(ctx.dataset.account_ids))
+
+
+@benchmark("account_lookup_uncached", iterations=2000)
+def account_lookup_uncached(ctx: Context):
+    from services import AccountService
+    from utils.cache import clear_caches
+
+    service = AccountService(ctx.db)
+    return (
+        lambda: clear_caches("accounts"),
+        lambda: service.get_account_ref(ctx.rng.choice(ctx.dataset.account_ids)),
+    )
+
+
+@benchmark("ledger_balance", iterations=1000)
+def ledger_balance(ctx: Context):
+    from services import AccountService
+
+    service = AccountService(ctx.db)
+    return lambda: service.get_balance(ctx.rng.choice(ctx.dataset.account_ids))
+
+
+@benchmark("ledger_reconcile", iterations=20)
+def ledger_reconcile(ctx: Context):
+    from services import LedgerService
+
+    service = LedgerService(ctx.db)
+    return service.reconcile
+
+
+@benchmark("transfer", iterations=500)
+def transfer(ctx: Context):
+    from schemas import AccountTransfer
+    from services import AccountService
+
+    service = AccountService(ctx.db)
+
+    def op():
+        sender, receiver = ctx.rng.sample(ctx.dataset.account_ids, 2)
+        return service.transfer_between_accounts(
+            AccountTransfer(from_account_id=sender, to_account_id=receiver, amount=1)
+        )
+
+    return op
+
+
+@benchmark("search_description", iterations=500)
+def search_description(ctx: Context):
+    from benchmarks.generator import MERCHANTS
+    from services import SearchService
+
+    service = SearchService(ctx.db)
+    return lambda: service.search(ctx.rng.choice(MERCHANTS), limit=50)
+
+
+@benchmark("forecast_24_months", iterations=20)
+def forecast_24_months(ctx: Context):
+    from services import ForecastService
+
+    service = ForecastService(ctx.db)
+    return lambda: service.forecast(months=24, start=ctx.dataset.end.date())
+
+
+def run_benchmark(
+    name: str,
+    ctx: Context,
+    counter: QueryCounter,
+    iterations: int,
+    max_seconds: float,
+) -> Dict[str, float]:
+    factory, _ = BENCHMARKS[name]
+    built = factory(ctx)
+    setup, op = built if isinstance(built, tuple) else (None, built)
+    latencies: List[float] = []
+    queries = 0
+    deadline = time.perf_counter() + max_seconds
+    warmup = min(5, iterations)
+    for i in range(iterations + warmup):
+        if setup is not None:
+            setup()
+        before = counter.count
+        start = time.perf_counter()
+        op()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            latencies.append(elapsed)
+            queries += counter.count - before
+        if time.perf_counter() > deadline and len(latencies) >= 1:
+            break
+    total = sum(latencies)
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / total if total else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "queries_per_op": queries / len(latencies),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _describe(db, args):
+    # Rebuild the Dataset description of a pre-generated database
+    from db import Account, Category, Subscription, Transaction
+    from benchmarks.generator import DEFAULT_END, Dataset
+
+    dataset = Dataset(
+        seed=args.seed,
+        transactions=db.query(Transaction).count(),
+        end=DEFAULT_END,
+    )
+    dataset.account_ids = [row.id for row in db.query(Account.id).order_by(Account.id)]
+    dataset.categories = [
+        (row.id, row.type)
+        for row in db.query(Category.id, Category.type).order_by(Category.id)
+    ]
+    dataset.subscription_ids = [
+        row.id for row in db.query(Subscription.id).order_by(Subscription.id)
+    ]
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--subscriptions", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--dataset",
+        help="SQLite file from benchmarks.generator (copied; generated args must match)",
+    )
+    parser.add_argument(
+        "--other-user-transactions",
+        type=int,
+        default=0,
+        help="History of a second user sharing the database",
+    )
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument(
+        "--iterations", type=int, help="Override every benchmark's iteration count"
+    )
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Per benchmark")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    # Benchmarks write, so always run against a throwaway copy
+    data_dir = tempfile.mkdtemp(prefix="fortuna-bench-")
+    db_path = os.path.join(data_dir, "bench.db")
+    if args.dataset:
+        shutil.copyfile(args.dataset, db_path)
+    os.environ["FORTUNA_DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from db import DatabaseConnection
+    from benchmarks.generator import generate
+
+    connection = DatabaseConnection()
+    connection.create_tables()
+    db = connection.get_session()
+    started = time.perf_counter()
+    if args.dataset:
+        dataset = _describe(db, args)
+    else:
+        dataset = generate(
+            db,
+            transactions=args.transactions,
+            subscriptions=args.subscriptions,
+            seed=args.seed,
+        )
+    if args.other_user_transactions:
+        from schemas import UserCreate
+        from services import UserService
+
+        with connection.new_session(None) as users_db:
+            other = UserService(users_db).create_user(UserCreate(name="bench-other"))
+        with connection.new_session(other.id) as other_db:
+            generate(
+                other_db,
+                transactions=args.other_user_transactions,
+                subscriptions=args.subscriptions,
+                seed=args.seed + 1,
+            )
+    print(f"Dataset ready in {time.perf_counter() - started:.1f}s")
+
+    counter = QueryCounter(connection.engine)
+    results = {}
+    print(f"{'benchmark':<26}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}")
+    for name in names:
+        # Every benchmark gets its own deterministic random stream
+        ctx = Context(db=db, dataset=dataset, rng=random.Random(f"{args.seed}:{name}"))
+        iterations = args.iterations or BENCHMARKS[name][1]
+        result = results[name] = run_benchmark(
+            name, ctx, counter, iterations, args.max_seconds
+        )
+        print(
+            f"{name:<26}{result['ops_per_sec']:>10.1f}{result['p50_ms']:>10.3f}"
+            f"{result['p99_ms']:>10.3f}{result['queries_per_op']:>9.1f}"
+        )
+
+    if args.output:
+        import sqlalchemy
+
+        report = {
+            "meta": {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "sqlalchemy": sqlalchemy.__version__,
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "transactions": dataset.transactions,
+                "subscriptions": len(dataset.subscription_ids),
+                "other_user_transactions": args.other_user_transactions,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
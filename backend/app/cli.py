@@ -0,0 +1,419 @@
+# fortuna/backend/app/cli.py
+import csv
+from datetime import datetime
+from typing import Optional
+import typer
+from core.exceptions import FortunaError
+from db import DatabaseConnection
+from db.tenancy import DEFAULT_USER_ID
+from schemas import AccountTransfer, UserCreate
+from services import (
+    AccountService,
+    CategoryService,
+    CategoryTotalsService,
+    ExportService,
+    ImportService,
+    LedgerService,
+    SearchService,
+    UserService,
+)
+
+app = typer.Typer(help="Fortuna maintenance commands.")
+rollup_app = typer.Typer(help="Monthly category rollup (category_month_totals).")
+app.add_typer(rollup_app, name="rollup")
+ledger_app = typer.Typer(help="Append-only balance ledger and checkpoints.")
+app.add_typer(ledger_app, name="ledger")
+search_app = typer.Typer(help="Full-text search over transaction descriptions.")
+app.add_typer(search_app, name="search")
+users_app = typer.Typer(help="Users and their API keys.")
+app.add_typer(users_app, name="users")
+
+# Set by the --user option
+_options = {"user": DEFAULT_USER_ID}
+
+
+@app.callback()
+def main(
+    user: str = typer.Option(
+        DEFAULT_USER_ID,
+        envvar="FORTUNA_USER",
+        help="User (name or id) whose data the commands work on. Maintenance "
+        "commands (rollup, ledger checkpoints, search rebuild, "
+        "process-subscriptions) always cover every user.",
+    ),
+):
+    _options["user"] = user
+
+
+def _session():
+    # Session acting for the --user
+    connection = DatabaseConnection()
+    user = UserService(connection.get_session(None)).find_user(_options["user"])
+    if not user:
+        typer.echo(f"User not found: {_options['user']}")
+        raise typer.Exit(code=1)
+    return connection.get_session(user.id)
+
+
+@users_app.command("create")
+def users_create(name: str):
+    """Create a user and print their API key (shown only this once)."""
+    db = DatabaseConnection().get_session(None)
+    try:
+        user = UserService(db).create_user(UserCreate(name=name))
+    except FortunaError as e:
+        typer.echo(e.detail)
+        raise typer.Exit(code=1)
+    typer.echo(f"Created user {user.name} ({user.id}).")
+    typer.echo(f"API key: {user.api_key}")
+
+
+@users_app.command("list")
+def users_list():
+    """List every user."""
+    db = DatabaseConnection().get_session(None)
+    for user in UserService(db).get_all_users():
+        typer.echo(f"{user.id:<38}{user.name:<24}{user.created_at:%Y-%m-%d}")
+
+
+@users_app.command("rotate-key")
+def users_rotate_key(user: str = typer.Argument(..., help="User name or id.")):
+    """Issue a new API key for a user; the old one stops working."""
+    users = UserService(DatabaseConnection().get_session(None))
+    db_user = users.find_user(user)
+    if not db_user:
+        typer.echo(f"User not found: {user}")
+        raise typer.Exit(code=1)
+    typer.echo(f"API key: {users.rotate_api_key(db_user.id).api_key}")
+
+
+@rollup_app.command("rebuild")
+def rollup_rebuild():
+    """Recompute the monthly category rollup from raw transactions."""
+    rows = sum(
+        CategoryTotalsService(db).rebuild() for db in DatabaseConnection().partitions()
+    )
+    typer.echo(f"Rebuilt category_month_totals: {rows} rows.")
+
+
+@rollup_app.command("verify")
+def rollup_verify():
+    """Compare the rollup with raw transactions; exits 1 on mismatch."""
+    mismatches = [
+        mismatch
+        for db in DatabaseConnection().partitions()
+        for mismatch in CategoryTotalsService(db).verify()
+    ]
+    if not mismatches:
+        typer.echo("category_month_totals is consistent.")
+        return
+    for (user_id, category_id, year, month, type_), expected, stored in mismatches:
+        typer.echo(
+            f"{user_id} {category_id} {year}-{month:02d} {type_}: "
+            f"expected total={expected[0]} count={expected[1]}, "
+            f"stored total={stored[0]} count={stored[1]}"
+        )
+    typer.echo(f"{len(mismatches)} mismatched rows. Run `rollup rebuild` to fix.")
+    raise typer.Exit(code=1)
+
+
+@ledger_app.command("reconcile")
+def ledger_reconcile(
+    fix: bool = typer.Option(False, help="Reset stored balances to the ledger."),
+):
+    """Compare every account balance with the ledger; exits 1 on mismatch."""
+    mismatches = [
+        mismatch
+        for db in DatabaseConnection().partitions()
+        for mismatch in LedgerService(db).reconcile(fix=fix)
+    ]
+    if not mismatches:
+        typer.echo("Account balances match the ledger.")
+        return
+    for m in mismatches:
+        typer.echo(f"{m.name} ({m.account_id}): ledger={m.ledger} stored={m.stored}")
+    if fix:
+        typer.echo(f"Reset {len(mismatches)} balances from the ledger.")
+        return
+    typer.echo(f"{len(mismatches)} mismatched accounts. Run with --fix to repair.")
+    raise typer.Exit(code=1)
+
+
+@ledger_app.command("checkpoint")
+def ledger_checkpoint(
+    every: int = typer.Option(1000, help="Entries since the last checkpoint."),
+):
+    """Checkpoint accounts with at least EVERY new ledger entries."""
+    created = sum(
+        LedgerService(db).create_checkpoints(every=every)
+        for db in DatabaseConnection().partitions()
+    )
+    typer.echo(f"Created {created} checkpoints.")
+
+
+@ledger_app.command("close-month")
+def ledger_close_month(year: int, month: int):
+    """Checkpoint every active account with the entries recorded before a
+    month's end."""
+    created = sum(
+        LedgerService(db).close_month(year, month)
+        for db in DatabaseConnection().partitions()
+    )
+    typer.echo(f"Created {created} checkpoints for {year}-{month:02d}.")
+
+
+@ledger_app.command("balance")
+def ledger_balance(
+    account: str = typer.Argument(..., help="Account name or id."),
+    posted_before: Optional[datetime] = typer.Option(
+        None, help="Only entries recorded before this time (not transaction dates)."
+    ),
+):
+    """Show an account balance replayed from the ledger."""
+    db = _session()
+    accounts = AccountService(db)
+    ref = accounts.get_account_ref(account) or accounts.get_account_ref_by_name(account)
+    if not ref:
+        typer.echo(f"Account not found: {account}")
+        raise typer.Exit(code=1)
+    typer.echo(f"{ref.name}: {accounts.ledger.balance(ref.id, posted_before)}")
+
+
+@search_app.command("find")
+def search_find(
+    query: str = typer.Argument(
+        ..., help='Words, "exact phrases" and prefixes (amaz*), all required.'
+    ),
+    start: Optional[datetime] = typer.Option(None, help="From this date (inclusive)."),
+    end: Optional[datetime] = typer.Option(None, help="Until this date (exclusive)."),
+    min_amount: Optional[float] = typer.Option(None),
+    max_amount: Optional[float] = typer.Option(None),
+    limit: int = typer.Option(20),
+):
+    """Search transactions, best matches first."""
+    db = _session()
+    transactions = SearchService(db).search(
+        query,
+        start_date=start,
+        end_date=end,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        limit=limit,
+    )
+    for tx in transactions:
+        typer.echo(f"{tx.date:%Y-%m-%d}  {tx.type:<8}{tx.amount:>12}  {tx.description}")
+    if not transactions:
+        typer.echo("No matching transactions.")
+
+
+@search_app.command("rebuild")
+def search_rebuild():
+    """Create the full-text index if missing and re-index every transaction."""
+    installed = [
+        SearchService(db).rebuild_index() for db in DatabaseConnection().partitions()
+    ]
+    if all(installed):
+        typer.echo("Rebuilt the full-text index.")
+    else:
+        typer.echo("Full-text search is not available on this database.")
+
+
+@app.command("import")
+def import_transactions(
+    path: str = typer.Argument(..., help="CSV, JSONL or OFX file to import."),
+    format: Optional[str] = typer.Option(
+        None, help="csv, jsonl or ofx (default: from the file extension)."
+    ),
+    batch_size: int = typer.Option(5000, help="Rows per INSERT batch and commit."),
+    account: Optional[str] = typer.Option(
+        None, help="Account name or id for rows without one (e.g. OFX)."
+    ),
+    category: Optional[str] = typer.Option(
+        None, help="Category name or id for rows without one."
+    ),
+    show_rejected: int = typer.Option(20, help="Rejected rows to print."),
+):
+    """Bulk import bank history as a stream, in batches."""
+    db = _session()
+    report = ImportService(db).import_file(
+        path,
+        format=format,
+        batch_size=batch_size,
+        default_account=account,
+        default_category=category,
+    )
+    typer.echo(
+        f"Imported {report.imported} transactions in {report.batches} batches, "
+        f"rejected {report.rejected_count}."
+    )
+    for row in report.rejected[:show_rejected]:
+        typer.echo(f"  line {row.line}: {row.reason}")
+
+
+@app.command("export")
+def export_transactions(
+    path: str = typer.Argument(
+        ..., help="Output file: .csv, .jsonl or .parquet, optionally + .gz."
+    ),
+    format: Optional[str] = typer.Option(
+        None, help="csv, jsonl or parquet (default: from the file extension)."
+    ),
+    gzip: Optional[bool] = typer.Option(
+        None, help="Compress the output (default: when the name ends in .gz)."
+    ),
+    start: Optional[datetime] = typer.Option(None, help="From this date (inclusive)."),
+    end: Optional[datetime] = typer.Option(None, help="Until this date (exclusive)."),
+    account: Optional[str] = typer.Option(None, help="Account name or id."),
+    category: Optional[str] = typer.Option(None, help="Category name or id."),
+    type: Optional[str] = typer.Option(None, help="expense or income."),
+    chunk_size: int = typer.Option(5000, help="Rows fetched and written at a time."),
+):
+    """Stream transaction history to a file for analytics."""
+    db = _session()
+    account_id = category_id = None
+    if account:
+        accounts = AccountService(db)
+        ref = accounts.get_account_ref(account) or accounts.get_account_ref_by_name(
+            account
+        )
+        if not ref:
+            typer.echo(f"Account not found: {account}")
+            raise typer.Exit(code=1)
+        account_id = ref.id
+    if category:
+        categories = CategoryService(db)
+        ref = categories.get_category_ref(category)
+        for type_ in [type] if type else ["expense", "income"]:
+            ref = ref or categories.get_category_ref_by_name(category, type_)
+        if not ref:
+            typer.echo(f"Category not found: {category}")
+            raise typer.Exit(code=1)
+        category_id = ref.id
+    try:
+        report = ExportService(db).export_file(
+            path,
+            format=format,
+            compress=gzip,
+            chunk_size=chunk_size,
+            start_date=start,
+            end_date=end,
+            account_id=account_id,
+            category_id=category_id,
+            type=type,
+        )
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    typer.echo(f"Exported {report.rows} transactions to {path} ({report.bytes} bytes).")
+
+
+@app.command("transfer")
+def transfer_batch(
+    path: str = typer.Argument(
+        ..., help="CSV with from_account, to_account (names or ids) and amount."
+    ),
+):
+    """Apply a file of transfers (e.g. a month-end sweep) in one commit."""
+    db = _session()
+    accounts = AccountService(db)
+
+    def resolve(account: str, line: int) -> str:
+        ref = accounts.get_account_ref(account) or accounts.get_account_ref_by_name(
+            account
+        )
+        if not ref:
+            typer.echo(f"line {line}: account not found: {account}")
+            raise typer.Exit(code=1)
+        return ref.id
+
+    with open(path, newline="") as f:
+        transfers = [
+            AccountTransfer(
+                from_account_id=resolve(row["from_account"], line),
+                to_account_id=resolve(row["to_account"], line),
+                amount=row["amount"],
+            )
+            for line, row in enumerate(csv.DictReader(f), start=2)
+        ]
+    try:
+        summary = accounts.transfer_batch(transfers)
+    except FortunaError as e:
+        typer.echo(e.detail)
+        raise typer.Exit(code=1)
+    typer.echo(
+        f"Applied {summary.transfers} transfers (total {summary.total_amount}) "
+        f"across {len(summary.account_deltas)} accounts."
+    )
+
+
+@app.command("process-subscriptions")
+def process_subscriptions(
+    batch_size: int = typer.Option(500, help="Subscriptions per batch and commit."),
+):
+    """Charge all due subscriptions of every user, including missed periods."""
+    # Here rather than at the top: NumPy would slow down every command
+    from services import SubscriptionService
+
+    connection = DatabaseConnection()
+    for user_id in connection.user_ids():
+        with connection.new_session(user_id) as db:
+            summary = SubscriptionService(db).process_due_payments_batch(
+                batch_size=batch_size
+            )
+        if not summary.subscriptions and not summary.skipped:
+            continue
+        typer.echo(
+            f"{user_id}: processed {summary.transactions} payments for "
+            f"{summary.subscriptions} subscriptions in {summary.batches} batches "
+            f"(total {summary.total_amount})."
+        )
+        for subscription_id, reason in summary.skipped:
+            typer.echo(f"  skipped {subscription_id}: {reason}")
+
+
+@app.command("forecast")
+def forecast(
+    months: int = typer.Option(12, help="Months to project after the current one."),
+    account: Optional[str] = typer.Option(
+        None, help="Account name or id (default: all)."
+    ),
+    history_months: int = typer.Option(6, help="Full months averaged for income."),
+):
+    """Project month-end balances from subscriptions, budgets and income."""
+    # Here rather than at the top: NumPy would slow down every command
+    from services import ForecastService
+
+    db = _session()
+    accounts = AccountService(db)
+    account_id = None
+    if account is not None:
+        ref = accounts.get_account_ref(account) or accounts.get_account_ref_by_name(
+            account
+        )
+        if not ref:
+            typer.echo(f"Account not found: {account}")
+            raise typer.Exit(code=1)
+        account_id = ref.id
+    try:
+        result = ForecastService(db).forecast(months, account_id, history_months)
+    except FortunaError as e:
+        typer.echo(e.detail)
+        raise typer.Exit(code=1)
+    if not result.account_ids:
+        typer.echo("No accounts.")
+        return
+    names = [accounts.get_account_ref(id).name for id in result.account_ids]
+    typer.echo("month     " + "".join(f"{name[:14]:>15}" for name in names))
+    dates, balances = result.month_ends()
+    for column, day in enumerate(dates):
+        typer.echo(
+            f"{str(day)[:7]:<10}"
+            + "".join(f"{balance:>15,.2f}" for balance in balances[:, column])
+        )
+    lowest, on = result.lowest()
+    for name, balance, day in zip(names, lowest, on):
+        typer.echo(f"Lowest {name}: {balance:,.2f} on {day}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,25 @@
+# fortuna/backend/app/core/exceptions.py
+"""Errors raised by the services.
+
+They say what went wrong, not how to report it: the API maps them to HTTP
+responses (api/errors.py) and the CLIs print ``detail``, so the services
+never import FastAPI.
+"""
+
+
+class FortunaError(Exception):
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        # Message for the user, the body of API error responses
+        self.detail = detail
+
+
+class NotFoundError(FortunaError):
+    # A record the operation refers to does not exist (HTTP 404)
+    pass
+
+
+class InvalidInputError(FortunaError):
+    # The operation is rejected as asked: bad or conflicting values, a budget
+    # it would exceed, or a write the database refused (HTTP 400)
+    pass
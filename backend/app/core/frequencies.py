@@ -0,0 +1,12 @@
+# fortuna/backend/app/core/frequencies.py
+from typing import Dict, Tuple
+
+# Period of each subscription frequency as (days, months). Kept apart from
+# the NumPy recurrence engine (core/recurrence.py) so that validating a
+# frequency does not import NumPy.
+FREQUENCIES: Dict[str, Tuple[int, int]] = {
+    "daily": (1, 0),
+    "weekly": (7, 0),
+    "monthly": (0, 1),
+    "yearly": (0, 12),
+}
@@ -0,0 +1,28 @@
+# fortuna/backend/app/core/money.py
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Union
+
+CENT = Decimal("0.01")
+
+MoneyInput = Union[Decimal, int, float, str]
+
+
+def to_decimal(value: MoneyInput) -> Decimal:
+    # Floats go through their shortest repr so 0.1 stays 0.1, not 0.1000000000000000055
+    if isinstance(value, float):
+        value = repr(value)
+    try:
+        amount = Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return amount
+
+
+def to_cents(value: MoneyInput) -> int:
+    return int(to_decimal(value) * 100)
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(int(cents)) / 100).quantize(CENT)
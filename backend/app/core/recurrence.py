@@ -0,0 +1,174 @@
+# fortuna/backend/app/core/recurrence.py
+"""Calendar-correct recurrence rules, evaluated for many schedules at once.
+
+A schedule is an ``anchor`` (its first occurrence), a ``frequency``, an
+``interval`` (every N periods) and an optional inclusive ``end``.
+Occurrence ``k`` is computed from the anchor directly, never by stepping
+from the previous one, so month lengths cannot drift it: a monthly
+schedule anchored on Jan 31 falls on Feb 28 (29), Mar 31, Apr 30; a yearly
+one anchored on Feb 29 on Feb 28 in common years. The time of day of the
+anchor is kept.
+
+Everything works on NumPy arrays (``datetime64[us]``), one row per
+schedule, so the next K occurrences of thousands of schedules, or all of
+their occurrences in a window, cost a handful of vector operations.
+"""
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+from core.frequencies import FREQUENCIES
+
+NAT = np.datetime64("NaT", "us")
+_DAY_US = 86_400_000_000
+
+Instant = Union[datetime, np.datetime64, np.ndarray]
+
+
+def _instants(values) -> np.ndarray:
+    # datetimes / datetime64 (None for "no end") -> datetime64[us]
+    return np.asarray(values, dtype="datetime64[us]")
+
+
+class Schedules:
+    """A batch of schedules as parallel arrays; rows keep the input order.
+
+    Unknown frequencies and intervals below 1 produce no occurrences.
+    """
+
+    def __init__(
+        self,
+        anchors: Sequence,
+        frequencies: Sequence[str],
+        intervals: Optional[Sequence[int]] = None,
+        ends: Optional[Sequence] = None,
+    ):
+        self.anchors = _instants(anchors)
+        size = len(self.anchors)
+        frequencies = np.asarray(frequencies)
+        if intervals is None:
+            intervals = np.ones(size, dtype=np.int64)
+        intervals = np.asarray(intervals, dtype=np.int64)
+        self.ends = np.full(size, NAT) if ends is None else _instants(ends)
+        self.step_days = np.zeros(size, dtype=np.int64)
+        self.step_months = np.zeros(size, dtype=np.int64)
+        for frequency, (days, months) in FREQUENCIES.items():
+            rows = frequencies == frequency
+            self.step_days[rows] = days * intervals[rows]
+            self.step_months[rows] = months * intervals[rows]
+        self.valid = (self.step_days > 0) | (self.step_months > 0)
+        self.by_month = self.step_months > 0
+
+        # Parts of the anchor that month arithmetic keeps
+        day = self.anchors.astype("datetime64[D]")
+        self._month = day.astype("datetime64[M]")
+        self._day_of_month = (day - self._month.astype("datetime64[D]")).astype(
+            np.int64
+        )
+        self._time = self.anchors - day.astype("datetime64[us]")
+
+    def __len__(self) -> int:
+        return len(self.anchors)
+
+    @staticmethod
+    def _column(values: np.ndarray, rows, index: np.ndarray) -> np.ndarray:
+        # ``values`` of ``rows``, shaped to broadcast against ``index``
+        values = values[rows]
+        return values[:, None] if index.ndim == 2 else values
+
+    def _raw(self, index: np.ndarray, rows=slice(None)) -> np.ndarray:
+        # Occurrence ``index`` of ``rows``, ignoring ends, validity and k < 0
+        index = np.asarray(index, dtype=np.int64)
+
+        def column(values):
+            return self._column(values, rows, index)
+
+        by_day = column(self.anchors) + (
+            index * column(self.step_days) * _DAY_US
+        ).astype("timedelta64[us]")
+        months = column(self._month) + (index * column(self.step_months)).astype(
+            "timedelta64[M]"
+        )
+        first = months.astype("datetime64[D]")
+        length = ((months + 1).astype("datetime64[D]") - first).astype(np.int64)
+        by_month = (
+            first + np.minimum(column(self._day_of_month), length - 1)
+        ).astype("datetime64[us]") + column(self._time)
+        return np.where(column(self.by_month), by_month, by_day)
+
+    def occurrence(self, index, rows=slice(None)) -> np.ndarray:
+        """Occurrence ``index`` of each schedule (``index`` of shape (n,) or
+        (n, k)); NaT where there is none (k < 0, after the end, invalid).
+        """
+        index = np.asarray(index, dtype=np.int64)
+        dates = self._raw(index, rows)
+        ends = self._column(self.ends, rows, index)
+        missing = (
+            (index < 0)
+            | ~self._column(self.valid, rows, index)
+            | (~np.isnat(ends) & (dates > ends))
+        )
+        return np.where(missing, NAT, dates)
+
+    def index_after(self, after: Instant, inclusive: bool = False) -> np.ndarray:
+        """Per schedule, the number of the first occurrence after ``after``
+        (or at it, with ``inclusive``); 0 when ``after`` precedes the anchor.
+        Ends are not applied. ``after`` is one instant or one per schedule.
+        """
+        after = np.broadcast_to(_instants(after), self.anchors.shape)
+        # By days: a division
+        period = np.maximum(self.step_days, 1) * _DAY_US
+        elapsed = (after - self.anchors).astype(np.int64)
+        by_day = -(-elapsed // period) if inclusive else elapsed // period + 1
+        # By months: the last occurrence in or before after's month, then
+        # at most one step forward
+        months = (
+            after.astype("datetime64[M]") - self._month
+        ).astype(np.int64) // np.maximum(self.step_months, 1)
+        candidate = self._raw(months)
+        passed = candidate < after if inclusive else candidate <= after
+        by_month = months + passed
+        return np.maximum(np.where(self.by_month, by_month, by_day), 0)
+
+    def next(self, after: Instant, count: int = 1, inclusive: bool = False):
+        """The next ``count`` occurrences after ``after`` as an (n, count)
+        array, NaT-padded once a schedule has ended.
+        """
+        first = self.index_after(after, inclusive)
+        return self.occurrence(first[:, None] + np.arange(count))
+
+    def between(
+        self, start: Instant, stop: Instant, include_stop: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Every occurrence from ``start`` (inclusive) to ``stop``, both one
+        instant or one per schedule. Returns ``(rows, dates)``: the schedule
+        of each occurrence and its date, grouped by schedule in date order.
+        """
+        first = self.index_after(start, inclusive=True)
+        last = self.index_after(stop, inclusive=not include_stop)
+        ended = ~np.isnat(self.ends)
+        past_end = self.index_after(np.where(ended, self.ends, self.anchors))
+        last = np.where(ended, np.minimum(last, past_end), last)
+        counts = np.where(self.valid, np.maximum(last - first, 0), 0)
+        rows = np.repeat(np.arange(len(self)), counts)
+        # Position of each occurrence within its schedule's run
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return rows, self._raw(first[rows] + offsets, rows)
+
+
+def next_occurrence(
+    anchor: datetime,
+    frequency: str,
+    after: datetime,
+    interval: int = 1,
+    end: Optional[datetime] = None,
+) -> Optional[datetime]:
+    # One schedule's first occurrence after ``after``; None once it has ended
+    schedule = Schedules([anchor], [frequency], [interval], [end])
+    return to_datetimes(schedule.next(after))[0]
+
+
+def to_datetimes(values: np.ndarray) -> List[Optional[datetime]]:
+    # datetime64[us] -> datetime (NaT -> None), flattened
+    return [
+        None if np.isnat(value) else value.item() for value in values.ravel()
+    ]
@@ -0,0 +1,17 @@
+# fortuna/backend/app/core/security.py
+"""API keys of the users (db/models/user.py).
+
+Keys are long random tokens, not passwords: nothing can be guessed from a
+dictionary, so a plain SHA-256 is enough to store them and keeps the check
+a single indexed lookup per request.
+"""
+import hashlib
+import secrets
+
+
+def new_api_key() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
@@ -1,5 +1,32 @@
 #fortuna/backend/app/db/__init__.py
 from .session import DatabaseConnection
-from .models import Account, Category, Transaction, Subscription
+from .models import (
+    Account,
+    Category,
+    Transaction,
+    Subscription,
+    CategoryMonthTotal,
+    BalanceLedgerEntry,
+    BalanceCheckpoint,
+    ResourceVersion,
+    User,
+)
+# Registers the full-text index DDL on the transactions table
+from . import fts
+# Registers the session hooks that bump resource versions on write
+from . import versions
+# Registers the session hooks that keep each user to their own rows
+from . import tenancy
 
-__all__ = ["DatabaseConnection", "Account", "Category", "Transaction", "Subscription"]
+__all__ = [
+    "DatabaseConnection",
+    "Account",
+    "Category",
+    "Transaction",
+    "Subscription",
+    "CategoryMonthTotal",
+    "BalanceLedgerEntry",
+    "BalanceCheckpoint",
+    "ResourceVersion",
+    "User",
+]
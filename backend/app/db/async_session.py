@@ -0,0 +1,87 @@
+#fortuna/backend/app/db/async_session.py
+import asyncio
+from typing import Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from core.config import get_settings
+from utils.instrumentation import instrument_engine
+from .session import DatabaseConnection, EnginePool, configure_sqlite, engine_options
+from .tenancy import DEFAULT_USER_ID, USER_KEY
+
+# Async DBAPI drivers for the sync URLs DatabaseConnection is configured with
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+class AsyncDatabaseConnection:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncDatabaseConnection, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        # Same database and settings as the sync connection, via an async driver
+        settings = self.settings = get_settings()
+        DatabaseConnection()  # makes sure the SQLite data directory exists
+        url = make_url(settings.database_url)
+        backend = url.get_backend_name()
+        if backend in ASYNC_DRIVERS and "+" not in url.drivername:
+            url = url.set(drivername=ASYNC_DRIVERS[backend])
+        self.engine = create_async_engine(url, **engine_options(url, settings))
+        configure_sqlite(self.engine.sync_engine, settings)
+        if settings.instrumentation_enabled:
+            instrument_engine(self.engine.sync_engine)
+        # Objects stay usable after commit without an implicit (sync) reload
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        self.tenant_databases = settings.tenant_databases
+        self.tenants = EnginePool(
+            settings.tenant_engine_pool_size,
+            self._create_tenant_engine,
+            self._dispose_later,
+        )
+        self._disposing = set()
+
+    def _create_tenant_engine(self, user_id: str) -> AsyncEngine:
+        # The sync connection creates a new tenant's tables
+        connection = DatabaseConnection()
+        connection.engine_for(user_id)
+        url = connection.tenant_url(user_id).set(drivername=ASYNC_DRIVERS["sqlite"])
+        engine = create_async_engine(url, **engine_options(url, self.settings))
+        configure_sqlite(engine.sync_engine, self.settings)
+        if self.settings.instrumentation_enabled:
+            instrument_engine(engine.sync_engine)
+        return engine
+
+    def _dispose_later(self, engine: AsyncEngine) -> None:
+        # Evicted from get_session, inside the event loop: dispose in the
+        # background rather than block the request on it
+        task = asyncio.get_running_loop().create_task(engine.dispose())
+        self._disposing.add(task)
+        task.add_done_callback(self._disposing.discard)
+
+    def engine_for(self, user_id: Optional[str]) -> AsyncEngine:
+        # The database holding ``user_id``'s data, see DatabaseConnection
+        if not self.tenant_databases or user_id in (None, DEFAULT_USER_ID):
+            return self.engine
+        return self.tenants.get(user_id)
+
+    def get_session(self, user_id: Optional[str] = DEFAULT_USER_ID) -> AsyncSession:
+        # A new session acting for ``user_id`` (None: every user), see
+        # db/tenancy.py
+        return self.Session(bind=self.engine_for(user_id), info={USER_KEY: user_id})
+
+    async def dispose(self):
+        for engine in self.tenants.clear():
+            await engine.dispose()
+        await self.engine.dispose()
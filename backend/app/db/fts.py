@@ -0,0 +1,128 @@
+#fortuna/backend/app/db/fts.py
+"""Full-text index over ``transactions.description``.
+
+SQLite: an FTS5 external-content table (the text is not stored twice) kept
+in sync by triggers, so every writer, including bulk imports and raw SQL,
+updates it in the same transaction. It is keyed on the implicit rowid of
+``transactions``; after anything that can renumber rowids or recreate the
+table (VACUUM, an Alembic batch migration) run ``cli.py search rebuild``.
+
+Postgres: a GIN expression index on ``to_tsvector('simple', description)``.
+"""
+import logging
+from sqlalchemy import column, event, table
+from sqlalchemy.exc import OperationalError
+from utils.cache import fts_cache
+from .models import Transaction
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "transactions_fts"
+# FTS5 exposes the row id and a bm25 ``rank`` hidden column
+fts_table = table(FTS_TABLE, column("rowid"), column("description"), column("rank"))
+# 'simple': lower-cased words, no stemming or stop words, like FTS5's unicode61
+PG_TSVECTOR = "to_tsvector('simple'::regconfig, coalesce(description, ''))"
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, content='transactions', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description)
+        VALUES (new.rowid, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF description ON transactions
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description)
+        VALUES ('delete', old.rowid, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description)
+        VALUES (new.rowid, new.description);
+    END""",
+]
+POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_transactions_description_fts "
+    f"ON transactions USING gin ({PG_TSVECTOR})",
+]
+
+
+def install(connection) -> bool:
+    """Create the index if missing and fill it from existing rows. Returns
+    False where full-text search is unavailable (SQLite without FTS5, other
+    databases); searches then fall back to LIKE.
+    """
+    try:
+        return _install(connection)
+    finally:
+        # Searches look again instead of trusting what available() cached
+        fts_cache.discard(_cache_key(connection))
+
+
+def _install(connection) -> bool:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+        return True
+    if dialect != "sqlite":
+        return False
+    try:
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+    except OperationalError as e:
+        logger.warning("Full-text search disabled: %s", e)
+        return False
+    rebuild(connection)
+    return True
+
+
+def rebuild(connection) -> None:
+    # Re-read every description from the content table (SQLite only)
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def _cache_key(connection) -> str:
+    # One entry per database: tenant databases each have their own
+    return str(connection.engine.url)
+
+
+def available(connection) -> bool:
+    # Looked up on every search, so cached per database (utils/cache.py)
+    return fts_cache.get_or_load(
+        _cache_key(connection), lambda: _has_index(connection)
+    )
+
+
+def _has_index(connection) -> bool:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        return True
+    if dialect != "sqlite":
+        return False
+    return (
+        connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (FTS_TABLE,),
+        ).first()
+        is not None
+    )
+
+
+@event.listens_for(Transaction.__table__, "after_create")
+def _install_on_create(target, connection, **kw):
+    install(connection)
+
+
+@event.listens_for(Transaction.__table__, "after_drop")
+def _forget_on_drop(target, connection, **kw):
+    fts_cache.discard(_cache_key(connection))
@@ -3,5 +3,19 @@ from .account import Account
 from .category import Category
 from .transaction import Transaction
 from .subscription import Subscription
+from .category_month_total import CategoryMonthTotal
+from .balance_ledger import BalanceLedgerEntry, BalanceCheckpoint
+from .resource_version import ResourceVersion
+from .user import User
 
-__all__ = ["Account", "Category", "Transaction", "Subscription"]
+__all__ = [
+    "Account",
+    "Category",
+    "Transaction",
+    "Subscription",
+    "CategoryMonthTotal",
+    "BalanceLedgerEntry",
+    "BalanceCheckpoint",
+    "ResourceVersion",
+    "User",
+]
@@ -2,16 +2,29 @@
 from datetime import datetime
 import uuid
 from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import relationship
 from ..session import Base
+from ..tenancy import UserOwned
+from ..types import Money
 
-class Account(Base):
+class Account(UserOwned, Base):
     __tablename__ = "accounts"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, unique=True, nullable=False)
-    balance = Column(Float, nullable=False)
+    name = Column(String, nullable=False)
+    balance = Column(Money, nullable=False)
 
-    # Relationships
-    transactions = relationship("Transaction", back_populates="account")
-    subscriptions = relationship("Subscription", back_populates="account")
\ No newline at end of file
+    # Relationships; never lazy-loaded (an implicit load per row is an N+1),
+    # load them explicitly with selectinload/joinedload or a service query
+    transactions = relationship(
+        "Transaction", back_populates="account", lazy="raise_on_sql"
+    )
+    subscriptions = relationship(
+        "Subscription", back_populates="account", lazy="raise_on_sql"
+    )
+
+    __table_args__ = (
+        # Names are unique per user
+        UniqueConstraint("user_id", "name", name="uq_accounts_user_name"),
+    )
@@ -0,0 +1,37 @@
+#fortuna/backend/app/db/models/balance_ledger.py
+from datetime import datetime
+from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Index
+from ..session import Base
+from ..tenancy import UserOwned
+from ..types import Money
+
+
+class BalanceLedgerEntry(UserOwned, Base):
+    # Append-only record of every change to an account balance. The id is a
+    # global sequence, so "entries after X" is a plain range scan.
+    __tablename__ = "balance_ledger"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    amount = Column(Money, nullable=False)
+    # 'opening', 'adjustment', 'transfer' or the transaction type
+    kind = Column(String, nullable=False)
+    # Not a foreign key: the entry outlives a deleted transaction
+    transaction_id = Column(String)
+    posted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Balance replay: one account's entries after a checkpoint
+        Index("ix_balance_ledger_user_account_id", "user_id", "account_id", "id"),
+    )
+
+
+class BalanceCheckpoint(UserOwned, Base):
+    # Balance of an account including every ledger entry up to entry_id
+    __tablename__ = "balance_checkpoints"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    account_id = Column(String, ForeignKey("accounts.id"), primary_key=True)
+    entry_id = Column(Integer, primary_key=True)
+    balance = Column(Money, nullable=False)
+    posted_at = Column(DateTime, nullable=False)
@@ -2,17 +2,29 @@
 from datetime import datetime
 import uuid
 from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import relationship
 from ..session import Base
+from ..tenancy import UserOwned
+from ..types import Money
 
-class Category(Base):
+class Category(UserOwned, Base):
     __tablename__ = "categories"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, unique=True, nullable=False)
-    budget = Column(Float, nullable=False)
+    name = Column(String, nullable=False)
+    budget = Column(Money, nullable=False)
     type = Column(String, nullable=False)  # 'expense' or 'income'
 
-    # Relationships
-    transactions = relationship("Transaction", back_populates="category")
-    subscriptions = relationship("Subscription", back_populates="category")
\ No newline at end of file
+    # Relationships (lazy loads raise, see Account)
+    transactions = relationship(
+        "Transaction", back_populates="category", lazy="raise_on_sql"
+    )
+    subscriptions = relationship(
+        "Subscription", back_populates="category", lazy="raise_on_sql"
+    )
+
+    __table_args__ = (
+        # Names are unique per user
+        UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+    )
@@ -0,0 +1,19 @@
+#fortuna/backend/app/db/models/category_month_total.py
+from sqlalchemy import Column, String, ForeignKey, Integer
+from ..session import Base
+from ..tenancy import UserOwned
+from ..types import Money
+
+
+class CategoryMonthTotal(UserOwned, Base):
+    # Rollup of transactions per category and month, kept up to date by the
+    # services so budget checks read a single row instead of aggregating.
+    __tablename__ = "category_month_totals"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(String, ForeignKey("categories.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    type = Column(String, primary_key=True)  # transaction type
+    total = Column(Money, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,14 @@
+#fortuna/backend/app/db/models/resource_version.py
+from sqlalchemy import Column, ForeignKey, Integer, String
+from ..session import Base
+
+
+class ResourceVersion(Base):
+    # One counter per user and API resource ("accounts", "categories", ...),
+    # bumped in the same transaction as every write to its tables; see
+    # db/versions.py
+    __tablename__ = "resource_versions"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
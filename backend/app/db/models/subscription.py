@@ -1,16 +1,26 @@
 #fortuna/backend/app/db/models/subscription.py
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime, Integer
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from ..session import Base
-class Subscription(Base):
+from ..tenancy import UserOwned
+from ..types import Money
+class Subscription(UserOwned, Base):
     __tablename__ = "subscriptions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, unique=True, nullable=False)
-    amount = Column(Float, nullable=False)
-    frequency = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    amount = Column(Money, nullable=False)
+    frequency = Column(String, nullable=False)  # see core/recurrence.py
+    # Every ``interval`` periods of ``frequency``
+    interval = Column(Integer, nullable=False, default=1, server_default="1")
+    # First payment of the schedule; later payments keep its day of month
+    # (clamped in shorter months). Reset whenever the schedule is edited.
+    anchor = Column(DateTime)
+    # No payments after this date
+    end_date = Column(DateTime)
     next_payment = Column(DateTime, nullable=False)
     active = Column(Boolean, nullable=False, default=True)
 
@@ -18,7 +28,20 @@ class Subscription(Base):
     category_id = Column(String, ForeignKey("categories.id"), nullable=False)
     account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
 
-    # Relationships
-    category = relationship("Category", back_populates="subscriptions")
-    account = relationship("Account", back_populates="subscriptions")
-    transactions = relationship("Transaction", back_populates="subscription")
\ No newline at end of file
+    # Relationships (lazy loads raise, see Account)
+    category = relationship(
+        "Category", back_populates="subscriptions", lazy="raise_on_sql"
+    )
+    account = relationship(
+        "Account", back_populates="subscriptions", lazy="raise_on_sql"
+    )
+    transactions = relationship(
+        "Transaction", back_populates="subscription", lazy="raise_on_sql"
+    )
+
+    __table_args__ = (
+        # Names are unique per user
+        UniqueConstraint("user_id", "name", name="uq_subscriptions_user_name"),
+        # A user's due subscriptions, in payment order
+        Index("ix_subscriptions_user_next_payment", "user_id", "next_payment"),
+    )
@@ -1,15 +1,17 @@
 #fortuna/backend/app/db/models/transaction.py
 from datetime import datetime
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, String, Float, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from ..session import Base
-class Transaction(Base):
+from ..tenancy import UserOwned
+from ..types import Money
+class Transaction(UserOwned, Base):
     __tablename__ = "transactions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     date = Column(DateTime, nullable=False, default=datetime.utcnow)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     description = Column(String)
     type = Column(String, nullable=False)  # 'expense', 'income', or 'subscription'
 
@@ -18,7 +20,37 @@ class Transaction(Base):
     category_id = Column(String, ForeignKey("categories.id"), nullable=False)
     subscription_id = Column(String, ForeignKey("subscriptions.id"))
 
-    # Relationships
-    account = relationship("Account", back_populates="transactions")
-    category = relationship("Category", back_populates="transactions")
-    subscription = relationship("Subscription", back_populates="transactions")
\ No newline at end of file
+    # Relationships (lazy loads raise, see Account)
+    account = relationship(
+        "Account", back_populates="transactions", lazy="raise_on_sql"
+    )
+    category = relationship(
+        "Category", back_populates="transactions", lazy="raise_on_sql"
+    )
+    subscription = relationship(
+        "Subscription", back_populates="transactions", lazy="raise_on_sql"
+    )
+
+    # Every index leads with user_id, so a user's queries only read (and
+    # their writes only lock) that user's part of it
+    __table_args__ = (
+        # Monthly budget checks: category + type + date range
+        Index(
+            "ix_transactions_user_category_type_date",
+            "user_id",
+            "category_id",
+            "type",
+            "date",
+        ),
+        # Account statements / balance history
+        Index("ix_transactions_user_account_date", "user_id", "account_id", "date"),
+        # Listings of all expenses / incomes ordered by date
+        Index("ix_transactions_user_type_date", "user_id", "type", "date"),
+        # Payment history per subscription
+        Index(
+            "ix_transactions_user_subscription_date",
+            "user_id",
+            "subscription_id",
+            "date",
+        ),
+    )
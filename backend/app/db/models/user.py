@@ -0,0 +1,28 @@
+#fortuna/backend/app/db/models/user.py
+from datetime import datetime
+import uuid
+from sqlalchemy import Column, String, DateTime, event, insert
+from ..session import Base
+from ..tenancy import DEFAULT_USER_ID
+
+
+class User(Base):
+    # Owner of a partition of the data (db/tenancy.py). Users always live in
+    # the main database, also when their data has a database of its own.
+    __tablename__ = "users"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, unique=True, nullable=False)
+    # SHA-256 of the API key (core/security.py); the key itself is not stored
+    api_key_hash = Column(String, unique=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+@event.listens_for(User.__table__, "after_create")
+def _create_default_user(target, connection, **kw):
+    # Owns the data of single-user installs (db/tenancy.py)
+    connection.execute(
+        insert(target).values(
+            id=DEFAULT_USER_ID, name=DEFAULT_USER_ID, created_at=datetime.utcnow()
+        )
+    )
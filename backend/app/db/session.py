@@ -1,11 +1,141 @@
 #fortuna/backend/app/db/session.py
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, List, Optional
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import Engine, make_url, URL
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
+from core.config import Settings, get_settings
+from utils.instrumentation import instrument_engine, instrument_orm
+from .tenancy import DEFAULT_USER_ID, USER_KEY
 
 Base = declarative_base()
 
+# User ids that may name a tenant database file
+_TENANT_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def engine_options(url: URL, settings: Settings) -> dict:
+    # create_engine / create_async_engine keyword arguments for ``url``
+    options = {"echo": settings.db_echo, "pool_pre_ping": settings.db_pool_pre_ping}
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection; no pool to size
+        return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    timeout = settings.db_statement_timeout_ms
+    if backend == "postgresql" and timeout:
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(timeout)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def configure_sqlite(engine: Engine, settings: Settings) -> None:
+    """Apply performance pragmas (and the statement timeout) on every connect.
+
+    WAL lets readers proceed while a writer holds the lock, and busy_timeout
+    makes writers wait for each other instead of failing immediately.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+    ]
+    timeout = settings.db_statement_timeout_ms / 1000
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        # SQLite has no statement_timeout; abort long statements from the
+        # progress handler instead (sync driver only)
+        if timeout and hasattr(dbapi_connection, "set_progress_handler"):
+            deadline = connection_record.info["statement_deadline"] = [None]
+            dbapi_connection.set_progress_handler(
+                lambda: int(deadline[0] is not None and time.monotonic() > deadline[0]),
+                10000,
+            )
+
+    if timeout:
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start_deadline(conn, cursor, statement, parameters, context, executemany):
+            deadline = conn.info.get("statement_deadline")
+            if deadline is not None:
+                deadline[0] = time.monotonic() + timeout
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _clear_deadline(conn, cursor, statement, parameters, context, executemany):
+            deadline = conn.info.get("statement_deadline")
+            if deadline is not None:
+                deadline[0] = None
+
+
+class EnginePool:
+    """The open engines of tenant databases, at most ``maxsize`` of them.
+
+    Engines are created on first use and the least recently used one is
+    disposed to make room, so the open files and pooled connections stay
+    bounded however many users there are. Sessions still using an evicted
+    engine keep working; its connections are closed as they are returned.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        create: Callable[[Hashable], Any],
+        dispose: Callable[[Any], None],
+    ):
+        self.maxsize = maxsize
+        self._create = create
+        self._dispose = dispose
+        self._engines: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Held while creating too, so a tenant's tables are set up only once
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        evicted = []
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                return engine
+            engine = self._engines[key] = self._create(key)
+            while len(self._engines) > self.maxsize:
+                evicted.append(self._engines.popitem(last=False)[1])
+        for old in evicted:
+            self._dispose(old)
+        return engine
+
+    def clear(self) -> List[Any]:
+        # Forget every engine; the caller disposes the returned ones
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+            return engines
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
 
 class DatabaseConnection:
     _instance = None
@@ -17,23 +147,102 @@ class DatabaseConnection:
         return cls._instance
 
     def initialize(self):
-        # Create the appdata directory if it doesn't exist
-        appdata_path = os.path.join(os.getenv("APPDATA"), "finance_manager")
-        if not os.path.exists(appdata_path):
-            os.makedirs(appdata_path)
+        settings = self.settings = get_settings()
+        url = make_url(settings.database_url)
+
+        self.db_path = None
+        if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+            # Create the data directory if it doesn't exist
+            self.db_path = url.database
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
 
-        self.db_path = os.path.join(appdata_path, "finance_manager.db")
-        self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
+        self.engine = create_engine(url, **engine_options(url, settings))
+        configure_sqlite(self.engine, settings)
+        if settings.instrumentation_enabled:
+            instrument_engine(self.engine)
+            instrument_orm(Base)
 
         # Create session factory
         session_factory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(session_factory)
 
+        self.tenant_databases = settings.tenant_databases
+        self.tenant_dir = os.path.join(settings.data_dir, "tenants")
+        self.tenants = EnginePool(
+            settings.tenant_engine_pool_size,
+            self._create_tenant_engine,
+            lambda engine: engine.dispose(),
+        )
+
     def create_tables(self):
         Base.metadata.create_all(self.engine)
 
-    def get_session(self):
-        return self.Session()
+    def tenant_url(self, user_id: str) -> URL:
+        if not _TENANT_ID.fullmatch(user_id):
+            raise ValueError(f"Invalid user id: {user_id!r}")
+        return make_url("sqlite:///" + os.path.join(self.tenant_dir, f"{user_id}.db"))
+
+    def _create_tenant_engine(self, user_id: str) -> Engine:
+        os.makedirs(self.tenant_dir, exist_ok=True)
+        url = self.tenant_url(user_id)
+        engine = create_engine(url, **engine_options(url, self.settings))
+        configure_sqlite(engine, self.settings)
+        if self.settings.instrumentation_enabled:
+            instrument_engine(engine)
+        # New tenants start with an empty schema; users stay in the main database
+        Base.metadata.create_all(
+            engine,
+            tables=[t for t in Base.metadata.sorted_tables if t.name != "users"],
+        )
+        return engine
+
+    def engine_for(self, user_id: Optional[str]) -> Engine:
+        # The database holding ``user_id``'s data
+        if not self.tenant_databases or user_id in (None, DEFAULT_USER_ID):
+            return self.engine
+        return self.tenants.get(user_id)
+
+    def _session_options(self, user_id: Optional[str]) -> dict:
+        return {"bind": self.engine_for(user_id), "info": {USER_KEY: user_id}}
+
+    def get_session(self, user_id: Optional[str] = DEFAULT_USER_ID) -> Session:
+        """The calling thread's session, acting for ``user_id``; ``None``
+        gives one that sees every user, for maintenance (db/tenancy.py).
+
+        A thread acts for one user at a time: asking for another user closes
+        the thread's current session first. Use :meth:`new_session` to work
+        for several users at once.
+        """
+        if self.Session.registry.has():
+            session = self.Session()
+            if session.info.get(USER_KEY, ...) == user_id:
+                return session
+            self.Session.remove()
+        return self.Session(**self._session_options(user_id))
+
+    def new_session(self, user_id: Optional[str] = DEFAULT_USER_ID) -> Session:
+        # An independent session for ``user_id``; the caller closes it
+        return self.Session.session_factory(**self._session_options(user_id))
+
+    def user_ids(self) -> List[str]:
+        from .models import User
+
+        with self.new_session(None) as session:
+            return list(session.scalars(select(User.id).order_by(User.id)))
+
+    def partitions(self) -> Iterator[Session]:
+        """Sessions that together see every user's data, one per database:
+        the main one, plus each user's own with tenant databases. Each is
+        closed when the next one is produced.
+        """
+        with self.new_session(None) as session:
+            yield session
+        if not self.tenant_databases:
+            return
+        for user_id in self.user_ids():
+            if user_id != DEFAULT_USER_ID:
+                with self.new_session(user_id) as session:
+                    yield session
 
     def close_session(self):
         self.Session.remove()
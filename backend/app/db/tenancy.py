@@ -0,0 +1,78 @@
+#fortuna/backend/app/db/tenancy.py
+"""Per-user partitioning of the data.
+
+Every row of a ``UserOwned`` table belongs to one user, and a session acts
+for at most one: ``DatabaseConnection().get_session(user_id)`` records the
+user in ``session.info``. For such a session every ORM SELECT / UPDATE /
+DELETE gets ``user_id = :user`` added (joins, subqueries and relationship
+loads included, via ``with_loader_criteria``) and new objects are stamped
+with the user, so the services never pass the user around and cannot see
+or touch another user's rows. ``user_id`` leads every hot index, so one
+user's queries only read that user's part of the index.
+
+Statements on plain ``Table`` objects are not rewritten: the services add
+``owned(table, session)`` to them and ``require_user(session)`` to the rows
+they insert. A session without a user (``get_session(None)``) sees every
+user; maintenance jobs and the scheduler use those.
+"""
+from typing import List, Optional
+from sqlalchemy import Column, ForeignKey, String, event
+from sqlalchemy.orm import Session, declared_attr, with_loader_criteria
+from sqlalchemy.sql.elements import ColumnElement
+
+# Owner of everything created before users existed, and of requests without
+# an API key unless FORTUNA_AUTH_REQUIRED is set
+DEFAULT_USER_ID = "default"
+
+# session.info key of the user the session acts for
+USER_KEY = "user_id"
+
+
+class UserOwned:
+    # Mixin for the tables partitioned by user
+    @declared_attr
+    def user_id(cls):
+        return Column(String, ForeignKey("users.id"), nullable=False)
+
+
+def current_user(session: Session) -> Optional[str]:
+    # The user ``session`` acts for; None for a session that sees every user
+    return session.info.get(USER_KEY)
+
+
+def require_user(session: Session) -> str:
+    # Owner for rows inserted with Core statements
+    user_id = current_user(session)
+    if user_id is None:
+        raise ValueError("This operation needs a session acting for a user")
+    return user_id
+
+
+def owned(table, session: Session) -> List[ColumnElement]:
+    # WHERE criteria keeping a Core statement on ``table`` to the session's user
+    user_id = current_user(session)
+    return [] if user_id is None else [table.c.user_id == user_id]
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _scope_to_user(state):
+    user_id = current_user(state.session)
+    if user_id is None or state.is_column_load or state.is_relationship_load:
+        # Lazy and deferred loads inherit the criteria of the original query
+        return
+    if state.is_select or state.is_update or state.is_delete:
+        state.statement = state.statement.options(
+            with_loader_criteria(
+                UserOwned, lambda cls: cls.user_id == user_id, include_aliases=True
+            )
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_owner(session, flush_context, instances):
+    user_id = current_user(session)
+    if user_id is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, UserOwned) and obj.user_id is None:
+            obj.user_id = user_id
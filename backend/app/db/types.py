@@ -0,0 +1,21 @@
+#fortuna/backend/app/db/types.py
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+from core.money import from_cents, to_cents
+
+
+class Money(TypeDecorator):
+    """Fixed-point amount stored as integer minor units (cents).
+
+    Python sees ``Decimal`` values with two places; the database only ever
+    sees integers, so SUM() and ``balance + :delta`` stay exact.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(value)
@@ -0,0 +1,154 @@
+#fortuna/backend/app/db/versions.py
+"""Per-resource version counters behind the API's ETags.
+
+A committed write to any table in ``TABLE_RESOURCES`` bumps the counters of
+the resources that table feeds, in the same transaction, so whoever reads
+version N (from any process) also sees every write that came before it.
+Writes are picked up in the Session itself: objects flushed by the unit of
+work, and INSERT / UPDATE / DELETE statements run through
+``Session.execute``, so every service is covered without calling anything.
+Statements run directly on a Connection are not seen; use ``touch`` for
+those.
+
+The counters are updated right before COMMIT, so on Postgres their row
+locks are held for the commit only, not for the whole write transaction.
+
+Counters are kept per user: a write bumps its owner's counters only, so one
+user's writes never invalidate another user's cached responses. A statement
+run by a session that sees every user (db/tenancy.py) bumps every user's.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from .models import ResourceVersion
+from .tenancy import current_user
+
+RESOURCES = ("accounts", "categories", "transactions", "subscriptions")
+
+# Table -> resources whose API representations are read from it
+TABLE_RESOURCES: Dict[str, Tuple[str, ...]] = {
+    "accounts": ("accounts",),
+    # Balances at a point in time are read from the ledger
+    "balance_ledger": ("accounts",),
+    "balance_checkpoints": ("accounts",),
+    "categories": ("categories",),
+    # Budget status and the dashboard
+    "category_month_totals": ("categories",),
+    "transactions": ("transactions",),
+    "subscriptions": ("subscriptions",),
+}
+
+_table = ResourceVersion.__table__
+# session.info key of the (user_id, resource) pairs written in the current
+# transaction; a user_id of None stands for every user
+_TOUCHED = "touched_resources"
+
+
+def touch(session: Session, *resources: str, user_id: Optional[str] = None) -> None:
+    # Bump these resources (of the session's user by default) on commit
+    user_id = user_id or current_user(session)
+    session.info.setdefault(_TOUCHED, set()).update(
+        (user_id, resource) for resource in resources
+    )
+
+
+def current(session: Session, resources: Iterable[str]) -> Tuple[int, ...]:
+    # The session user's committed versions of ``resources``, in order, in
+    # one primary key lookup
+    resources = tuple(resources)
+    rows = dict(
+        session.execute(
+            select(_table.c.name, _table.c.version).where(
+                _table.c.user_id == current_user(session),
+                _table.c.name.in_(resources),
+            )
+        ).all()
+    )
+    return tuple(rows.get(name, 0) for name in resources)
+
+
+def bump(session: Session, touched: Iterable[Tuple[Optional[str], str]]) -> None:
+    by_user: Dict[Optional[str], Set[str]] = defaultdict(set)
+    for user_id, resource in touched:
+        by_user[user_id].add(resource)
+    # Sorted, so concurrent writers lock the rows in the same order
+    for user_id in sorted(by_user, key=lambda user_id: user_id or ""):
+        names = sorted(by_user[user_id])
+        if user_id is None:
+            session.execute(
+                update(_table)
+                .where(_table.c.name.in_(names))
+                .values(version=_table.c.version + 1)
+            )
+            continue
+        result = session.execute(
+            update(_table)
+            .where(_table.c.user_id == user_id, _table.c.name.in_(names))
+            .values(version=_table.c.version + 1)
+        )
+        if result.rowcount != len(names):
+            # A user's counters start at their first write, all at once so
+            # later writes are a single UPDATE
+            existing = set(
+                session.scalars(
+                    select(_table.c.name).where(_table.c.user_id == user_id)
+                )
+            )
+            session.execute(
+                insert(_table),
+                [
+                    {"user_id": user_id, "name": name, "version": int(name in names)}
+                    for name in sorted(set(RESOURCES) | set(names))
+                    if name not in existing
+                ],
+            )
+
+
+def _touch_table(session: Session, table_name, user_id: Optional[str]) -> None:
+    resources = TABLE_RESOURCES.get(table_name)
+    if resources:
+        touch(session, *resources, user_id=user_id)
+
+
+def _touch_object(session: Session, obj) -> None:
+    _touch_table(
+        session, getattr(obj, "__tablename__", None), getattr(obj, "user_id", None)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    # new / dirty / deleted still hold the flushed objects, cascades included
+    for obj in session.new | session.deleted:
+        _touch_object(session, obj)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            _touch_object(session, obj)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        _touch_table(
+            state.session,
+            getattr(state.statement.table, "name", None),
+            current_user(state.session),
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session):
+    # Flush first: commit would flush after this hook and miss those writes
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        bump(session, touched)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget(session, transaction):
+    # Rolled back (or committed): nothing left to bump
+    if transaction.parent is None:
+        session.info.pop(_TOUCHED, None)
@@ -1,13 +1,14 @@
 # fortuna/backend/app/main.py
 from datetime import datetime
+from functools import cached_property
 import sys
+from core.frequencies import FREQUENCIES
 from db import DatabaseConnection
 from services import (
     ExpenseService,
     AccountService,
     CategoryService,
     IncomeService,
-    SubscriptionService,
 )
 
 from schemas import (
@@ -27,34 +28,35 @@ from schemas import (
 )
 
 
-# Helper functions to look up IDs by name
+# Helper functions to look up IDs by name (cached, case-insensitive)
 def lookup_account_id(account_service: AccountService, name: str) -> str:
-    accounts = account_service.get_all_accounts()
-    for acc in accounts:
-        if acc.name.lower() == name.lower():
-            return acc.id
-    return None
+    account = account_service.get_account_ref_by_name(name)
+    return account.id if account else None
 
 
 def lookup_category_id(category_service: CategoryService, name: str, type_: str) -> str:
-    categories = category_service.get_all_categories()
-    for cat in categories:
-        if cat.name.lower() == name.lower() and cat.type.lower() == type_.lower():
-            return cat.id
-    return None
+    category = category_service.get_category_ref_by_name(name, type_)
+    return category.id if category else None
 
 
 class FinanceManager:
     def __init__(self):
-        # Create a shared DB session
+        # Create a shared DB session, acting for the default user
         db = DatabaseConnection().get_session()
         self.db = db
         self.account_service = AccountService(db)
         self.expense_service = ExpenseService(db)
         self.income_service = IncomeService(db)
-        self.subscription_service = SubscriptionService(db)
         self.category_service = CategoryService(db)
 
+    @cached_property
+    def subscription_service(self):
+        # On first use: payment processing needs NumPy, which the menu
+        # should not pay for at startup
+        from services import SubscriptionService
+
+        return SubscriptionService(self.db)
+
     def run(self):
         while True:
             self.display_main_menu()
@@ -251,22 +253,22 @@ class FinanceManager:
             elif choice == "7":
                 self.move_transaction()
             elif choice == "8":
-                expenses = self.expense_service.get_all_expenses()
-                if expenses:
-                    for exp in expenses:
-                        print(
-                            f"ID: {exp.id}, Date: {exp.date}, Amount: {exp.amount}, Description: {exp.description}"
-                        )
-                else:
+                found = False
+                for exp in self.expense_service.iter_expenses():
+                    found = True
+                    print(
+                        f"ID: {exp.id}, Date: {exp.date}, Amount: {exp.amount}, Description: {exp.description}"
+                    )
+                if not found:
                     print("No expenses found.")
             elif choice == "9":
-                incomes = self.income_service.get_all_incomes()
-                if incomes:
-                    for inc in incomes:
-                        print(
-                            f"ID: {inc.id}, Date: {inc.date}, Amount: {inc.amount}, Description: {inc.description}"
-                        )
-                else:
+                found = False
+                for inc in self.income_service.iter_incomes():
+                    found = True
+                    print(
+                        f"ID: {inc.id}, Date: {inc.date}, Amount: {inc.amount}, Description: {inc.description}"
+                    )
+                if not found:
                     print("No incomes found.")
             elif choice == "0":
                 break
@@ -284,6 +286,7 @@ class FinanceManager:
             print("6. Delete Income Category")
             print("7. View Expense Categories")
             print("8. View Income Categories")
+            print("9. View Monthly Budget Dashboard")
             print("0. Back to Main Menu")
             choice = input("Enter your choice: ")
             if choice == "1":
@@ -394,6 +397,23 @@ class FinanceManager:
                         print(f"ID: {cat.id}, Name: {cat.name}, Target: {cat.budget}")
                 else:
                     print("No income categories found.")
+            elif choice == "9":
+                try:
+                    year = int(input("Enter year (YYYY): "))
+                    month = int(input("Enter month (1-12): "))
+                    dashboard = self.category_service.get_dashboard((year, month))
+                except Exception as e:
+                    print("Error loading dashboard:", e)
+                    continue
+                if not dashboard.categories:
+                    print("No categories found.")
+                for row in dashboard.categories:
+                    print(
+                        f"{row.type.capitalize()} - {row.name}: "
+                        f"Total: {row.totals[0]}, Budget: {row.budget}, "
+                        f"Remaining: {row.remaining[0]}, "
+                        f"Used: {row.percentages[0]:.1f}%"
+                    )
             elif choice == "0":
                 break
             else:
@@ -491,10 +511,15 @@ class FinanceManager:
             if choice == "1":
                 name = input("Enter subscription name: ")
                 amount = float(input("Enter subscription amount: "))
-                frequency = input("Enter frequency (weekly/monthly/yearly): ").lower()
-                if frequency not in ["weekly", "monthly", "yearly"]:
+                frequency = input(
+                    f"Enter frequency ({'/'.join(FREQUENCIES)}): "
+                ).lower()
+                if frequency not in FREQUENCIES:
                     print("Invalid frequency")
                     continue
+                interval_str = input(
+                    "Charge every how many periods? (press Enter for 1): "
+                ).strip()
                 category_name = input("Enter expense category name for subscription: ")
                 account_name = input("Enter account name: ")
                 next_payment_str = input("Enter first payment date (YYYY-MM-DD): ")
@@ -511,6 +536,7 @@ class FinanceManager:
                             name=name,
                             amount=amount,
                             frequency=frequency,
+                            interval=int(interval_str) if interval_str else 1,
                             next_payment=datetime.strptime(
                                 next_payment_str, "%Y-%m-%d"
                             ),
@@ -531,7 +557,8 @@ class FinanceManager:
                 ).strip()
                 new_frequency = (
                     input(
-                        "Enter new frequency (weekly/monthly/yearly) or press Enter to keep current: "
+                        f"Enter new frequency ({'/'.join(FREQUENCIES)}) "
+                        "or press Enter to keep current: "
                     )
                     .strip()
                     .lower()
@@ -605,23 +632,25 @@ class FinanceManager:
                 except Exception as e:
                     print(f"Error: {e}")
             elif choice == "4":
-                processed = self.subscription_service.process_due_payments()
-                if processed:
-                    print(f"\nProcessed {len(processed)} subscription payments:")
-                    for transaction in processed:
-                        print(
-                            f"- Transaction ID: {transaction.id}, Date: {transaction.date}"
-                        )
+                summary = self.subscription_service.process_due_payments_batch()
+                if summary.transactions:
+                    print(
+                        f"\nProcessed {summary.transactions} subscription payments "
+                        f"for {summary.subscriptions} subscriptions "
+                        f"(total {summary.total_amount})."
+                    )
                 else:
                     print("\nNo subscription payments were due.")
+                for subscription_id, reason in summary.skipped:
+                    print(f"- Skipped {subscription_id}: {reason}")
             elif choice == "5":
-                subs = self.subscription_service.get_all_subscriptions()
-                if subs:
-                    for sub in subs:
-                        print(
-                            f"ID: {sub.id}, Name: {sub.name}, Amount: {sub.amount}, Frequency: {sub.frequency}, Next Payment: {sub.next_payment}, Active: {sub.active}"
-                        )
-                else:
+                found = False
+                for sub in self.subscription_service.iter_subscriptions():
+                    found = True
+                    print(
+                        f"ID: {sub.id}, Name: {sub.name}, Amount: {sub.amount}, Frequency: {sub.frequency}, Next Payment: {sub.next_payment}, Active: {sub.active}"
+                    )
+                if not found:
                     print("No subscriptions found.")
             elif choice == "6":
                 subscription_id = input(
@@ -647,14 +676,14 @@ class FinanceManager:
                     else:
                         print("Subscription not found.")
                 else:
-                    subs = self.subscription_service.get_all_subscriptions()
-                    for sub in subs:
-                        print(f"\nTransactions for subscription {sub.name}:")
-                        transactions = (
-                            self.subscription_service.get_subscription_transactions(
-                                sub.id
-                            )
+                    listings = (
+                        self.subscription_service.get_subscriptions_with_transactions()
+                    )
+                    for listing in listings:
+                        print(
+                            f"\nTransactions for subscription {listing.subscription.name}:"
                         )
+                        transactions = listing.transactions
                         if transactions:
                             for tx in transactions:
                                 print(
@@ -5,6 +5,9 @@ from .transaction import Transaction, TransactionCreate, TransactionUpdate
 from .expense import Expense, ExpenseCreate, ExpenseUpdate
 from .income import Income, IncomeCreate, IncomeUpdate
 from .subscription import Subscription, SubscriptionCreate, SubscriptionUpdate
+from .user import User, UserCreate, UserWithKey
+from .page import Page
+from .money import Money
 
 __all__ = [
     "Account",
@@ -26,4 +29,9 @@ __all__ = [
     "Subscription",
     "SubscriptionCreate",
     "SubscriptionUpdate",
+    "User",
+    "UserCreate",
+    "UserWithKey",
+    "Page",
+    "Money",
 ]
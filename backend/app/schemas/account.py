@@ -1,10 +1,11 @@
 # fortuna/backend/app/schemas/account.py
 from pydantic import BaseModel, Field
+from .money import Money
 
 
 class AccountBase(BaseModel):
     name: str = Field(..., example="Main Account")
-    balance: float = Field(..., example=1000.0)
+    balance: Money = Field(..., example=1000.0)
 
 
 class AccountCreate(AccountBase):
@@ -13,13 +14,13 @@ class AccountCreate(AccountBase):
 
 class AccountUpdate(BaseModel):
     name: str = Field(None, example="Updated Account Name")
-    balance: float = Field(None, example=1500.0)
+    balance: Money = Field(None, example=1500.0)
 
 
 class AccountTransfer(BaseModel):
     from_account_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174000")
     to_account_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
-    amount: float = Field(..., example=500.0)
+    amount: Money = Field(..., example=500.0)
 
 
 class Account(AccountBase):
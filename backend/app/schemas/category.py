@@ -1,10 +1,11 @@
 # fortuna/backend/app/schemas/category.py
 from pydantic import BaseModel, Field
+from .money import Money
 
 
 class CategoryBase(BaseModel):
     name: str = Field(..., example="Groceries")
-    budget: float = Field(..., example=300.0)
+    budget: Money = Field(..., example=300.0)
     type: str = Field(..., example="expense")  # or "income"
 
 
@@ -14,7 +15,7 @@ class CategoryCreate(CategoryBase):
 
 class CategoryUpdate(BaseModel):
     name: str = Field(None, example="Food")
-    budget: float = Field(None, example=350.0)
+    budget: Money = Field(None, example=350.0)
     type: str = Field(None, example="expense")
 
 
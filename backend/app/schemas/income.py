@@ -1,11 +1,12 @@
 # fortuna/backend/app/schemas/income.py
 from datetime import datetime
 from pydantic import BaseModel, Field
+from .money import Money
 
 
 class IncomeBase(BaseModel):
     date: datetime = Field(..., example="2023-01-15T00:00:00")
-    amount: float = Field(..., example=1000.0)
+    amount: Money = Field(..., example=1000.0)
     description: str = Field(..., example="Salary payment")
     account_id: str = Field(..., example="account_id_example")
     category_id: str = Field(..., example="income_category_id_example")
@@ -17,7 +18,7 @@ class IncomeCreate(IncomeBase):
 
 class IncomeUpdate(BaseModel):
     date: datetime = Field(None, example="2023-01-15T00:00:00")
-    amount: float = Field(None, example=1000.0)
+    amount: Money = Field(None, example=1000.0)
     description: str = Field(None, example="Salary payment")
     account_id: str = Field(None, example="account_id_example")
     category_id: str = Field(None, example="income_category_id_example")
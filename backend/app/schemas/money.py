@@ -0,0 +1,13 @@
+# fortuna/backend/app/schemas/money.py
+from decimal import Decimal
+from typing import Annotated
+from pydantic import BeforeValidator, PlainSerializer
+from core.money import to_decimal
+
+# Amounts are validated into two-place Decimals on the way in and emitted as
+# JSON numbers on the way out; everything in between is exact.
+Money = Annotated[
+    Decimal,
+    BeforeValidator(lambda value: value if value is None else to_decimal(value)),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
@@ -0,0 +1,13 @@
+# fortuna/backend/app/schemas/page.py
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, example="WyIyMDIzLTAxLTE1VDAwOjAwOjAwIiwgIjEyMyJd")
+
+    class Config:
+        from_attributes = True
@@ -1,36 +1,55 @@
 # fortuna/backend/app/schemas/subscription.py
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from core.frequencies import FREQUENCIES
+from .money import Money
+
+
+def _known_frequency(value: Optional[str]) -> Optional[str]:
+    if value is not None and value not in FREQUENCIES:
+        raise ValueError(f"frequency must be one of: {', '.join(FREQUENCIES)}")
+    return value
 
 
 class SubscriptionBase(BaseModel):
     name: str = Field(..., example="Netflix")
-    amount: float = Field(..., example=15.99)
+    amount: Money = Field(..., example=15.99)
     frequency: str = Field(
         ..., example="monthly"
-    )  # Allowed values: weekly, monthly, yearly
+    )  # Allowed values: daily, weekly, monthly, yearly
+    # Every N periods of the frequency, e.g. 3 monthly = quarterly
+    interval: int = Field(1, ge=1, example=1)
     next_payment: datetime = Field(..., example="2023-02-01T00:00:00")
+    # Last day payments may fall on; open-ended when unset
+    end_date: Optional[datetime] = Field(None, example="2024-01-31T00:00:00")
     category_id: str = Field(..., example="expense_category_id")
     account_id: str = Field(..., example="account_id")
 
 
 class SubscriptionCreate(SubscriptionBase):
-    pass
+    _check_frequency = field_validator("frequency")(_known_frequency)
 
 
 class SubscriptionUpdate(BaseModel):
     name: str = Field(None, example="Netflix Premium")
-    amount: float = Field(None, example=17.99)
+    amount: Money = Field(None, example=17.99)
     frequency: str = Field(None, example="monthly")
+    interval: int = Field(None, ge=1, example=1)
     next_payment: datetime = Field(None, example="2023-03-01T00:00:00")
+    end_date: Optional[datetime] = Field(None, example="2024-01-31T00:00:00")
     category_id: str = Field(None, example="expense_category_id")
     account_id: str = Field(None, example="account_id")
     active: bool = Field(None, example=True)
 
+    _check_frequency = field_validator("frequency")(_known_frequency)
+
 
 class Subscription(SubscriptionBase):
     id: str
     active: bool
+    # First payment of the schedule, whose day of month later ones keep
+    anchor: Optional[datetime] = None
 
     class Config:
         from_attributes = True
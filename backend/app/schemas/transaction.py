@@ -1,11 +1,12 @@
 # fortuna/backend/app/schemas/transaction.py
 from datetime import datetime
 from pydantic import BaseModel, Field
+from .money import Money
 
 
 class TransactionBase(BaseModel):
     date: datetime = Field(..., example="2023-01-15T00:00:00")
-    amount: float = Field(..., example=50.0)
+    amount: Money = Field(..., example=50.0)
     description: str = Field(..., example="Grocery shopping")
     account_id: str = Field(..., example="some_account_id")
     category_id: str = Field(..., example="some_category_id")
@@ -20,7 +21,7 @@ class TransactionCreate(TransactionBase):
 
 class TransactionUpdate(BaseModel):
     date: datetime = Field(None, example="2023-01-15T00:00:00")
-    amount: float = Field(None, example=50.0)
+    amount: Money = Field(None, example=50.0)
     description: str = Field(None, example="Grocery shopping")
     account_id: str = Field(None, example="some_account_id")
     category_id: str = Field(None, example="some_category_id")
@@ -0,0 +1,24 @@
+# fortuna/backend/app/schemas/user.py
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class UserBase(BaseModel):
+    name: str = Field(..., example="alice")
+
+
+class UserCreate(UserBase):
+    pass
+
+
+class User(UserBase):
+    id: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class UserWithKey(User):
+    # Shown once, when the key is issued; only its hash is stored
+    api_key: str
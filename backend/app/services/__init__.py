@@ -1,17 +1,52 @@
 # fortuna/backend/app/services/__init__.py
+from .category_totals_service import CategoryTotalsService
 from .category_service import CategoryService
 from .transaction_service import TransactionService
+from .ledger_service import LedgerService
 from .account_service import AccountService
 from .expense_service import ExpenseService
 from .income_service import IncomeService
-from .subscription_service import SubscriptionService
+from .import_service import ImportService, ImportReport
+from .export_service import ExportService, ExportReport
+from .search_service import SearchService
+from .user_service import UserService
+from .pagination import Page
+
+# Imported on first use: they need NumPy, which the CLIs should not pay for
+# at startup
+_LAZY = {
+    "SubscriptionService": ".subscription_service",
+    "ForecastService": ".forecast_service",
+    "Forecast": ".forecast_service",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
     "CategoryService",
     "TransactionService",
     "AccountService",
+    "LedgerService",
     "ExpenseService",
     "IncomeService",
     "SubscriptionService",
+    "CategoryTotalsService",
+    "ImportService",
+    "ImportReport",
+    "ExportService",
+    "ExportReport",
+    "SearchService",
+    "UserService",
+    "ForecastService",
+    "Forecast",
+    "Page",
 ]
@@ -1,25 +1,57 @@
 # fortuna/backend/app/services/account_service.py
-from typing import List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import BigInteger, case, func, literal, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException
+from core.exceptions import FortunaError, InvalidInputError, NotFoundError
 from schemas import Account, AccountCreate, AccountUpdate, AccountTransfer
 from db import Account as AccountModel
+from db.tenancy import current_user, owned
+from core.money import to_cents, to_decimal
+from utils.cache import account_cache
+from utils.instrumentation import instrumented
+from .ledger_service import LedgerEntry, LedgerService
 
+# Accounts per balance UPDATE (the CASE grows with every account)
+UPDATE_CHUNK_SIZE = 500
 
+
+@dataclass(frozen=True)
+class AccountRef:
+    # Cacheable snapshot of an account; the balance is deliberately left out
+    id: str
+    name: str
+
+
+@dataclass
+class TransferSummary:
+    transfers: int = 0
+    total_amount: Decimal = Decimal(0)
+    # Net change per account over the whole batch
+    account_deltas: Dict[str, Decimal] = field(default_factory=dict)
+
+
+@instrumented
 class AccountService:
     def __init__(self, db: Session):
         self.db = db
+        self.ledger = LedgerService(db)
 
     def create_account(self, account: AccountCreate) -> Account:
         # Convert the Pydantic model to a dict and pass it to the ORM model
         db_account = AccountModel(**account.model_dump())
         self.db.add(db_account)
         try:
+            self.db.flush()
+            self.ledger.post(db_account.id, db_account.balance, "opening")
             self.db.commit()
         except IntegrityError:
             self.db.rollback()
-            raise HTTPException(status_code=400, detail="Account already exists")
+            raise InvalidInputError("Account already exists")
+        self._invalidate(db_account.id)
         self.db.refresh(db_account)
         return db_account
 
@@ -29,6 +61,117 @@ class AccountService:
         )
         return db_account
 
+    def get_account_ref(self, account_id: str) -> Optional[AccountRef]:
+        return account_cache.get_or_load(
+            ("id", current_user(self.db), account_id),
+            lambda: self._to_ref(self.get_account(account_id)),
+        )
+
+    def get_account_ref_by_name(self, name: str) -> Optional[AccountRef]:
+        def load():
+            db_account = (
+                self.db.query(AccountModel)
+                .filter(func.lower(AccountModel.name) == name.lower())
+                .first()
+            )
+            return self._to_ref(db_account)
+
+        return account_cache.get_or_load(
+            ("name", current_user(self.db), name.lower()), load
+        )
+
+    def _to_ref(self, db_account: Optional[AccountModel]) -> Optional[AccountRef]:
+        # Cached per user: names are only unique within a user's accounts
+        if db_account is None:
+            return None
+        ref = AccountRef(id=db_account.id, name=db_account.name)
+        account_cache.set(("id", current_user(self.db), ref.id), ref)
+        return ref
+
+    @staticmethod
+    def _invalidate(account_id: str) -> None:
+        account_cache.discard_if(lambda ref: ref.id == account_id)
+
+    def adjust_balance(
+        self,
+        account_id: str,
+        delta: Decimal,
+        kind: str = "adjustment",
+        transaction_id: Optional[str] = None,
+    ) -> None:
+        # In-database increment: no SELECT and no lost update, plus the
+        # matching ledger entry. The caller commits.
+        self.db.execute(
+            update(AccountModel)
+            .where(AccountModel.id == account_id)
+            .values(balance=AccountModel.balance + delta)
+        )
+        self.ledger.post(account_id, delta, kind, transaction_id)
+
+    def adjust_balances(self, entries: Iterable[LedgerEntry]) -> Dict[str, Decimal]:
+        # One UPDATE for many accounts (see _update_balances) and one INSERT of
+        # the ledger entries. Returns the net delta per account. The caller
+        # commits.
+        entries = list(entries)
+        deltas = self._net_deltas(entries)
+        if not deltas:
+            return deltas
+        self._update_balances(deltas)
+        self.ledger.post_many(entries)
+        return deltas
+
+    @staticmethod
+    def _net_deltas(entries: List[LedgerEntry]) -> Dict[str, Decimal]:
+        deltas: Dict[str, Decimal] = {}
+        for account_id, amount, _, _ in entries:
+            deltas[account_id] = deltas.get(account_id, Decimal(0)) + amount
+        return deltas
+
+    def _update_balances(self, deltas: Dict[str, Decimal]) -> int:
+        # balance = balance + CASE id WHEN ... END, with each account's delta
+        # in stored integer cents; returns the number of accounts updated
+        accounts = AccountModel.__table__
+        account_ids = sorted(deltas)
+        updated = 0
+        for i in range(0, len(account_ids), UPDATE_CHUNK_SIZE):
+            chunk = account_ids[i : i + UPDATE_CHUNK_SIZE]
+            cents = {
+                account_id: literal(to_cents(deltas[account_id]), BigInteger)
+                for account_id in chunk
+            }
+            result = self.db.execute(
+                update(accounts)
+                .where(accounts.c.id.in_(chunk), *owned(accounts, self.db))
+                .values(
+                    balance=accounts.c.balance
+                    + case(cents, value=accounts.c.id, else_=literal(0, BigInteger))
+                )
+            )
+            updated += result.rowcount
+        return updated
+
+    def _lock_accounts(self, account_ids: List[str]) -> None:
+        # Row locks taken in id order, so concurrent transfers over the same
+        # accounts queue up instead of deadlocking. SQLite locks the whole
+        # database on the first write and has no FOR UPDATE.
+        if self.db.get_bind().dialect.name == "sqlite":
+            return
+        self.db.execute(
+            select(AccountModel.id)
+            .where(AccountModel.id.in_(account_ids))
+            .order_by(AccountModel.id)
+            .with_for_update()
+        )
+
+    def get_balance(
+        self, account_id: str, posted_before: Optional[datetime] = None
+    ) -> Decimal:
+        # Ledger balance, optionally from the entries recorded before a point
+        # in time (LedgerService.balance)
+        if not self.get_account_ref(account_id):
+            raise NotFoundError("Account not found")
+        return self.ledger.balance(account_id, posted_before)
+
     def get_all_accounts(self) -> List[Account]:
         db_accounts = self.db.query(AccountModel).all()
         return db_accounts
@@ -38,31 +181,74 @@ class AccountService:
     ) -> Optional[Account]:
         db_account = self.get_account(account_id)
         if not db_account:
-            raise HTTPException(status_code=404, detail="Account not found")
+            raise NotFoundError("Account not found")
         # Only update provided fields
         update_data = account.model_dump(exclude_unset=True)
         allowed_fields = ["name", "balance"]
         update_data = {k: v for k, v in update_data.items() if k in allowed_fields}
+        if update_data.get("balance") is not None:
+            # A manual balance edit is recorded as an adjustment entry
+            self.ledger.post(
+                account_id, update_data["balance"] - db_account.balance, "adjustment"
+            )
         for key, value in update_data.items():
             setattr(db_account, key, value)
         self.db.commit()
+        self._invalidate(account_id)
         self.db.refresh(db_account)
         return db_account
 
     def delete_account(self, account_id: str) -> None:
         db_account = self.get_account(account_id)
         if not db_account:
-            raise HTTPException(status_code=404, detail="Account not found")
+            raise NotFoundError("Account not found")
+        self.ledger.delete_account(account_id)
         self.db.delete(db_account)
         self.db.commit()
+        self._invalidate(account_id)
         return True
 
     def transfer_between_accounts(self, transfer_data: AccountTransfer) -> None:
-        sender_account = self.get_account(transfer_data.from_account_id)
-        receiver_account = self.get_account(transfer_data.to_account_id)
-        if not sender_account or not receiver_account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        sender_account.balance -= transfer_data.amount
-        receiver_account.balance += transfer_data.amount
-        self.db.commit()
+        self.transfer_batch([transfer_data])
         return True
+
+    def transfer_batch(self, transfers: Iterable[AccountTransfer]) -> TransferSummary:
+        """Apply transfers atomically: all of them in one commit, or none.
+
+        Balances change in the database (``balance = balance + delta``), one
+        UPDATE per 500 accounts whatever the number of transfers, so nothing
+        is read first and no concurrent update is lost. Every transfer still
+        gets its two ledger entries.
+        """
+        summary = TransferSummary()
+        entries: List[LedgerEntry] = []
+        for transfer in transfers:
+            # Rounded to cents as the balances will be, so the summary and the
+            # deltas match what is stored
+            amount = to_decimal(transfer.amount)
+            if amount <= 0:
+                raise InvalidInputError("Transfer amount must be positive")
+            if transfer.from_account_id == transfer.to_account_id:
+                raise InvalidInputError("Cannot transfer to the same account")
+            entries.append((transfer.from_account_id, -amount, "transfer", None))
+            entries.append((transfer.to_account_id, amount, "transfer", None))
+            summary.transfers += 1
+            summary.total_amount += amount
+        deltas = self._net_deltas(entries)
+        if not deltas:
+            return summary
+
+        try:
+            self._lock_accounts(sorted(deltas))
+            if self._update_balances(deltas) != len(deltas):
+                self.db.rollback()
+                raise NotFoundError("Account not found")
+            self.ledger.post_many(entries)
+            self.db.commit()
+        except FortunaError:
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise InvalidInputError("Error transferring: " + str(e))
+        summary.account_deltas = deltas
+        return summary
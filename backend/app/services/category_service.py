@@ -1,16 +1,61 @@
 # fortuna/backend/app/services/category_service.py
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
-from sqlalchemy import extract, func
-from fastapi import HTTPException
+from decimal import Decimal
+from sqlalchemy import and_, func, select, tuple_
+from core.exceptions import InvalidInputError, NotFoundError
 from sqlalchemy.orm import Session
 from schemas import CategoryCreate, CategoryUpdate, Category
-from db import Category as CategoryModel, Transaction as TransactionModel
+from db import (
+    Category as CategoryModel,
+    CategoryMonthTotal as CategoryMonthTotalModel,
+    Transaction as TransactionModel,
+)
+from db.tenancy import current_user
+from utils.cache import category_cache
+from utils.dates import month_range
+from utils.instrumentation import instrumented
+from .category_totals_service import CategoryTotalsService
+from .pagination import Page, iterate, keyset_page
 
 
+@dataclass(frozen=True)
+class CategoryRef:
+    # Cacheable snapshot of a category, used by the write paths' checks
+    id: str
+    name: str
+    type: str
+    budget: Decimal
+
+
+@dataclass
+class DashboardRow:
+    # One category across the dashboard's months; lists align with ``months``
+    id: str
+    name: str
+    type: str
+    budget: Decimal
+    totals: List[Decimal] = field(default_factory=list)
+    remaining: List[Decimal] = field(default_factory=list)
+    percentages: List[float] = field(default_factory=list)
+
+
+@dataclass
+class Dashboard:
+    months: List[Tuple[int, int]]
+    categories: List[DashboardRow]
+
+
+def _percentage(total: Decimal, budget: Decimal) -> float:
+    return float(total / budget * 100) if budget > 0 else 0.0
+
+
+@instrumented
 class CategoryService:
     def __init__(self, db: Session):
         self.db = db
+        self.totals = CategoryTotalsService(db)
 
     def create_category(self, category: CategoryCreate) -> Category:
         db_category = CategoryModel(**category.model_dump())
@@ -19,7 +64,8 @@ class CategoryService:
             self.db.commit()
         except Exception:
             self.db.rollback()
-            raise HTTPException(status_code=400, detail="Error creating category")
+            raise InvalidInputError("Error creating category")
+        self._invalidate(db_category.id)
         self.db.refresh(db_category)
         return db_category
 
@@ -35,6 +81,45 @@ class CategoryService:
             .first()
         )
 
+    def get_category_ref(self, category_id: str) -> Optional[CategoryRef]:
+        return category_cache.get_or_load(
+            ("id", current_user(self.db), category_id),
+            lambda: self._to_ref(self.get_category_by_id(category_id)),
+        )
+
+    def get_category_ref_by_name(self, name: str, type: str) -> Optional[CategoryRef]:
+        def load():
+            db_category = (
+                self.db.query(CategoryModel)
+                .filter(
+                    func.lower(CategoryModel.name) == name.lower(),
+                    func.lower(CategoryModel.type) == type.lower(),
+                )
+                .first()
+            )
+            return self._to_ref(db_category)
+
+        return category_cache.get_or_load(
+            ("name", current_user(self.db), name.lower(), type.lower()), load
+        )
+
+    def _to_ref(self, db_category: Optional[CategoryModel]) -> Optional[CategoryRef]:
+        # Cached per user, like AccountService._to_ref
+        if db_category is None:
+            return None
+        ref = CategoryRef(
+            id=db_category.id,
+            name=db_category.name,
+            type=db_category.type,
+            budget=db_category.budget,
+        )
+        category_cache.set(("id", current_user(self.db), ref.id), ref)
+        return ref
+
+    @staticmethod
+    def _invalidate(category_id: str) -> None:
+        category_cache.discard_if(lambda ref: ref.id == category_id)
+
     def get_all_categories(self) -> List[Category]:
         return self.db.query(CategoryModel).all()
 
@@ -43,77 +128,140 @@ class CategoryService:
     ) -> Optional[Category]:
         db_category = self.get_category_by_id(category_id)
         if not db_category:
-            raise HTTPException(status_code=404, detail="Category not found")
+            raise NotFoundError("Category not found")
         update_data = category.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_category, key, value)
         self.db.commit()
+        self._invalidate(category_id)
         self.db.refresh(db_category)
         return db_category
 
     def delete_category(self, category_id: str) -> None:
         db_category = self.get_category_by_id(category_id)
         if not db_category:
-            raise HTTPException(status_code=404, detail="Category not found")
+            raise NotFoundError("Category not found")
+        self.totals.delete_category(category_id)
         self.db.delete(db_category)
         self.db.commit()
+        self._invalidate(category_id)
 
     def get_transactions_for_month(
         self, category_id: str, year: int, month: int
     ) -> List[TransactionModel]:
+        db_category = self.get_category_ref(category_id)
+        if not db_category:
+            return []
+        start, end = month_range(year, month)
+        # The category's type pins the middle column of the (user, category,
+        # type, date) index, so the date range is a seek
         transactions = (
             self.db.query(TransactionModel)
             .filter(
                 TransactionModel.category_id == category_id,
-                extract("year", TransactionModel.date) == year,
-                extract("month", TransactionModel.date) == month,
+                TransactionModel.type == db_category.type,
+                TransactionModel.date >= start,
+                TransactionModel.date < end,
             )
             .all()
         )
         return transactions
 
-    def get_monthly_total(self, category_id: str, year: int, month: int) -> float:
-        total = (
-            self.db.query(func.sum(TransactionModel.amount))
-            .filter(
-                TransactionModel.category_id == category_id,
-                extract("year", TransactionModel.date) == year,
-                extract("month", TransactionModel.date) == month,
-            )
-            .scalar()
-        )
-        return float(total or 0.0)
+    def get_monthly_total(self, category_id: str, year: int, month: int) -> Decimal:
+        # Read from the incrementally maintained rollup instead of aggregating
+        return self.totals.get_total(category_id, year, month)
 
     def get_monthly_status(
         self, category_id: str, year: int, month: int
-    ) -> Tuple[float, float, float]:
-        db_category = self.get_category_by_id(category_id)
+    ) -> Tuple[Decimal, Decimal, float]:
+        db_category = self.get_category_ref(category_id)
         if not db_category:
-            raise HTTPException(status_code=404, detail="Category not found")
+            raise NotFoundError("Category not found")
         monthly_total = self.get_monthly_total(category_id, year, month)
         if db_category.type == "expense":
             remaining = db_category.budget - monthly_total
-            percentage = (
-                (monthly_total / db_category.budget * 100)
-                if db_category.budget > 0
-                else 0
-            )
+            percentage = _percentage(monthly_total, db_category.budget)
             return monthly_total, remaining, percentage
         else:
             remaining_to_target = db_category.budget - monthly_total
-            percentage = (
-                (monthly_total / db_category.budget * 100)
-                if db_category.budget > 0
-                else 0
-            )
+            percentage = _percentage(monthly_total, db_category.budget)
             return monthly_total, remaining_to_target, percentage
 
+    def get_dashboard(
+        self,
+        start: Tuple[int, int],
+        end: Optional[Tuple[int, int]] = None,
+        type: Optional[str] = None,
+    ) -> Dashboard:
+        """Budget status of every category for each month in ``start`` ..
+        ``end`` (inclusive ``(year, month)`` pairs), as a dense matrix.
+
+        One GROUP BY over the monthly rollup, LEFT JOINed to categories, so
+        the cost is one round trip regardless of categories x months.
+        """
+        end = end or start
+        months = []
+        year, month = start
+        while (year, month) <= end:
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        if not months:
+            raise InvalidInputError("Dashboard end is before start")
+
+        totals = CategoryMonthTotalModel
+        query = (
+            select(
+                CategoryModel.id,
+                CategoryModel.name,
+                CategoryModel.type,
+                CategoryModel.budget,
+                totals.year,
+                totals.month,
+                func.sum(totals.total),
+            )
+            .outerjoin(
+                totals,
+                and_(
+                    totals.category_id == CategoryModel.id,
+                    tuple_(totals.year, totals.month) >= start,
+                    tuple_(totals.year, totals.month) <= end,
+                ),
+            )
+            .group_by(
+                CategoryModel.id,
+                CategoryModel.name,
+                CategoryModel.type,
+                CategoryModel.budget,
+                totals.year,
+                totals.month,
+            )
+            .order_by(CategoryModel.type, CategoryModel.name)
+        )
+        if type is not None:
+            query = query.where(CategoryModel.type == type)
+
+        index = {key: i for i, key in enumerate(months)}
+        rows = {}
+        for result in self.db.execute(query):
+            category_id, name, type_, budget, year, month, total = result
+            row = rows.get(category_id)
+            if row is None:
+                row = rows[category_id] = DashboardRow(
+                    category_id, name, type_, budget, [Decimal("0.00")] * len(months)
+                )
+            if year is not None:
+                row.totals[index[(year, month)]] = total
+        for row in rows.values():
+            row.remaining = [row.budget - total for total in row.totals]
+            row.percentages = [_percentage(total, row.budget) for total in row.totals]
+        return Dashboard(months=months, categories=list(rows.values()))
+
     def can_add_transaction(
-        self, category_id: str, amount: float, date: datetime
+        self, category_id: str, amount: Decimal, date: datetime
     ) -> bool:
-        db_category = self.get_category_by_id(category_id)
+        db_category = self.get_category_ref(category_id)
         if not db_category:
-            raise HTTPException(status_code=404, detail="Category not found")
+            raise NotFoundError("Category not found")
         if db_category.type == "income":
             return True
         year, month = date.year, date.month
@@ -130,10 +278,60 @@ class CategoryService:
         )
         return transactions
 
-    def get_total_transactions_in_category(self, category_id: str) -> float:
+    def _category_transactions_query(
+        self,
+        category_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        type: Optional[str] = None,
+    ):
+        query = self.db.query(TransactionModel).filter(
+            TransactionModel.category_id == category_id
+        )
+        if type is not None:
+            query = query.filter(TransactionModel.type == type)
+        if start_date is not None:
+            query = query.filter(TransactionModel.date >= start_date)
+        if end_date is not None:
+            query = query.filter(TransactionModel.date < end_date)
+        return query
+
+    def list_transactions_in_category(
+        self,
+        category_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        type: Optional[str] = None,
+    ) -> Page[TransactionModel]:
+        query = self._category_transactions_query(
+            category_id, start_date, end_date, type
+        )
+        try:
+            return keyset_page(
+                query, TransactionModel.date, TransactionModel.id, limit, cursor
+            )
+        except ValueError as e:
+            raise InvalidInputError(str(e))
+
+    def iter_transactions_in_category(
+        self,
+        category_id: str,
+        chunk_size: int = 1000,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        type: Optional[str] = None,
+    ) -> Iterator[TransactionModel]:
+        query = self._category_transactions_query(
+            category_id, start_date, end_date, type
+        )
+        return iterate(query, TransactionModel.date, TransactionModel.id, chunk_size)
+
+    def get_total_transactions_in_category(self, category_id: str) -> Decimal:
         total = (
             self.db.query(func.sum(TransactionModel.amount))
             .filter(TransactionModel.category_id == category_id)
             .scalar()
         )
-        return float(total or 0.0)
+        return total or Decimal(0)
@@ -0,0 +1,243 @@
+# fortuna/backend/app/services/category_totals_service.py
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Integer, cast, delete, extract, func, select, update, insert
+from sqlalchemy.orm import Session
+from db import (
+    Category as CategoryModel,
+    CategoryMonthTotal as CategoryMonthTotalModel,
+    Transaction as TransactionModel,
+)
+from db.tenancy import owned, require_user
+from utils.instrumentation import instrumented
+
+# (category_id, year, month, type), of the session's user
+TotalKey = Tuple[str, int, int, str]
+# (user_id, category_id, year, month, type), a whole rollup row key
+RowKey = Tuple[str, str, int, int, str]
+
+_table = CategoryMonthTotalModel.__table__
+_transactions = TransactionModel.__table__
+_KEY_COLUMNS = ["user_id", "category_id", "year", "month", "type"]
+# Dialects with INSERT .. ON CONFLICT. Their modules are imported on first
+# use: the PostgreSQL one alone takes longer to import than the services.
+_UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+
+def _upsert_insert(dialect: str):
+    return import_module(f"sqlalchemy.dialects.{dialect}").insert(_table)
+
+
+@instrumented
+class CategoryTotalsService:
+    """Maintains the ``category_month_totals`` rollup.
+
+    Writers call :meth:`record` / :meth:`record_transaction` before they
+    commit, so the rollup changes in the same DB transaction as the rows it
+    summarises.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(
+        self,
+        category_id: str,
+        date: datetime,
+        type: str,
+        amount: Decimal,
+        count: int = 1,
+    ) -> None:
+        self.apply_deltas(
+            {(category_id, date.year, date.month, type): (amount, count)}
+        )
+
+    def record_transaction(self, transaction: TransactionModel, sign: int = 1) -> None:
+        # sign=-1 removes a transaction's contribution (delete, or before update)
+        self.record(
+            transaction.category_id,
+            transaction.date,
+            transaction.type,
+            sign * transaction.amount,
+            sign,
+        )
+
+    def apply_deltas(self, deltas: Dict[TotalKey, Tuple[Decimal, int]]) -> None:
+        user_id = require_user(self.db)
+        rows = [
+            {
+                "user_id": user_id,
+                "category_id": category_id,
+                "year": year,
+                "month": month,
+                "type": type_,
+                "total": amount,
+                "count": count,
+            }
+            for (category_id, year, month, type_), (amount, count) in deltas.items()
+        ]
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        if dialect in _UPSERT_DIALECTS:
+            stmt = _upsert_insert(dialect)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=_KEY_COLUMNS,
+                set_={
+                    "total": _table.c.total + stmt.excluded.total,
+                    "count": _table.c.count + stmt.excluded.count,
+                },
+            )
+            self.db.execute(stmt, rows)
+            return
+        # Generic fallback: UPDATE, then INSERT the keys that did not exist yet
+        for row in rows:
+            result = self.db.execute(
+                update(_table)
+                .where(*[_table.c[col] == row[col] for col in _KEY_COLUMNS])
+                .values(
+                    total=_table.c.total + row["total"],
+                    count=_table.c.count + row["count"],
+                )
+            )
+            if result.rowcount == 0:
+                self.db.execute(insert(_table), row)
+
+    def reserve(
+        self, category_id: str, date: datetime, type: str, amount: Decimal
+    ) -> bool:
+        """Add a transaction to its month's total only if the total stays
+        within the category budget; False (and nothing recorded) otherwise.
+
+        The check and the increment are one conditional UPDATE, so concurrent
+        writers cannot both pass the check on the same stale total: the row
+        lock serialises them and the second one re-evaluates the condition.
+        The budget is read in the same statement. The caller commits (or
+        rolls back on False).
+        """
+        key = {
+            "user_id": require_user(self.db),
+            "category_id": category_id,
+            "year": date.year,
+            "month": date.month,
+            "type": type,
+        }
+        dialect = self.db.get_bind().dialect.name
+        empty = dict(key, total=Decimal(0), count=0)
+        if dialect in _UPSERT_DIALECTS:
+            self.db.execute(
+                _upsert_insert(dialect)
+                .values(empty)
+                .on_conflict_do_nothing(index_elements=_KEY_COLUMNS)
+            )
+        elif self.db.execute(
+            select(_table.c.count).where(
+                *[_table.c[col] == value for col, value in key.items()]
+            )
+        ).first() is None:
+            self.db.execute(insert(_table), empty)
+
+        budget = (
+            select(CategoryModel.budget)
+            .where(CategoryModel.id == category_id)
+            .scalar_subquery()
+        )
+        result = self.db.execute(
+            update(_table)
+            .where(
+                *[_table.c[col] == value for col, value in key.items()],
+                _table.c.total + amount <= budget,
+            )
+            .values(total=_table.c.total + amount, count=_table.c.count + 1)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def collect_deltas(
+        transactions: Iterable[Tuple[str, datetime, str, Decimal]], sign: int = 1
+    ) -> Dict[TotalKey, Tuple[Decimal, int]]:
+        # Aggregate (category_id, date, type, amount) tuples into rollup deltas
+        deltas: Dict[TotalKey, list] = defaultdict(lambda: [Decimal(0), 0])
+        for category_id, date, type_, amount in transactions:
+            delta = deltas[(category_id, date.year, date.month, type_)]
+            delta[0] += sign * amount
+            delta[1] += sign
+        return {key: (amount, count) for key, (amount, count) in deltas.items()}
+
+    def get_total(
+        self, category_id: str, year: int, month: int, type: Optional[str] = None
+    ) -> Decimal:
+        query = self.db.query(func.sum(CategoryMonthTotalModel.total)).filter(
+            CategoryMonthTotalModel.category_id == category_id,
+            CategoryMonthTotalModel.year == year,
+            CategoryMonthTotalModel.month == month,
+        )
+        if type is not None:
+            query = query.filter(CategoryMonthTotalModel.type == type)
+        return query.scalar() or Decimal(0)
+
+    def delete_category(self, category_id: str) -> None:
+        self.db.execute(
+            delete(_table).where(
+                _table.c.category_id == category_id, *owned(_table, self.db)
+            )
+        )
+
+    def _aggregate_query(self):
+        # The rollup as it should be, computed from the raw transactions
+        year = cast(extract("year", _transactions.c.date), Integer)
+        month = cast(extract("month", _transactions.c.date), Integer)
+        return (
+            select(
+                _transactions.c.user_id,
+                _transactions.c.category_id,
+                year,
+                month,
+                _transactions.c.type,
+                func.sum(_transactions.c.amount),
+                func.count(),
+            )
+            .where(*owned(_transactions, self.db))
+            .group_by(
+                _transactions.c.user_id,
+                _transactions.c.category_id,
+                year,
+                month,
+                _transactions.c.type,
+            )
+        )
+
+    def rebuild(self) -> int:
+        # The session user's rollup, or every user's for a session without one
+        self.db.execute(delete(_table).where(*owned(_table, self.db)))
+        self.db.execute(
+            insert(_table).from_select(
+                _KEY_COLUMNS + ["total", "count"], self._aggregate_query()
+            )
+        )
+        self.db.commit()
+        return self.db.scalar(
+            select(func.count()).select_from(_table).where(*owned(_table, self.db))
+        )
+
+    def verify(self) -> List[Tuple[RowKey, Tuple[Decimal, int], Tuple[Decimal, int]]]:
+        # Returns (key, expected, stored) for every rollup row that is off.
+        # Amounts are integer cents in the database, so the comparison is exact.
+        expected = {
+            tuple(row[:5]): (row[5] or Decimal(0), row[6])
+            for row in self.db.execute(self._aggregate_query())
+        }
+        stored = {
+            tuple(row[:5]): (row[5], row[6])
+            for row in self.db.execute(select(_table).where(*owned(_table, self.db)))
+        }
+        mismatches = []
+        for key in expected.keys() | stored.keys():
+            want = expected.get(key, (Decimal(0), 0))
+            have = stored.get(key, (Decimal(0), 0))
+            if want != have:
+                mismatches.append((key, want, have))
+        return sorted(mismatches)
@@ -1,79 +1,59 @@
 # fortuna/backend/app/services/expense_service.py
 from datetime import datetime
-from typing import List, Optional
+import uuid
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from fastapi import HTTPException
+from core.exceptions import InvalidInputError, NotFoundError
 from schemas import ExpenseCreate, ExpenseUpdate, Expense
-from db import (
-    Transaction as TransactionModel,
-    Category as CategoryModel,
-    Account as AccountModel,
-)
+from db import Transaction as TransactionModel
+from utils.instrumentation import instrumented
+from .account_service import AccountService
+from .category_service import CategoryService
+from .category_totals_service import CategoryTotalsService
+from .pagination import Page, iterate, keyset_page
 
 
+@instrumented
 class ExpenseService:
     def __init__(self, db: Session):
         self.db = db
+        self.totals = CategoryTotalsService(db)
+        self.accounts = AccountService(db)
+        self.categories = CategoryService(db)
 
     def create_expense(self, expense_data: ExpenseCreate) -> Expense:
         # Validate the category exists and is of type "expense"
-        category = (
-            self.db.query(CategoryModel)
-            .filter(
-                CategoryModel.id == expense_data.category_id,
-                CategoryModel.type == "expense",
-            )
-            .first()
-        )
-        if not category:
-            raise HTTPException(status_code=404, detail="Expense category not found")
-
-        # Check the current month's total expense for the category to enforce budget limits
-        expense_year = expense_data.date.year
-        expense_month = expense_data.date.month
-        # Using SQLite date functions (adjust if using another database)
-        total_expense = (
-            self.db.query(func.sum(TransactionModel.amount))
-            .filter(
-                TransactionModel.category_id == category.id,
-                TransactionModel.type == "expense",
-                func.strftime("%Y", TransactionModel.date) == str(expense_year),
-                func.strftime("%m", TransactionModel.date) == f"{expense_month:02d}",
-            )
-            .scalar()
-            or 0.0
-        )
-
-        if total_expense + expense_data.amount > category.budget:
-            raise HTTPException(
-                status_code=400, detail="Category budget exceeded for this month"
-            )
+        category = self.categories.get_category_ref(expense_data.category_id)
+        if not category or category.type != "expense":
+            raise NotFoundError("Expense category not found")
 
         # Validate the account exists
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == expense_data.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+        if not self.accounts.get_account_ref(expense_data.account_id):
+            raise NotFoundError("Account not found")
+
+        # Enforce the monthly budget: the check and the rollup increment are a
+        # single conditional UPDATE, so concurrent writers cannot overshoot
+        if not self.totals.reserve(
+            category.id, expense_data.date, "expense", expense_data.amount
+        ):
+            self.db.rollback()
+            raise InvalidInputError("Category budget exceeded for this month")
 
         # Create the expense transaction with type "expense"
         expense_dict = expense_data.model_dump(exclude_unset=True)
         expense_dict["type"] = "expense"
-        transaction = TransactionModel(**expense_dict)
+        transaction = TransactionModel(id=str(uuid.uuid4()), **expense_dict)
         self.db.add(transaction)
 
         # Update account balance (deduct the expense amount)
-        account.balance -= expense_data.amount
+        self.accounts.adjust_balance(
+            expense_data.account_id, -expense_data.amount, "expense", transaction.id
+        )
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error creating expense: " + str(e)
-            )
+            raise InvalidInputError("Error creating expense: " + str(e))
         self.db.refresh(transaction)
         return transaction
 
@@ -93,54 +73,115 @@ class ExpenseService:
             .all()
         )
 
+    def _expense_query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ):
+        query = self.db.query(TransactionModel).filter(
+            TransactionModel.type == "expense"
+        )
+        if start_date is not None:
+            query = query.filter(TransactionModel.date >= start_date)
+        if end_date is not None:
+            query = query.filter(TransactionModel.date < end_date)
+        if account_id is not None:
+            query = query.filter(TransactionModel.account_id == account_id)
+        if category_id is not None:
+            query = query.filter(TransactionModel.category_id == category_id)
+        return query
+
+    def list_expenses(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Page[Expense]:
+        # Newest first, keyset-paginated on (date, id)
+        query = self._expense_query(start_date, end_date, account_id, category_id)
+        try:
+            return keyset_page(
+                query, TransactionModel.date, TransactionModel.id, limit, cursor
+            )
+        except ValueError as e:
+            raise InvalidInputError(str(e))
+
+    def iter_expenses(
+        self,
+        chunk_size: int = 1000,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Iterator[Expense]:
+        query = self._expense_query(start_date, end_date, account_id, category_id)
+        return iterate(query, TransactionModel.date, TransactionModel.id, chunk_size)
+
     def update_expense(self, expense_id: str, expense_data: ExpenseUpdate) -> Expense:
         expense = self.get_expense(expense_id)
         if not expense:
-            raise HTTPException(status_code=404, detail="Expense not found")
+            raise NotFoundError("Expense not found")
         old_amount = expense.amount
+        old_month = (expense.category_id, expense.date.year, expense.date.month)
         update_data = expense_data.model_dump(exclude_unset=True)
+        # A new category or account must be one of the user's own, as on create
+        if "category_id" in update_data:
+            category = self.categories.get_category_ref(update_data["category_id"])
+            if not category or category.type != "expense":
+                raise NotFoundError("Expense category not found")
+        if "account_id" in update_data:
+            if not self.accounts.get_account_ref(update_data["account_id"]):
+                raise NotFoundError("Account not found")
+        self.totals.record_transaction(expense, sign=-1)
         for key, value in update_data.items():
             setattr(expense, key, value)
+        new_month = (expense.category_id, expense.date.year, expense.date.month)
+        if new_month != old_month or expense.amount > old_amount:
+            # More spending in a month: the same reservation as create_expense
+            # (after removing the old amount, so within a month only the
+            # difference counts against the budget)
+            if not self.totals.reserve(
+                expense.category_id, expense.date, "expense", expense.amount
+            ):
+                self.db.rollback()
+                raise InvalidInputError("Category budget exceeded for this month")
+        else:
+            self.totals.record_transaction(expense)
         if "amount" in update_data:
-            account = (
-                self.db.query(AccountModel)
-                .filter(AccountModel.id == expense.account_id)
-                .first()
-            )
-            if not account:
-                raise HTTPException(status_code=404, detail="Account not found")
+            if not self.accounts.get_account_ref(expense.account_id):
+                raise NotFoundError("Account not found")
             # Revert the old expense amount then apply the new expense amount
-            account.balance += old_amount
-            account.balance -= expense.amount
+            self.accounts.adjust_balance(
+                expense.account_id, old_amount - expense.amount, "expense", expense.id
+            )
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error updating expense: " + str(e)
-            )
+            raise InvalidInputError("Error updating expense: " + str(e))
         self.db.refresh(expense)
         return expense
 
     def delete_expense(self, expense_id: str) -> None:
         expense = self.get_expense(expense_id)
         if not expense:
-            raise HTTPException(status_code=404, detail="Expense not found")
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == expense.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+            raise NotFoundError("Expense not found")
+        if not self.accounts.get_account_ref(expense.account_id):
+            raise NotFoundError("Account not found")
         # Revert the expense amount back to the account balance
-        account.balance += expense.amount
+        self.accounts.adjust_balance(
+            expense.account_id, expense.amount, "expense", expense.id
+        )
+        self.totals.record_transaction(expense, sign=-1)
         self.db.delete(expense)
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error deleting expense: " + str(e)
-            )
+            raise InvalidInputError("Error deleting expense: " + str(e))
         return True
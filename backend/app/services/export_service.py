@@ -0,0 +1,285 @@
+# fortuna/backend/app/services/export_service.py
+import csv
+import gzip
+import io
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from db import (
+    Transaction as TransactionModel,
+    Category as CategoryModel,
+    Account as AccountModel,
+)
+from utils.instrumentation import instrumented
+
+# Output columns, in order; names come from an outer join so transactions
+# of deleted accounts or categories are still exported
+EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "type",
+    "amount",
+    "description",
+    "account_id",
+    "account",
+    "category_id",
+    "category",
+    "subscription_id",
+)
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+_FORMATS_BY_EXTENSION = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+    # (format, gzip) from a file name such as "history.csv.gz"
+    base, extension = os.path.splitext(path.lower())
+    compress = extension == ".gz"
+    if compress:
+        extension = os.path.splitext(base)[1]
+    if extension not in _FORMATS_BY_EXTENSION:
+        raise ValueError(f"Cannot detect export format for {path!r}")
+    return _FORMATS_BY_EXTENSION[extension], compress
+
+
+class _Sink(io.RawIOBase):
+    # Write-only file object that hands out what was written since the last
+    # drain(); tell() keeps counting, which Parquet needs for its footer
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportEncoder:
+    """Turns chunks of ``EXPORT_COLUMNS`` tuples into bytes of one format.
+
+    ``encode`` returns the bytes produced for a chunk (possibly empty while
+    gzip buffers), ``finish`` whatever remains, e.g. the Parquet footer.
+    Used by both the file export and the streaming HTTP response.
+    """
+
+    def __init__(self, format: str, compress: bool = False):
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        self.format = format
+        self.rows = 0
+        self._sink = _Sink()
+        self._gzip = None
+        if format == "parquet":
+            # Parquet compresses its own pages; gzip selects the codec
+            codec = "gzip" if compress else "snappy"
+            self._parquet = _ParquetWriter(self._sink, codec)
+            return
+        stream = self._sink
+        if compress:
+            stream = self._gzip = gzip.GzipFile(fileobj=self._sink, mode="wb")
+        self._text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        if format == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(EXPORT_COLUMNS)
+
+    def encode(self, rows: Sequence[tuple]) -> bytes:
+        self.rows += len(rows)
+        if self.format == "csv":
+            self._csv.writerows(rows)
+        elif self.format == "jsonl":
+            self._text.write("".join(_json_line(row) for row in rows))
+        else:
+            self._parquet.write(rows)
+        if self.format != "parquet":
+            self._text.flush()
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        if self.format == "parquet":
+            self._parquet.close()
+        else:
+            self._text.flush()
+            if self._gzip is not None:
+                self._gzip.close()
+        return self._sink.drain()
+
+
+def _json_line(row: tuple) -> str:
+    record = dict(zip(EXPORT_COLUMNS, row))
+    record["date"] = record["date"].isoformat()
+    # Same representation as the REST API
+    record["amount"] = float(record["amount"])
+    return json.dumps(record) + "\n"
+
+
+class _ParquetWriter:
+    # One row group per chunk. pyarrow (in requirements.txt) is imported on
+    # first use: only Parquet needs it, and it is slow to import.
+    def __init__(self, sink: _Sink, compression: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("date", pa.timestamp("us")),
+                ("type", pa.string()),
+                ("amount", pa.decimal128(18, 2)),
+                ("description", pa.string()),
+                ("account_id", pa.string()),
+                ("account", pa.string()),
+                ("category_id", pa.string()),
+                ("category", pa.string()),
+                ("subscription_id", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(sink, self._schema, compression=compression)
+
+    def write(self, rows: Sequence[tuple]) -> None:
+        columns = list(zip(*rows))
+        self._writer.write_batch(
+            self._pa.record_batch(
+                [
+                    self._pa.array(column, type=field.type)
+                    for column, field in zip(columns, self._schema)
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+@dataclass
+class ExportReport:
+    rows: int
+    bytes: int
+
+
+@instrumented
+class ExportService:
+    """Streaming export of transaction history for analytics.
+
+    Rows are read as plain column tuples through a server-side cursor
+    (``stream_results``), one chunk at a time, and encoded straight to the
+    output; no ORM objects are built and memory stays flat whatever the
+    size of the history.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def export_query(
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+        type: Optional[str] = None,
+    ):
+        query = (
+            select(
+                TransactionModel.id,
+                TransactionModel.date,
+                TransactionModel.type,
+                TransactionModel.amount,
+                TransactionModel.description,
+                TransactionModel.account_id,
+                AccountModel.name,
+                TransactionModel.category_id,
+                CategoryModel.name,
+                TransactionModel.subscription_id,
+            )
+            .outerjoin(AccountModel, AccountModel.id == TransactionModel.account_id)
+            .outerjoin(CategoryModel, CategoryModel.id == TransactionModel.category_id)
+            .order_by(TransactionModel.date, TransactionModel.id)
+        )
+        if start_date is not None:
+            query = query.where(TransactionModel.date >= start_date)
+        if end_date is not None:
+            query = query.where(TransactionModel.date < end_date)
+        if account_id is not None:
+            query = query.where(TransactionModel.account_id == account_id)
+        if category_id is not None:
+            query = query.where(TransactionModel.category_id == category_id)
+        if type is not None:
+            query = query.where(TransactionModel.type == type)
+        return query
+
+    def iter_export(
+        self,
+        format: str,
+        compress: bool = False,
+        chunk_size: int = 5000,
+        **filters,
+    ) -> Iterator[bytes]:
+        # Validates eagerly (unknown format, missing pyarrow), then streams
+        encoder = ExportEncoder(format, compress)
+        query = self.export_query(**filters)
+        return self._stream(encoder, query, chunk_size)
+
+    def _stream(
+        self, encoder: ExportEncoder, query, chunk_size: int
+    ) -> Iterator[bytes]:
+        result = self.db.execute(
+            query.execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        try:
+            for rows in result.partitions():
+                data = encoder.encode(rows)
+                if data:
+                    yield data
+        finally:
+            result.close()
+        yield encoder.finish()
+
+    def export_file(
+        self,
+        path: str,
+        format: Optional[str] = None,
+        compress: Optional[bool] = None,
+        chunk_size: int = 5000,
+        **filters,
+    ) -> ExportReport:
+        # Format and gzip default to the file name, e.g. "history.jsonl.gz"
+        if format is None:
+            format, detected = detect_format(path)
+            compress = detected if compress is None else compress
+        elif compress is None:
+            compress = path.lower().endswith(".gz")
+        encoder = ExportEncoder(format, compress)
+        written = 0
+        with open(path, "wb") as f:
+            for data in self._stream(encoder, self.export_query(**filters), chunk_size):
+                f.write(data)
+                written += len(data)
+        return ExportReport(rows=encoder.rows, bytes=written)
@@ -0,0 +1,330 @@
+# fortuna/backend/app/services/forecast_service.py
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import BigInteger, Integer, cast, extract, func, select, type_coerce
+from sqlalchemy.orm import Session
+from core.exceptions import InvalidInputError, NotFoundError
+from db import (
+    Account as AccountModel,
+    Category as CategoryModel,
+    Subscription as SubscriptionModel,
+    Transaction as TransactionModel,
+)
+from core.recurrence import Schedules
+from utils.instrumentation import instrumented
+
+MAX_FORECAST_MONTHS = 60
+
+# Expense category (row of the budget arrays) -> account_id -> weight
+Weights = Dict[int, Dict[str, float]]
+
+
+def _cents(column):
+    # Money columns as their stored integer cents: no Decimal per row
+    return type_coerce(column, BigInteger)
+
+
+@dataclass
+class Forecast:
+    # Day 0 is ``start``; every array has one column per day up to ``end``
+    # (exclusive) and one row per entry of ``account_ids``
+    start: date
+    end: date
+    account_ids: List[str]
+    dates: np.ndarray
+    # Projected end-of-day balances
+    balances: np.ndarray
+    # Daily balance changes by source; they add up to the balance curve
+    subscriptions: np.ndarray
+    budgets: np.ndarray
+    income: np.ndarray
+
+    def month_ends(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Dates and balances on the last forecast day of every month
+        months = self.dates.astype("datetime64[M]")
+        last = np.flatnonzero(np.append(months[1:] != months[:-1], True))
+        return self.dates[last], self.balances[:, last]
+
+    def lowest(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Per account: the lowest projected balance and the day it occurs
+        days = self.balances.argmin(axis=1)
+        return self.balances[np.arange(len(days)), days], self.dates[days]
+
+
+@instrumented
+class ForecastService:
+    """Daily balance projections per account.
+
+    Three sources, all computed on NumPy arrays (no per-day Python loop):
+
+    - active subscriptions, every payment of their schedule (payments already
+      overdue are charged on the first day, as processing would);
+    - expense category budgets, less that month's subscription payments in
+      the category, spread evenly over the days of the month and split
+      between accounts in proportion to their recent spending in the
+      category; without any, between the accounts its subscriptions charge,
+      and failing that evenly over every account;
+    - income, the account's average over the last ``history_months`` full
+      months, spread evenly over each month.
+
+    For the current month only what is left of the budget (after this
+    month's spending) and of the average income (after what came in) is
+    projected, over the remaining days.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def forecast(
+        self,
+        months: int = 12,
+        account_id: Optional[str] = None,
+        history_months: int = 6,
+        start: Optional[date] = None,
+    ) -> Forecast:
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            raise InvalidInputError(
+                f"months must be between 1 and {MAX_FORECAST_MONTHS}"
+            )
+        if history_months < 1:
+            raise InvalidInputError("history_months must be >= 1")
+        start = start or datetime.now().date()
+
+        accounts = select(AccountModel.id, _cents(AccountModel.balance)).order_by(
+            AccountModel.name
+        )
+        if account_id is not None:
+            accounts = accounts.where(AccountModel.id == account_id)
+        accounts = self.db.execute(accounts).all()
+        if account_id is not None and not accounts:
+            raise NotFoundError("Account not found")
+        account_ids = [row[0] for row in accounts]
+        account_index = {id: i for i, id in enumerate(account_ids)}
+
+        first_day = np.datetime64(start, "D")
+        first_month = first_day.astype("datetime64[M]")
+        end = (first_month + months + 1).astype("datetime64[D]")
+        dates = np.arange(first_day, end)
+        # Month of every day (0 = the current month) and forecast days per month
+        day_month = (dates.astype("datetime64[M]") - first_month).astype(np.int64)
+        month_days = np.bincount(day_month)
+        shape = (len(account_ids), len(dates))
+
+        categories = self.db.execute(
+            select(CategoryModel.id, _cents(CategoryModel.budget))
+            .where(CategoryModel.type == "expense")
+            .order_by(CategoryModel.id)
+        ).all()
+        category_index = {row[0]: i for i, row in enumerate(categories)}
+        budgets = np.array([row[1] for row in categories], dtype=np.int64) / 100
+
+        subscription_deltas, subscription_spend, charged = self._subscriptions(
+            account_index, category_index, first_day, end, shape, months
+        )
+        received, spent, spending = self._history(
+            start, history_months, account_index, category_index
+        )
+        shares = self._shares(spending, charged, account_index, len(categories))
+
+        # Budget left per category and month once subscriptions are paid,
+        # minus what was already spent this month
+        left = budgets[:, None] - subscription_spend
+        left[:, 0] -= spent
+        monthly = shares @ np.maximum(left, 0)
+        budget_deltas = -(monthly[:, day_month] / month_days[day_month])
+
+        expected = np.repeat(received[:, :1], months + 1, axis=1)
+        expected[:, 0] = np.maximum(received[:, 0] - received[:, 1], 0)
+        income_deltas = expected[:, day_month] / month_days[day_month]
+
+        opening = np.array([row[1] for row in accounts], dtype=np.int64) / 100
+        balances = opening[:, None] + (
+            np.cumsum(subscription_deltas + budget_deltas + income_deltas, axis=1)
+        )
+        return Forecast(
+            start=start,
+            end=end.item(),
+            account_ids=account_ids,
+            dates=dates,
+            balances=balances,
+            subscriptions=subscription_deltas,
+            budgets=budget_deltas,
+            income=income_deltas,
+        )
+
+    def _subscriptions(
+        self,
+        account_index: Dict[str, int],
+        category_index: Dict[str, int],
+        first_day: np.datetime64,
+        end: np.datetime64,
+        shape: Tuple[int, int],
+        months: int,
+    ) -> Tuple[np.ndarray, np.ndarray, Weights]:
+        # Daily payments per account, payments per category and month, and
+        # what each category's subscriptions charge each account in the window
+        query = select(
+            SubscriptionModel.account_id,
+            SubscriptionModel.category_id,
+            _cents(SubscriptionModel.amount),
+            SubscriptionModel.frequency,
+            SubscriptionModel.interval,
+            # Dates, not datetimes: SQLite returns ISO strings NumPy parses in C
+            func.date(
+                func.coalesce(SubscriptionModel.anchor, SubscriptionModel.next_payment)
+            ),
+            func.date(SubscriptionModel.end_date),
+            func.date(SubscriptionModel.next_payment),
+        ).where(SubscriptionModel.active.is_(True))
+        # Every account's: all subscriptions in a category count against its
+        # budget, even when forecasting one account
+        subscriptions = self.db.execute(query).all()
+
+        deltas = np.zeros(shape)
+        spend = np.zeros((len(category_index), months + 1))
+        if not subscriptions:
+            return deltas, spend, {}
+        (
+            account_ids,
+            category_ids,
+            cents,
+            frequencies,
+            intervals,
+            anchors,
+            ends,
+            next_payments,
+        ) = zip(*subscriptions)
+        accounts = np.array([account_index.get(id, -1) for id in account_ids])
+        categories = np.array([category_index.get(id, -1) for id in category_ids])
+        amounts = np.array(cents, dtype=np.int64) / 100
+
+        schedules = Schedules(
+            np.array(anchors, dtype="datetime64[D]"),
+            frequencies,
+            intervals,
+            np.array(ends, dtype="datetime64[D]"),
+        )
+        rows, dates = schedules.between(
+            np.array(next_payments, dtype="datetime64[D]"), end
+        )
+        dates = dates.astype("datetime64[D]")
+        days = (np.maximum(dates, first_day) - first_day).astype(np.int64)
+        own = accounts[rows] >= 0
+        deltas -= np.bincount(
+            accounts[rows][own] * shape[1] + days[own],
+            weights=amounts[rows][own],
+            minlength=shape[0] * shape[1],
+        ).reshape(shape)
+
+        month = (
+            np.maximum(dates, first_day).astype("datetime64[M]")
+            - first_day.astype("datetime64[M]")
+        ).astype(np.int64)
+        budgeted = categories[rows] >= 0
+        spend += np.bincount(
+            categories[rows][budgeted] * (months + 1) + month[budgeted],
+            weights=amounts[rows][budgeted],
+            minlength=spend.size,
+        ).reshape(spend.shape)
+
+        charged: Weights = defaultdict(dict)
+        for row, payments in zip(*np.unique(rows, return_counts=True)):
+            if categories[row] >= 0:
+                per_account = charged[int(categories[row])]
+                per_account[account_ids[row]] = (
+                    per_account.get(account_ids[row], 0.0) + amounts[row] * payments
+                )
+        return deltas, spend, dict(charged)
+
+    def _history(
+        self,
+        start: date,
+        history_months: int,
+        account_index: Dict[str, int],
+        category_index: Dict[str, int],
+    ) -> Tuple[np.ndarray, np.ndarray, Weights]:
+        """One GROUP BY over the recent transactions. Returns:
+
+        - per account, the average monthly income over the full months and
+          the income received so far this month (two columns);
+        - per expense category, everything spent this month (all accounts);
+        - per category, each account's other spending (every account's).
+        """
+        # Months as year * 12 + month - 1
+        this_month = start.year * 12 + start.month - 1
+        first, after = this_month - history_months, this_month + 1
+        year = cast(extract("year", TransactionModel.date), Integer)
+        month = cast(extract("month", TransactionModel.date), Integer)
+        rows = self.db.execute(
+            select(
+                TransactionModel.account_id,
+                TransactionModel.category_id,
+                TransactionModel.type,
+                year,
+                month,
+                func.sum(_cents(TransactionModel.amount)),
+            )
+            .where(
+                TransactionModel.date >= datetime(first // 12, first % 12 + 1, 1),
+                TransactionModel.date < datetime(after // 12, after % 12 + 1, 1),
+            )
+            .group_by(
+                TransactionModel.account_id,
+                TransactionModel.category_id,
+                TransactionModel.type,
+                year,
+                month,
+            )
+        ).all()
+
+        received = np.zeros((len(account_index), 2))
+        spent = np.zeros(len(category_index))
+        by_category: Weights = defaultdict(dict)
+        for account_id, category_id, type, row_year, row_month, cents in rows:
+            total = cents / 100
+            current = row_year * 12 + row_month - 1 == this_month
+            if type == "income":
+                if account_id in account_index:
+                    received[account_index[account_id], int(current)] += total
+                continue
+            column = category_index.get(category_id)
+            if column is None:
+                continue
+            if current:
+                spent[column] += total
+            elif type == "expense":
+                # Subscriptions are projected on their own: exclude them
+                by_category[column][account_id] = by_category[column].get(
+                    account_id, 0.0
+                ) + total
+        received[:, 0] /= history_months
+        return received, spent, dict(by_category)
+
+    def _shares(
+        self,
+        spending: Weights,
+        charged: Weights,
+        account_index: Dict[str, int],
+        category_count: int,
+    ) -> np.ndarray:
+        # Share of each account in each category's budget. Taken over every
+        # account, even when forecasting only one, and never all zero: by
+        # recent spending, else by what the category's subscriptions charge,
+        # else evenly, so no budget drops out of the projection.
+        shares = np.zeros((len(account_index), category_count))
+        everyone = None
+        for column in range(category_count):
+            weights = spending.get(column) or charged.get(column)
+            if not weights:
+                if everyone is None:
+                    account_ids = self.db.scalars(select(AccountModel.id))
+                    everyone = dict.fromkeys(account_ids, 1.0)
+                weights = everyone
+            total = sum(weights.values())
+            for account_id, weight in weights.items():
+                if total and account_id in account_index:
+                    shares[account_index[account_id], column] = weight / total
+        return shares
@@ -0,0 +1,289 @@
+# fortuna/backend/app/services/import_service.py
+import csv
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from db import (
+    Transaction as TransactionModel,
+    Category as CategoryModel,
+    Account as AccountModel,
+)
+from db.tenancy import require_user
+from core.money import to_decimal
+from utils.instrumentation import instrumented
+from .account_service import AccountService
+from .category_totals_service import CategoryTotalsService
+
+# (line number, raw record) as produced by the parsers below
+RawRow = Tuple[int, Dict[str, str]]
+
+_FORMATS_BY_EXTENSION = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".ofx": "ofx",
+    ".qfx": "ofx",
+}
+_OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)")
+
+
+@dataclass
+class RejectedRow:
+    line: int
+    reason: str
+    raw: Dict[str, str]
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected_count: int = 0
+    batches: int = 0
+    # Only the first ``max_rejected`` rows are kept so memory stays bounded
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _FORMATS_BY_EXTENSION:
+        raise ValueError(f"Cannot detect import format for {path!r}")
+    return _FORMATS_BY_EXTENSION[extension]
+
+
+def parse_csv(stream: IO[str]) -> Iterator[RawRow]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {k.strip().lower(): v for k, v in row.items() if k}
+
+
+def parse_jsonl(stream: IO[str]) -> Iterator[RawRow]:
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, {"_error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield line_no, {"_error": "Expected a JSON object"}
+            continue
+        yield line_no, {str(k).lower(): v for k, v in record.items()}
+
+
+def parse_ofx(stream: IO[str]) -> Iterator[RawRow]:
+    # OFX 1.x (SGML) and 2.x (XML) statements: one record per <STMTTRN> block.
+    # Closing tags are optional in SGML, so values run to the end of the line.
+    record: Optional[Dict[str, str]] = None
+    start_line = 0
+    for line_no, line in enumerate(stream, start=1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            if tag == "STMTTRN":
+                if closing and record is not None:
+                    yield start_line, record
+                    record = None
+                elif not closing:
+                    record, start_line = {}, line_no
+            elif record is not None and not closing and value.strip():
+                record[tag.lower()] = value.strip()
+
+
+_PARSERS = {"csv": parse_csv, "jsonl": parse_jsonl, "ofx": parse_ofx}
+
+
+def _parse_date(value: str) -> datetime:
+    value = str(value).strip()
+    # OFX style: YYYYMMDD[HHMMSS[.XXX]][tz]; ISO dates have a dash after the year
+    match = re.match(r"(\d{8})(\d{6})?", value)
+    if match:
+        if match.group(2):
+            return datetime.strptime(match.group(1) + match.group(2), "%Y%m%d%H%M%S")
+        return datetime.strptime(match.group(1), "%Y%m%d")
+    return datetime.fromisoformat(value)
+
+
+@instrumented
+class ImportService:
+    """Streaming bulk import of transactions.
+
+    Rows are parsed lazily, resolved against accounts and categories loaded
+    once up front, and written with one executemany INSERT, one balance
+    UPDATE and one rollup upsert per batch. Budgets are not enforced: imports
+    are historical statements, not new spending.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.totals = CategoryTotalsService(db)
+        self.accounts = AccountService(db)
+
+    def import_file(
+        self,
+        path: str,
+        format: Optional[str] = None,
+        batch_size: int = 5000,
+        default_account: Optional[str] = None,
+        default_category: Optional[str] = None,
+        max_rejected: int = 1000,
+    ) -> ImportReport:
+        format = format or detect_format(path)
+        with open(path, newline="", encoding="utf-8") as stream:
+            return self.import_stream(
+                stream,
+                format,
+                batch_size=batch_size,
+                default_account=default_account,
+                default_category=default_category,
+                max_rejected=max_rejected,
+            )
+
+    def import_stream(
+        self,
+        stream: IO[str],
+        format: str,
+        batch_size: int = 5000,
+        default_account: Optional[str] = None,
+        default_category: Optional[str] = None,
+        max_rejected: int = 1000,
+    ) -> ImportReport:
+        if format not in _PARSERS:
+            raise ValueError(f"Unsupported import format: {format}")
+        return self.import_rows(
+            _PARSERS[format](stream),
+            batch_size=batch_size,
+            default_account=default_account,
+            default_category=default_category,
+            max_rejected=max_rejected,
+        )
+
+    def import_rows(
+        self,
+        rows: Iterable[RawRow],
+        batch_size: int = 5000,
+        default_account: Optional[str] = None,
+        default_category: Optional[str] = None,
+        max_rejected: int = 1000,
+    ) -> ImportReport:
+        report = ImportReport()
+        accounts = self._load_accounts()
+        categories = self._load_categories()
+
+        def reject(line: int, reason: str, raw: Dict[str, str]) -> None:
+            report.rejected_count += 1
+            if len(report.rejected) < max_rejected:
+                report.rejected.append(RejectedRow(line, reason, raw))
+
+        batch: List[dict] = []
+        batch_lines: List[Tuple[int, Dict[str, str]]] = []
+        for line, raw in rows:
+            try:
+                values = self._normalize(
+                    raw, accounts, categories, default_account, default_category
+                )
+            except (KeyError, ValueError, TypeError) as e:
+                reject(line, str(e.args[0] if e.args else e), raw)
+                continue
+            batch.append(values)
+            batch_lines.append((line, raw))
+            if len(batch) >= batch_size:
+                self._flush(batch, batch_lines, report, reject)
+                batch, batch_lines = [], []
+        if batch:
+            self._flush(batch, batch_lines, report, reject)
+        return report
+
+    def _load_accounts(self) -> Dict[str, str]:
+        # Both ids and lower-cased names map to the account id
+        accounts = {}
+        for account_id, name in self.db.query(AccountModel.id, AccountModel.name):
+            accounts[account_id] = account_id
+            accounts[name.lower()] = account_id
+        return accounts
+
+    def _load_categories(self) -> Dict[Tuple[str, str], str]:
+        categories = {}
+        query = self.db.query(CategoryModel.id, CategoryModel.name, CategoryModel.type)
+        for category_id, name, type_ in query:
+            categories[(category_id, type_)] = category_id
+            categories[(name.lower(), type_)] = category_id
+        return categories
+
+    def _normalize(
+        self,
+        raw: Dict[str, str],
+        accounts: Dict[str, str],
+        categories: Dict[Tuple[str, str], str],
+        default_account: Optional[str],
+        default_category: Optional[str],
+    ) -> dict:
+        if "_error" in raw:
+            raise ValueError(raw["_error"])
+        date = raw.get("date") or raw.get("dtposted")
+        if not date:
+            raise ValueError("Missing date")
+        amount = raw.get("amount", raw.get("trnamt"))
+        if amount in (None, ""):
+            raise ValueError("Missing amount")
+        amount = to_decimal(str(amount).strip())
+        # Without an explicit type, negative amounts are expenses
+        type_ = str(raw.get("type") or ("expense" if amount < 0 else "income")).lower()
+        if type_ not in ("expense", "income"):
+            raise ValueError(f"Unknown transaction type: {type_}")
+        account = str(raw.get("account") or default_account or "")
+        account_id = accounts.get(account) or accounts.get(account.lower())
+        if not account_id:
+            raise ValueError(f"Account not found: {account!r}")
+        category = str(raw.get("category") or default_category or "")
+        category_id = categories.get((category, type_)) or categories.get(
+            (category.lower(), type_)
+        )
+        if not category_id:
+            raise ValueError(f"{type_.capitalize()} category not found: {category!r}")
+        description = raw.get("description") or raw.get("name") or raw.get("memo")
+        return {
+            "id": str(uuid.uuid4()),
+            "date": _parse_date(date),
+            "amount": abs(amount),
+            "description": description,
+            "type": type_,
+            "account_id": account_id,
+            "category_id": category_id,
+        }
+
+    def _flush(self, batch, batch_lines, report, reject) -> None:
+        entries = [
+            (
+                row["account_id"],
+                -row["amount"] if row["type"] == "expense" else row["amount"],
+                row["type"],
+                row["id"],
+            )
+            for row in batch
+        ]
+        user_id = require_user(self.db)
+        try:
+            self.db.execute(
+                insert(TransactionModel.__table__),
+                [dict(row, user_id=user_id) for row in batch],
+            )
+            self.accounts.adjust_balances(entries)
+            self.totals.apply_deltas(
+                self.totals.collect_deltas(
+                    (row["category_id"], row["date"], row["type"], row["amount"])
+                    for row in batch
+                )
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            for line, raw in batch_lines:
+                reject(line, f"Batch failed: {e}", raw)
+            return
+        report.imported += len(batch)
+        report.batches += 1
@@ -1,59 +1,53 @@
 # fortuna/backend/app/services/income_service.py
 from datetime import datetime
-from typing import List, Optional
+import uuid
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from core.exceptions import InvalidInputError, NotFoundError
 from schemas import IncomeCreate, IncomeUpdate, Income
-from db import (
-    Transaction as TransactionModel,
-    Category as CategoryModel,
-    Account as AccountModel,
-)
-from sqlalchemy import func
+from db import Transaction as TransactionModel
+from utils.instrumentation import instrumented
+from .account_service import AccountService
+from .category_service import CategoryService
+from .category_totals_service import CategoryTotalsService
+from .pagination import Page, iterate, keyset_page
 
 
+@instrumented
 class IncomeService:
     def __init__(self, db: Session):
         self.db = db
+        self.totals = CategoryTotalsService(db)
+        self.accounts = AccountService(db)
+        self.categories = CategoryService(db)
 
     def create_income(self, income_data: IncomeCreate) -> Income:
         # Validate that the category exists and is of type "income"
-        category = (
-            self.db.query(CategoryModel)
-            .filter(
-                CategoryModel.id == income_data.category_id,
-                CategoryModel.type == "income",
-            )
-            .first()
-        )
-        if not category:
-            raise HTTPException(status_code=404, detail="Income category not found")
+        category = self.categories.get_category_ref(income_data.category_id)
+        if not category or category.type != "income":
+            raise NotFoundError("Income category not found")
 
         # Validate that the account exists
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == income_data.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+        if not self.accounts.get_account_ref(income_data.account_id):
+            raise NotFoundError("Account not found")
 
         # Create the income transaction (set type to "income")
         income_dict = income_data.model_dump(exclude_unset=True)
         income_dict["type"] = "income"
-        transaction = TransactionModel(**income_dict)
+        transaction = TransactionModel(id=str(uuid.uuid4()), **income_dict)
         self.db.add(transaction)
+        self.totals.record_transaction(transaction)
 
         # Update account balance (increase by income amount)
-        account.balance += income_data.amount
+        self.accounts.adjust_balance(
+            income_data.account_id, income_data.amount, "income", transaction.id
+        )
 
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error creating income: " + str(e)
-            )
+            raise InvalidInputError("Error creating income: " + str(e))
         self.db.refresh(transaction)
         return transaction
 
@@ -71,53 +65,102 @@ class IncomeService:
             .all()
         )
 
+    def _income_query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ):
+        query = self.db.query(TransactionModel).filter(
+            TransactionModel.type == "income"
+        )
+        if start_date is not None:
+            query = query.filter(TransactionModel.date >= start_date)
+        if end_date is not None:
+            query = query.filter(TransactionModel.date < end_date)
+        if account_id is not None:
+            query = query.filter(TransactionModel.account_id == account_id)
+        if category_id is not None:
+            query = query.filter(TransactionModel.category_id == category_id)
+        return query
+
+    def list_incomes(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Page[Income]:
+        # Newest first, keyset-paginated on (date, id)
+        query = self._income_query(start_date, end_date, account_id, category_id)
+        try:
+            return keyset_page(
+                query, TransactionModel.date, TransactionModel.id, limit, cursor
+            )
+        except ValueError as e:
+            raise InvalidInputError(str(e))
+
+    def iter_incomes(
+        self,
+        chunk_size: int = 1000,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Iterator[Income]:
+        query = self._income_query(start_date, end_date, account_id, category_id)
+        return iterate(query, TransactionModel.date, TransactionModel.id, chunk_size)
+
     def update_income(self, income_id: str, income_data: IncomeUpdate) -> Income:
         income = self.get_income(income_id)
         if not income:
-            raise HTTPException(status_code=404, detail="Income not found")
+            raise NotFoundError("Income not found")
         old_amount = income.amount
         update_data = income_data.model_dump(exclude_unset=True)
+        # A new category or account must be one of the user's own, as on create
+        if "category_id" in update_data:
+            category = self.categories.get_category_ref(update_data["category_id"])
+            if not category or category.type != "income":
+                raise NotFoundError("Income category not found")
+        if "account_id" in update_data:
+            if not self.accounts.get_account_ref(update_data["account_id"]):
+                raise NotFoundError("Account not found")
+        self.totals.record_transaction(income, sign=-1)
         for key, value in update_data.items():
             setattr(income, key, value)
+        self.totals.record_transaction(income)
         if "amount" in update_data:
-            account = (
-                self.db.query(AccountModel)
-                .filter(AccountModel.id == income.account_id)
-                .first()
-            )
-            if not account:
-                raise HTTPException(status_code=404, detail="Account not found")
+            if not self.accounts.get_account_ref(income.account_id):
+                raise NotFoundError("Account not found")
             # Reverse the old income effect then apply the new income amount
-            account.balance -= old_amount
-            account.balance += income.amount
+            self.accounts.adjust_balance(
+                income.account_id, income.amount - old_amount, "income", income.id
+            )
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error updating income: " + str(e)
-            )
+            raise InvalidInputError("Error updating income: " + str(e))
         self.db.refresh(income)
         return income
 
     def delete_income(self, income_id: str) -> None:
         income = self.get_income(income_id)
         if not income:
-            raise HTTPException(status_code=404, detail="Income not found")
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == income.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+            raise NotFoundError("Income not found")
+        if not self.accounts.get_account_ref(income.account_id):
+            raise NotFoundError("Account not found")
         # Reverse the income effect on the account balance
-        account.balance -= income.amount
+        self.accounts.adjust_balance(
+            income.account_id, -income.amount, "income", income.id
+        )
+        self.totals.record_transaction(income, sign=-1)
         self.db.delete(income)
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error deleting income: " + str(e)
-            )
+            raise InvalidInputError("Error deleting income: " + str(e))
@@ -0,0 +1,243 @@
+# fortuna/backend/app/services/ledger_service.py
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.orm import Session
+from db import (
+    Account as AccountModel,
+    BalanceLedgerEntry as EntryModel,
+    BalanceCheckpoint as CheckpointModel,
+)
+from db.tenancy import owned, require_user
+from db.types import Money
+from utils.dates import month_range
+from utils.instrumentation import instrumented
+
+# (account_id, amount, kind, transaction_id)
+LedgerEntry = Tuple[str, Decimal, str, Optional[str]]
+
+_entries = EntryModel.__table__
+_checkpoints = CheckpointModel.__table__
+_accounts = AccountModel.__table__
+
+
+@dataclass
+class BalanceMismatch:
+    account_id: str
+    name: str
+    ledger: Decimal
+    stored: Decimal
+
+
+@instrumented
+class LedgerService:
+    """Append-only ledger of balance changes, with per-account checkpoints.
+
+    Every write to ``accounts.balance`` goes through :class:`AccountService`,
+    which posts the matching entries here in the same DB transaction. A
+    balance is the newest checkpoint plus the entries after it, so replaying
+    never scans more than one checkpoint interval.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def post(
+        self,
+        account_id: str,
+        amount: Decimal,
+        kind: str,
+        transaction_id: Optional[str] = None,
+    ) -> None:
+        self.post_many([(account_id, amount, kind, transaction_id)])
+
+    def post_many(self, entries: Iterable[LedgerEntry]) -> None:
+        # One executemany INSERT; zero amounts change nothing and are dropped.
+        # The caller commits.
+        now = datetime.utcnow()
+        user_id = require_user(self.db)
+        rows = [
+            {
+                "user_id": user_id,
+                "account_id": account_id,
+                "amount": amount,
+                "kind": kind,
+                "transaction_id": transaction_id,
+                "posted_at": now,
+            }
+            for account_id, amount, kind, transaction_id in entries
+            if amount
+        ]
+        if rows:
+            self.db.execute(insert(_entries), rows)
+
+    def delete_account(self, account_id: str) -> None:
+        self.db.execute(
+            delete(_checkpoints).where(
+                _checkpoints.c.account_id == account_id,
+                *owned(_checkpoints, self.db),
+            )
+        )
+        self.db.execute(
+            delete(_entries).where(
+                _entries.c.account_id == account_id, *owned(_entries, self.db)
+            )
+        )
+
+    def balance(
+        self, account_id: str, posted_before: Optional[datetime] = None
+    ) -> Decimal:
+        # Balance from the entries posted before ``posted_before`` (default:
+        # all of them), replayed from the newest checkpoint before it. Entries
+        # are posted when a change is recorded, not at the transaction's date:
+        # imported and backdated transactions count from when they were
+        # entered, so this is the balance as the books stood then, not a
+        # balance as of a transaction date.
+        checkpoint_query = (
+            select(_checkpoints.c.entry_id, _checkpoints.c.balance)
+            .where(
+                _checkpoints.c.account_id == account_id,
+                *owned(_checkpoints, self.db),
+            )
+            .order_by(_checkpoints.c.entry_id.desc())
+            .limit(1)
+        )
+        if posted_before is not None:
+            checkpoint_query = checkpoint_query.where(
+                _checkpoints.c.posted_at < posted_before
+            )
+        checkpoint = self.db.execute(checkpoint_query).first()
+        entry_id, balance = checkpoint if checkpoint else (0, Decimal(0))
+
+        tail_query = select(func.sum(_entries.c.amount)).where(
+            _entries.c.account_id == account_id,
+            _entries.c.id > entry_id,
+            *owned(_entries, self.db),
+        )
+        if posted_before is not None:
+            tail_query = tail_query.where(_entries.c.posted_at < posted_before)
+        return balance + (self.db.scalar(tail_query) or Decimal(0))
+
+    def _latest_checkpoints(self):
+        # Newest checkpoint of every account that has one
+        newest = (
+            select(
+                _checkpoints.c.account_id,
+                func.max(_checkpoints.c.entry_id).label("entry_id"),
+            )
+            .where(*owned(_checkpoints, self.db))
+            .group_by(_checkpoints.c.account_id)
+            .subquery()
+        )
+        return (
+            select(
+                _checkpoints.c.account_id,
+                _checkpoints.c.entry_id,
+                _checkpoints.c.balance,
+            )
+            .join(
+                newest,
+                and_(
+                    newest.c.account_id == _checkpoints.c.account_id,
+                    newest.c.entry_id == _checkpoints.c.entry_id,
+                ),
+            )
+            .subquery()
+        )
+
+    def create_checkpoints(
+        self, every: int = 1000, before: Optional[datetime] = None
+    ) -> int:
+        """Checkpoint every account with at least ``every`` entries since its
+        last checkpoint, in one INSERT ... SELECT. With ``before``, only
+        entries posted before that time are folded in (by when they were
+        recorded, not by transaction date). A session without a user
+        checkpoints every user's accounts.
+        """
+        latest = self._latest_checkpoints()
+        since = func.coalesce(latest.c.entry_id, 0)
+        query = (
+            select(
+                _entries.c.user_id,
+                _entries.c.account_id,
+                func.max(_entries.c.id),
+                func.coalesce(func.max(latest.c.balance), 0)
+                + func.sum(_entries.c.amount),
+                func.max(_entries.c.posted_at),
+            )
+            .select_from(
+                _entries.outerjoin(latest, latest.c.account_id == _entries.c.account_id)
+            )
+            .where(_entries.c.id > since, *owned(_entries, self.db))
+            .group_by(_entries.c.user_id, _entries.c.account_id)
+            .having(func.count() >= every)
+        )
+        if before is not None:
+            query = query.where(_entries.c.posted_at < before)
+        result = self.db.execute(
+            insert(_checkpoints).from_select(
+                ["user_id", "account_id", "entry_id", "balance", "posted_at"], query
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def close_month(self, year: int, month: int) -> int:
+        # Checkpoint every account with entries since its last one, folding in
+        # those posted before the month's end. Like balance(), this goes by
+        # when entries were recorded: a later import dated in this month is
+        # not in it.
+        return self.create_checkpoints(every=1, before=month_range(year, month)[1])
+
+    def reconcile(self, fix: bool = False) -> List[BalanceMismatch]:
+        """Compare ``accounts.balance`` with the ledger for every account in a
+        single query. With ``fix``, stored balances are reset to the ledger.
+        """
+        latest = self._latest_checkpoints()
+        ledger_balance = type_coerce(
+            func.coalesce(func.max(latest.c.balance), 0)
+            + func.coalesce(func.sum(_entries.c.amount), 0),
+            Money,
+        )
+        query = (
+            select(_accounts.c.id, _accounts.c.name, _accounts.c.balance, ledger_balance)
+            .select_from(
+                _accounts.outerjoin(
+                    latest, latest.c.account_id == _accounts.c.id
+                ).outerjoin(
+                    _entries,
+                    and_(
+                        _entries.c.user_id == _accounts.c.user_id,
+                        _entries.c.account_id == _accounts.c.id,
+                        _entries.c.id > func.coalesce(latest.c.entry_id, 0),
+                    ),
+                )
+            )
+            .where(*owned(_accounts, self.db))
+            .group_by(_accounts.c.id, _accounts.c.name, _accounts.c.balance)
+        )
+        mismatches = [
+            BalanceMismatch(account_id, name, ledger, stored)
+            for account_id, name, stored, ledger in self.db.execute(query)
+            if ledger != stored
+        ]
+        if fix and mismatches:
+            self.db.execute(
+                update(_accounts)
+                .where(_accounts.c.id == bindparam("b_id"), *owned(_accounts, self.db))
+                .values(balance=bindparam("b_balance", type_=Money)),
+                [{"b_id": m.account_id, "b_balance": m.ledger} for m in mismatches],
+            )
+            self.db.commit()
+        return mismatches
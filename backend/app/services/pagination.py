@@ -0,0 +1,91 @@
+# fortuna/backend/app/services/pagination.py
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, Iterator, List, Optional, Tuple, TypeVar
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    # Opaque cursor for the following page, None on the last page
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: datetime, id: str) -> str:
+    raw = json.dumps([sort_value.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), str(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_after(sort_column, id_column, cursor: str, descending: bool = True):
+    # WHERE clause for the rows that follow ``cursor`` in (sort, id) order
+    sort_value, last_id = decode_cursor(cursor)
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < last_id),
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > last_id),
+    )
+
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+) -> Page:
+    """Return one page of ``query`` ordered by ``(sort_column, id_column)``.
+
+    The cursor encodes the last row's ``(sort, id)`` pair, so each page is an
+    index seek instead of an ever-growing OFFSET scan.
+    """
+    if cursor:
+        query = query.filter(keyset_after(sort_column, id_column, cursor, descending))
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(items=rows)
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = encode_cursor(
+        getattr(last, sort_column.key), getattr(last, id_column.key)
+    )
+    return Page(items=rows, next_cursor=next_cursor)
+
+
+def iterate(
+    query: Query,
+    sort_column,
+    id_column,
+    chunk_size: int = 1000,
+    descending: bool = True,
+) -> Iterator:
+    # Stream rows in a stable order, buffering at most ``chunk_size`` ORM objects
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    yield from query.yield_per(chunk_size)
@@ -0,0 +1,142 @@
+# fortuna/backend/app/services/search_service.py
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+from core.exceptions import InvalidInputError
+from schemas import Transaction
+from db import Transaction as TransactionModel
+from db import fts
+from utils.instrumentation import instrumented
+
+_TOKEN = re.compile(r'"([^"]*)"\*?|\S+')
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class SearchTerm:
+    # One word, or a phrase of several; ``prefix`` matches the last word as
+    # a prefix ("amaz*")
+    words: List[str]
+    prefix: bool = False
+
+
+def parse_query(query: str) -> List[SearchTerm]:
+    """Words, "quoted phrases" and trailing-* prefixes, all required (AND).
+
+    Only word characters survive, so the result can be rendered into FTS5
+    or tsquery syntax without escaping.
+    """
+    terms = []
+    for match in _TOKEN.finditer(query):
+        raw = match.group(0)
+        words = _WORD.findall(match.group(1) if match.group(1) is not None else raw)
+        if not words:
+            continue
+        # Punctuation inside a bare word ("o'reilly") also makes a phrase
+        terms.append(SearchTerm(words, prefix=raw.endswith("*")))
+    return terms
+
+
+def to_fts5(terms: List[SearchTerm]) -> str:
+    return " ".join(
+        '"' + " ".join(term.words) + '"' + ("*" if term.prefix else "")
+        for term in terms
+    )
+
+
+def to_tsquery(terms: List[SearchTerm]) -> str:
+    return " & ".join(
+        "(" + " <-> ".join(term.words) + (":*" if term.prefix else "") + ")"
+        for term in terms
+    )
+
+
+@instrumented
+class SearchService:
+    """Full-text search over transaction descriptions, best matches first.
+
+    Uses the FTS5 index (bm25 ranking) on SQLite and the tsvector GIN index
+    (ts_rank) on Postgres, see ``db/fts.py``; elsewhere it falls back to a
+    LIKE scan ordered by date. Filters are applied in the same query.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        query: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        min_amount: Optional[Decimal] = None,
+        max_amount: Optional[Decimal] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+        type: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Transaction]:
+        terms = parse_query(query)
+        if not terms:
+            raise InvalidInputError("Empty search query")
+
+        connection = self.db.connection()
+        dialect = connection.dialect.name
+        if not fts.available(connection):
+            dialect = None
+        if dialect == "sqlite":
+            stmt = (
+                select(TransactionModel)
+                .join(
+                    fts.fts_table,
+                    fts.fts_table.c.rowid == literal_column("transactions.rowid"),
+                )
+                .where(fts.fts_table.c.description.match(to_fts5(terms)))
+                # bm25: lower is better
+                .order_by(fts.fts_table.c.rank, TransactionModel.date.desc())
+            )
+        elif dialect == "postgresql":
+            vector = literal_column(fts.PG_TSVECTOR)
+            tsquery = func.to_tsquery(
+                literal_column("'simple'::regconfig"), to_tsquery(terms)
+            )
+            stmt = (
+                select(TransactionModel)
+                .where(vector.op("@@")(tsquery))
+                .order_by(
+                    func.ts_rank(vector, tsquery).desc(), TransactionModel.date.desc()
+                )
+            )
+        else:
+            stmt = select(TransactionModel).order_by(TransactionModel.date.desc())
+            for term in terms:
+                # A prefix is a substring match anyway
+                stmt = stmt.where(
+                    TransactionModel.description.ilike(f"%{' '.join(term.words)}%")
+                )
+
+        if start_date is not None:
+            stmt = stmt.where(TransactionModel.date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(TransactionModel.date < end_date)
+        if min_amount is not None:
+            stmt = stmt.where(TransactionModel.amount >= min_amount)
+        if max_amount is not None:
+            stmt = stmt.where(TransactionModel.amount <= max_amount)
+        if account_id is not None:
+            stmt = stmt.where(TransactionModel.account_id == account_id)
+        if category_id is not None:
+            stmt = stmt.where(TransactionModel.category_id == category_id)
+        if type is not None:
+            stmt = stmt.where(TransactionModel.type == type)
+        return list(self.db.scalars(stmt.limit(limit).offset(offset)))
+
+    def rebuild_index(self) -> bool:
+        connection = self.db.connection()
+        installed = fts.install(connection)
+        self.db.commit()
+        return installed
@@ -1,8 +1,13 @@
 # fortuna/backend/app/services/subscription_service.py
-from datetime import datetime, timedelta
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+import uuid
+import numpy as np
+from sqlalchemy import and_, case, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
+from core.exceptions import InvalidInputError, NotFoundError
 from schemas import (
     SubscriptionCreate,
     SubscriptionUpdate,
@@ -15,51 +20,89 @@ from db import (
     Category as CategoryModel,
     Account as AccountModel,
 )
+from db.tenancy import owned, require_user
+from core.frequencies import FREQUENCIES
+from core.recurrence import Schedules, next_occurrence, to_datetimes
+from utils.instrumentation import instrumented
+from .account_service import AccountService
+from .category_service import CategoryService
+from .category_totals_service import CategoryTotalsService
+from .pagination import Page, iterate, keyset_page
+from utils.background_tasks import scheduler
 
 
+@dataclass
+class DuePaymentsSummary:
+    subscriptions: int = 0
+    transactions: int = 0
+    total_amount: Decimal = Decimal(0)
+    batches: int = 0
+    account_deltas: Dict[str, Decimal] = field(default_factory=dict)
+    # (subscription_id, reason) for due subscriptions that could not be charged
+    skipped: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class SubscriptionTransactions:
+    subscription: Subscription
+    # Newest first
+    transactions: List[Transaction] = field(default_factory=list)
+
+
+@instrumented
 class SubscriptionService:
     def __init__(self, db: Session):
         self.db = db
+        self.totals = CategoryTotalsService(db)
+        self.accounts = AccountService(db)
+        self.categories = CategoryService(db)
 
     def create_subscription(
         self, subscription_data: SubscriptionCreate
     ) -> Subscription:
         # Validate that the expense category exists (subscriptions use expense categories)
-        category = (
-            self.db.query(CategoryModel)
-            .filter(
-                CategoryModel.id == subscription_data.category_id,
-                CategoryModel.type == "expense",
-            )
-            .first()
-        )
-        if not category:
-            raise HTTPException(
-                status_code=404, detail="Expense category for subscription not found"
-            )
+        category = self.categories.get_category_ref(subscription_data.category_id)
+        if not category or category.type != "expense":
+            raise NotFoundError("Expense category for subscription not found")
 
         # Validate that the account exists
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == subscription_data.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+        if not self.accounts.get_account_ref(subscription_data.account_id):
+            raise NotFoundError("Account not found")
 
         subscription_dict = subscription_data.model_dump(exclude_unset=True)
-        subscription = SubscriptionModel(**subscription_dict)
+        self._check_end_date(
+            subscription_data.next_payment, subscription_data.end_date
+        )
+        # The first payment anchors the schedule
+        subscription = SubscriptionModel(
+            **subscription_dict, anchor=subscription_data.next_payment
+        )
         self.db.add(subscription)
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error creating subscription: " + str(e)
-            )
+            raise InvalidInputError("Error creating subscription: " + str(e))
         self.db.refresh(subscription)
+        self._reschedule(subscription)
         return subscription
 
+    @staticmethod
+    def _check_end_date(
+        next_payment: datetime, end_date: Optional[datetime]
+    ) -> None:
+        if end_date is not None and end_date < next_payment:
+            raise InvalidInputError("end_date must not be before next_payment")
+
+    @staticmethod
+    def _reschedule(subscription: SubscriptionModel) -> None:
+        # Keep the in-process scheduler's heap in step with committed changes
+        scheduler.notify(
+            subscription.id,
+            subscription.next_payment if subscription.active else None,
+            subscription.user_id,
+        )
+
     def get_subscription(self, subscription_id: str) -> Optional[Subscription]:
         return (
             self.db.query(SubscriptionModel)
@@ -70,6 +113,59 @@ class SubscriptionService:
     def get_all_subscriptions(self) -> List[Subscription]:
         return self.db.query(SubscriptionModel).all()
 
+    def _subscription_query(
+        self,
+        active: Optional[bool] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ):
+        query = self.db.query(SubscriptionModel)
+        if active is not None:
+            query = query.filter(SubscriptionModel.active == active)
+        if account_id is not None:
+            query = query.filter(SubscriptionModel.account_id == account_id)
+        if category_id is not None:
+            query = query.filter(SubscriptionModel.category_id == category_id)
+        return query
+
+    def list_subscriptions(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        active: Optional[bool] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Page[Subscription]:
+        # Soonest payment first, keyset-paginated on (next_payment, id)
+        query = self._subscription_query(active, account_id, category_id)
+        try:
+            return keyset_page(
+                query,
+                SubscriptionModel.next_payment,
+                SubscriptionModel.id,
+                limit,
+                cursor,
+                descending=False,
+            )
+        except ValueError as e:
+            raise InvalidInputError(str(e))
+
+    def iter_subscriptions(
+        self,
+        chunk_size: int = 1000,
+        active: Optional[bool] = None,
+        account_id: Optional[str] = None,
+        category_id: Optional[str] = None,
+    ) -> Iterator[Subscription]:
+        query = self._subscription_query(active, account_id, category_id)
+        return iterate(
+            query,
+            SubscriptionModel.next_payment,
+            SubscriptionModel.id,
+            chunk_size,
+            descending=False,
+        )
+
     def get_subscription_transactions(self, subscription_id: str) -> List[Transaction]:
         return (
             self.db.query(TransactionModel)
@@ -77,23 +173,103 @@ class SubscriptionService:
             .all()
         )
 
+    def get_subscriptions_with_transactions(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit_per_subscription: Optional[int] = None,
+        active: Optional[bool] = None,
+    ) -> List[SubscriptionTransactions]:
+        """Every subscription with its transactions in one query, whatever
+        the number of subscriptions: the subscriptions are outer-joined to
+        their transactions. ``limit_per_subscription`` keeps the newest N of
+        each, ranked in SQL with a window function.
+        """
+        conditions = []
+        if start_date is not None:
+            conditions.append(TransactionModel.date >= start_date)
+        if end_date is not None:
+            conditions.append(TransactionModel.date < end_date)
+
+        if limit_per_subscription is None:
+            # Date bounds go in the ON clause to keep subscriptions without
+            # transactions in range
+            transaction = TransactionModel
+            joined_on = and_(
+                TransactionModel.subscription_id == SubscriptionModel.id, *conditions
+            )
+        else:
+            ranked = (
+                select(
+                    TransactionModel,
+                    func.row_number()
+                    .over(
+                        partition_by=TransactionModel.subscription_id,
+                        order_by=(
+                            TransactionModel.date.desc(),
+                            TransactionModel.id.desc(),
+                        ),
+                    )
+                    .label("rank"),
+                )
+                .where(TransactionModel.subscription_id.is_not(None), *conditions)
+                .subquery()
+            )
+            transaction = aliased(TransactionModel, ranked)
+            joined_on = (transaction.subscription_id == SubscriptionModel.id) & (
+                ranked.c.rank <= limit_per_subscription
+            )
+        query = (
+            self._subscription_query(active)
+            .add_entity(transaction)
+            .outerjoin(transaction, joined_on)
+            .order_by(
+                SubscriptionModel.name,
+                SubscriptionModel.id,
+                transaction.date.desc(),
+                transaction.id.desc(),
+            )
+        )
+
+        grouped: Dict[str, SubscriptionTransactions] = {}
+        for subscription, row in query:
+            entry = grouped.get(subscription.id)
+            if entry is None:
+                entry = grouped[subscription.id] = SubscriptionTransactions(
+                    subscription
+                )
+            if row is not None:
+                entry.transactions.append(row)
+        return list(grouped.values())
+
     def update_subscription(
         self, subscription_id: str, subscription_data: SubscriptionUpdate
     ) -> Subscription:
         subscription = self.get_subscription(subscription_id)
         if not subscription:
-            raise HTTPException(status_code=404, detail="Subscription not found")
+            raise NotFoundError("Subscription not found")
         update_data = subscription_data.model_dump(exclude_unset=True)
+        # A new category or account must be one of the user's own, as on create
+        if "category_id" in update_data:
+            category = self.categories.get_category_ref(update_data["category_id"])
+            if not category or category.type != "expense":
+                raise NotFoundError("Expense category for subscription not found")
+        if "account_id" in update_data:
+            if not self.accounts.get_account_ref(update_data["account_id"]):
+                raise NotFoundError("Account not found")
         for key, value in update_data.items():
             setattr(subscription, key, value)
+        self._check_end_date(subscription.next_payment, subscription.end_date)
+        if update_data.keys() & {"next_payment", "frequency", "interval"}:
+            # A new schedule starts from the (new) next payment
+            subscription.anchor = subscription.next_payment
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error updating subscription: " + str(e)
-            )
+            raise InvalidInputError("Error updating subscription: " + str(e))
         self.db.refresh(subscription)
+        self._reschedule(subscription)
         return subscription
 
     def delete_subscription(
@@ -101,21 +277,32 @@ class SubscriptionService:
     ) -> None:
         subscription = self.get_subscription(subscription_id)
         if not subscription:
-            raise HTTPException(status_code=404, detail="Subscription not found")
+            raise NotFoundError("Subscription not found")
         try:
             if delete_transactions:
                 # Delete all transactions linked to the subscription
-                self.db.query(TransactionModel).filter(
+                linked = self.db.query(TransactionModel).filter(
                     TransactionModel.subscription_id == subscription_id
-                ).delete()
+                )
+                self.totals.apply_deltas(
+                    self.totals.collect_deltas(
+                        linked.with_entities(
+                            TransactionModel.category_id,
+                            TransactionModel.date,
+                            TransactionModel.type,
+                            TransactionModel.amount,
+                        ),
+                        sign=-1,
+                    )
+                )
+                linked.delete()
             # Delete the subscription
             self.db.delete(subscription)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400, detail="Error deleting subscription: " + str(e)
-            )
+            raise InvalidInputError("Error deleting subscription: " + str(e))
+        scheduler.notify(subscription_id, None)
 
     def process_payment(self, subscription: SubscriptionModel) -> Optional[Transaction]:
         now = datetime.now()
@@ -123,31 +310,50 @@ class SubscriptionService:
             return None
 
         # Validate associated account and category exist
-        account = (
-            self.db.query(AccountModel)
-            .filter(AccountModel.id == subscription.account_id)
-            .first()
-        )
-        if not account:
-            raise HTTPException(
-                status_code=404, detail="Account not found for subscription"
-            )
+        if not self.accounts.get_account_ref(subscription.account_id):
+            raise NotFoundError("Account not found for subscription")
 
-        category = (
-            self.db.query(CategoryModel)
-            .filter(CategoryModel.id == subscription.category_id)
-            .first()
-        )
-        if not category:
-            raise HTTPException(
-                status_code=404, detail="Category not found for subscription"
-            )
+        if not self.categories.get_category_ref(subscription.category_id):
+            raise NotFoundError("Category not found for subscription")
+
+        if subscription.frequency not in FREQUENCIES:
+            raise InvalidInputError("Unknown frequency")
 
         # Optionally, you might check the category budget here (skipped for brevity)
 
+        # Claim this payment first: the UPDATE only matches while the
+        # subscription is still at the date read above, so a concurrent
+        # runner that got there first leaves nothing to charge. It also
+        # moves on to the next payment of the schedule, or ends the
+        # subscription (keeping its last due date)
+        payment_date = subscription.next_payment
+        next_payment = next_occurrence(
+            subscription.anchor or payment_date,
+            subscription.frequency,
+            after=payment_date,
+            interval=subscription.interval or 1,
+            end=subscription.end_date,
+        )
+        claimed = self.db.execute(
+            update(SubscriptionModel)
+            .where(
+                SubscriptionModel.id == subscription.id,
+                SubscriptionModel.active == True,
+                SubscriptionModel.next_payment == payment_date,
+            )
+            .values(
+                next_payment=next_payment or payment_date,
+                active=next_payment is not None,
+            )
+        )
+        if claimed.rowcount != 1:
+            self.db.rollback()
+            return None
+
         # Create a new transaction for the subscription payment
         transaction = TransactionModel(
-            date=subscription.next_payment,
+            id=str(uuid.uuid4()),
+            date=payment_date,
             amount=subscription.amount,
             description=f"Subscription payment - {subscription.name}",
             account_id=subscription.account_id,
@@ -156,38 +362,20 @@ class SubscriptionService:
             subscription_id=subscription.id,
         )
         self.db.add(transaction)
+        self.totals.record_transaction(transaction)
 
         # Deduct the subscription amount from the account balance
-        account.balance -= subscription.amount
-
-        # Update the subscription's next payment date based on its frequency
-        if subscription.frequency == "weekly":
-            subscription.next_payment += timedelta(days=7)
-        elif subscription.frequency == "monthly":
-            month = subscription.next_payment.month
-            year = subscription.next_payment.year
-            if month == 12:
-                subscription.next_payment = subscription.next_payment.replace(
-                    year=year + 1, month=1
-                )
-            else:
-                subscription.next_payment = subscription.next_payment.replace(
-                    month=month + 1
-                )
-        elif subscription.frequency == "yearly":
-            subscription.next_payment = subscription.next_payment.replace(
-                year=subscription.next_payment.year + 1
-            )
+        self.accounts.adjust_balance(
+            subscription.account_id, -subscription.amount, "subscription", transaction.id
+        )
 
         try:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
-            raise HTTPException(
-                status_code=400,
-                detail="Error processing subscription payment: " + str(e),
-            )
+            raise InvalidInputError("Error processing subscription payment: " + str(e))
         self.db.refresh(transaction)
+        self._reschedule(subscription)
         return transaction
 
     def process_due_payments(self) -> List[Transaction]:
@@ -205,3 +393,192 @@ class SubscriptionService:
             if tx:
                 processed_transactions.append(tx)
         return processed_transactions
+
+    def process_due_payments_batch(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: int = 500,
+    ) -> DuePaymentsSummary:
+        """Charge every due subscription of the session's user, catching up
+        all missed periods.
+
+        Works set-based on batches of due subscriptions: accounts and
+        categories are preloaded with one query each, the missed payment
+        dates of the whole batch come from one ``Schedules.between``, all
+        missed periods are inserted with one executemany, balances are
+        adjusted with one aggregated UPDATE, and each batch is committed
+        once. Subscriptions whose schedule has ended are deactivated.
+
+        Safe to run from several processes at once: each batch first claims
+        its subscriptions with an UPDATE that only matches rows still at the
+        due date that was read, and only the claimed ones are charged.
+        """
+        now = now or datetime.now()
+        user_id = require_user(self.db)
+        summary = DuePaymentsSummary()
+        subscriptions = SubscriptionModel.__table__
+        accounts = AccountModel.__table__
+        categories = CategoryModel.__table__
+        last_id = ""
+        while True:
+            due = self.db.execute(
+                select(
+                    subscriptions.c.id,
+                    subscriptions.c.name,
+                    subscriptions.c.amount,
+                    subscriptions.c.frequency,
+                    subscriptions.c.interval,
+                    func.coalesce(
+                        subscriptions.c.anchor, subscriptions.c.next_payment
+                    ).label("anchor"),
+                    subscriptions.c.end_date,
+                    subscriptions.c.next_payment,
+                    subscriptions.c.account_id,
+                    subscriptions.c.category_id,
+                )
+                .where(
+                    subscriptions.c.user_id == user_id,
+                    subscriptions.c.active == True,
+                    subscriptions.c.next_payment <= now,
+                    subscriptions.c.id > last_id,
+                )
+                .order_by(subscriptions.c.id)
+                .limit(batch_size)
+            ).all()
+            if not due:
+                break
+            last_id = due[-1].id
+
+            account_ids = set(
+                self.db.scalars(
+                    select(accounts.c.id).where(
+                        accounts.c.id.in_({sub.account_id for sub in due}),
+                        *owned(accounts, self.db),
+                    )
+                )
+            )
+            category_ids = set(
+                self.db.scalars(
+                    select(categories.c.id).where(
+                        categories.c.id.in_({sub.category_id for sub in due}),
+                        *owned(categories, self.db),
+                    )
+                )
+            )
+
+            chargeable = []
+            for sub in due:
+                if sub.account_id not in account_ids:
+                    summary.skipped.append((sub.id, "Account not found for subscription"))
+                elif sub.category_id not in category_ids:
+                    summary.skipped.append((sub.id, "Category not found for subscription"))
+                elif sub.frequency not in FREQUENCIES or sub.interval < 1:
+                    summary.skipped.append((sub.id, "Unknown frequency"))
+                else:
+                    chargeable.append(sub)
+
+            transactions = []
+            entries = []
+            # (subscription_id, next payment, None once the schedule ended)
+            claimed: List[Tuple[str, Optional[datetime]]] = []
+            if chargeable:
+                schedules = Schedules(
+                    [sub.anchor for sub in chargeable],
+                    [sub.frequency for sub in chargeable],
+                    [sub.interval for sub in chargeable],
+                    [sub.end_date for sub in chargeable],
+                )
+                upcoming = to_datetimes(schedules.next(now))
+                # Past its end date: keep the last due date, deactivate
+                next_of = {
+                    sub.id: next_payment or sub.next_payment
+                    for sub, next_payment in zip(chargeable, upcoming)
+                }
+                active_of = {
+                    sub.id: next_payment is not None
+                    for sub, next_payment in zip(chargeable, upcoming)
+                }
+                # Claim the batch before charging it: only rows still at the
+                # due date read above match, so subscriptions another runner
+                # has charged in the meantime are left alone
+                due_keys = tuple_(subscriptions.c.id, subscriptions.c.next_payment)
+                won = set(
+                    self.db.scalars(
+                        update(subscriptions)
+                        .where(
+                            subscriptions.c.user_id == user_id,
+                            subscriptions.c.active == True,
+                            due_keys.in_(
+                                [(sub.id, sub.next_payment) for sub in chargeable]
+                            ),
+                        )
+                        .values(
+                            next_payment=case(next_of, value=subscriptions.c.id),
+                            active=case(active_of, value=subscriptions.c.id),
+                        )
+                        .returning(subscriptions.c.id)
+                    )
+                )
+                claimed = [
+                    (sub.id, next_of[sub.id] if active_of[sub.id] else None)
+                    for sub in chargeable
+                    if sub.id in won
+                ]
+                # Every missed payment of the claimed subscriptions
+                rows, dates = schedules.between(
+                    np.array(
+                        [sub.next_payment for sub in chargeable],
+                        dtype="datetime64[us]",
+                    ),
+                    now,
+                    include_stop=True,
+                )
+                for row, payment_date in zip(rows.tolist(), to_datetimes(dates)):
+                    sub = chargeable[row]
+                    if sub.id not in won:
+                        continue
+                    transactions.append(
+                        {
+                            "id": str(uuid.uuid4()),
+                            "user_id": user_id,
+                            "date": payment_date,
+                            "amount": sub.amount,
+                            "description": f"Subscription payment - {sub.name}",
+                            "account_id": sub.account_id,
+                            "category_id": sub.category_id,
+                            "type": "subscription",
+                            "subscription_id": sub.id,
+                        }
+                    )
+                    entries.append(
+                        (sub.account_id, -sub.amount, "subscription", transactions[-1]["id"])
+                    )
+                summary.subscriptions += len(claimed)
+
+            balance_deltas: Dict[str, Decimal] = {}
+            if transactions:
+                self.db.execute(insert(TransactionModel.__table__), transactions)
+                balance_deltas = self.accounts.adjust_balances(entries)
+                self.totals.apply_deltas(
+                    self.totals.collect_deltas(
+                        (tx["category_id"], tx["date"], tx["type"], tx["amount"])
+                        for tx in transactions
+                    )
+                )
+            try:
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                raise InvalidInputError(
+                    "Error processing subscription payments: " + str(e)
+                )
+            for subscription_id, next_payment in claimed:
+                scheduler.notify(subscription_id, next_payment, user_id)
+            summary.batches += 1
+            summary.transactions += len(transactions)
+            for account_id, delta in balance_deltas.items():
+                summary.account_deltas[account_id] = (
+                    summary.account_deltas.get(account_id, Decimal(0)) + delta
+                )
+                summary.total_amount -= delta
+        return summary
@@ -1,7 +1,7 @@
 # fortuna/backend/app/services/transaction_service.py
 from datetime import datetime
 from typing import Optional
-from fastapi import HTTPException
+from core.exceptions import InvalidInputError, NotFoundError
 from sqlalchemy.orm import Session
 from schemas import (
     TransactionCreate,
@@ -9,20 +9,41 @@ from schemas import (
     Transaction,
 )
 from db import Transaction as TransactionModel
+from utils.instrumentation import instrumented
+from .account_service import AccountService
+from .category_service import CategoryService
+from .category_totals_service import CategoryTotalsService
 
 
+@instrumented
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
+        self.totals = CategoryTotalsService(db)
+        self.accounts = AccountService(db)
+        self.categories = CategoryService(db)
+
+    def _check_refs(self, data: dict) -> None:
+        # The account and category (when given) must be the user's own
+        if "account_id" in data and not self.accounts.get_account_ref(
+            data["account_id"]
+        ):
+            raise NotFoundError("Account not found")
+        if "category_id" in data and not self.categories.get_category_ref(
+            data["category_id"]
+        ):
+            raise NotFoundError("Category not found")
 
     def create_transaction(self, transaction: TransactionCreate) -> Transaction:
+        self._check_refs(transaction.model_dump())
         db_transaction = TransactionModel(**transaction.model_dump())
         self.db.add(db_transaction)
+        self.totals.record_transaction(db_transaction)
         try:
             self.db.commit()
         except Exception:
             self.db.rollback()
-            raise HTTPException(status_code=400, detail="Error creating transaction")
+            raise InvalidInputError("Error creating transaction")
         self.db.refresh(db_transaction)
         return db_transaction
 
@@ -38,10 +59,13 @@ class TransactionService:
     ) -> Optional[Transaction]:
         db_transaction = self.get_transaction(transaction_id)
         if not db_transaction:
-            raise HTTPException(status_code=404, detail="Transaction not found")
+            raise NotFoundError("Transaction not found")
         update_data = transaction.model_dump(exclude_unset=True)
+        self._check_refs(update_data)
+        self.totals.record_transaction(db_transaction, sign=-1)
         for key, value in update_data.items():
             setattr(db_transaction, key, value)
+        self.totals.record_transaction(db_transaction)
         self.db.commit()
         self.db.refresh(db_transaction)
         return db_transaction
@@ -49,6 +73,7 @@ class TransactionService:
     def delete_transaction(self, transaction_id: str) -> None:
         db_transaction = self.get_transaction(transaction_id)
         if not db_transaction:
-            raise HTTPException(status_code=404, detail="Transaction not found")
+            raise NotFoundError("Transaction not found")
+        self.totals.record_transaction(db_transaction, sign=-1)
         self.db.delete(db_transaction)
         self.db.commit()
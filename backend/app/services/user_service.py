@@ -0,0 +1,79 @@
+# fortuna/backend/app/services/user_service.py
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.exceptions import InvalidInputError, NotFoundError
+from core.security import hash_api_key, new_api_key
+from db import User as UserModel
+from schemas import UserCreate, UserWithKey
+from utils.cache import user_cache
+from utils.instrumentation import instrumented
+
+
+@instrumented
+class UserService:
+    """Users and their API keys.
+
+    Users always live in the main database, so this runs on a session
+    without a user: ``DatabaseConnection().get_session(None)``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_user(self, user: UserCreate) -> UserWithKey:
+        api_key = new_api_key()
+        db_user = UserModel(name=user.name, api_key_hash=hash_api_key(api_key))
+        self.db.add(db_user)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise InvalidInputError("User already exists")
+        self.db.refresh(db_user)
+        return self._with_key(db_user, api_key)
+
+    def get_user(self, user_id: str) -> Optional[UserModel]:
+        return self.db.get(UserModel, user_id)
+
+    def get_user_by_name(self, name: str) -> Optional[UserModel]:
+        return self.db.scalar(select(UserModel).where(UserModel.name == name))
+
+    def find_user(self, user: str) -> Optional[UserModel]:
+        # By id, then by name (the CLI's --user takes either)
+        return self.get_user(user) or self.get_user_by_name(user)
+
+    def get_all_users(self) -> List[UserModel]:
+        return list(self.db.scalars(select(UserModel).order_by(UserModel.name)))
+
+    def rotate_api_key(self, user_id: str) -> UserWithKey:
+        # Issue a new key; the old one stops working immediately
+        db_user = self.get_user(user_id)
+        if not db_user:
+            raise NotFoundError("User not found")
+        api_key = new_api_key()
+        db_user.api_key_hash = hash_api_key(api_key)
+        self.db.commit()
+        user_cache.discard_if(lambda cached_id: cached_id == user_id)
+        self.db.refresh(db_user)
+        return self._with_key(db_user, api_key)
+
+    def authenticate(self, api_key: str) -> Optional[str]:
+        # Id of the user with this key, None for an unknown key
+        key_hash = hash_api_key(api_key)
+        return user_cache.get_or_load(
+            key_hash,
+            lambda: self.db.scalar(
+                select(UserModel.id).where(UserModel.api_key_hash == key_hash)
+            ),
+        )
+
+    @staticmethod
+    def _with_key(db_user: UserModel, api_key: str) -> UserWithKey:
+        return UserWithKey(
+            id=db_user.id,
+            name=db_user.name,
+            created_at=db_user.created_at,
+            api_key=api_key,
+        )
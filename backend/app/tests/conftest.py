@@ -0,0 +1,39 @@
+# fortuna/backend/app/tests/conftest.py
+"""Run from backend/app: ``python -m pytest -q tests``.
+
+The tests use a throwaway data directory, so a SQLite database of their own
+unless FORTUNA_DATABASE_URL points elsewhere, and each test acts for a user
+of its own.
+"""
+import os
+import sys
+import tempfile
+import uuid
+import pytest
+
+# Before the settings are first read; spawned worker processes inherit it
+os.environ.setdefault("FORTUNA_DATA_DIR", tempfile.mkdtemp(prefix="fortuna-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def connection():
+    from db import DatabaseConnection
+
+    connection = DatabaseConnection()
+    connection.create_tables()
+    return connection
+
+
+@pytest.fixture
+def db(connection):
+    from schemas import UserCreate
+    from services import UserService
+
+    with connection.new_session(None) as admin:
+        user = UserService(admin).create_user(
+            UserCreate(name=f"test-{uuid.uuid4().hex[:12]}")
+        )
+    session = connection.new_session(user.id)
+    yield session
+    session.close()
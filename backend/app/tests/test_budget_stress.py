@@ -0,0 +1,78 @@
+# fortuna/backend/app/tests/test_budget_stress.py
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from core.exceptions import InvalidInputError
+from schemas import AccountCreate, CategoryCreate, ExpenseCreate, ExpenseUpdate
+from services import AccountService, CategoryService, ExpenseService
+from benchmarks import budget_stress
+
+BUDGET = Decimal("100.00")
+AMOUNT = Decimal("7.30")
+
+
+def test_budget_holds_under_parallel_writers():
+    workers, attempts = 4, 25
+    result = budget_stress.run(workers, attempts, BUDGET, AMOUNT)
+
+    assert result.problems == []
+    assert result.total <= BUDGET
+    # Every expense that fits is accepted, and only those
+    assert result.accepted == int(BUDGET / AMOUNT)
+    assert result.rejected == workers * attempts - result.accepted
+
+
+@pytest.fixture
+def expenses(db):
+    account = AccountService(db).create_account(
+        AccountCreate(name="Main", balance=Decimal(1000))
+    )
+    categories = CategoryService(db)
+    food, fuel = (
+        categories.create_category(
+            CategoryCreate(name=name, budget=Decimal(10), type="expense")
+        )
+        for name in ("Food", "Fuel")
+    )
+    service = ExpenseService(db)
+
+    def create(category, amount, date=datetime(2025, 3, 15)):
+        return service.create_expense(
+            ExpenseCreate(
+                date=date,
+                amount=amount,
+                description="test",
+                account_id=account.id,
+                category_id=category.id,
+            )
+        )
+
+    return service, food, fuel, create
+
+
+def test_update_cannot_raise_an_expense_over_budget(expenses):
+    service, food, _, create = expenses
+    expense = create(food, Decimal(5))
+
+    with pytest.raises(InvalidInputError):
+        service.update_expense(expense.id, ExpenseUpdate(amount=Decimal(50)))
+    assert service.totals.get_total(food.id, 2025, 3) == Decimal(5)
+
+    service.update_expense(expense.id, ExpenseUpdate(amount=Decimal(10)))
+    assert service.totals.get_total(food.id, 2025, 3) == Decimal(10)
+
+
+def test_update_cannot_move_an_expense_over_budget(expenses):
+    service, food, fuel, create = expenses
+    expense = create(food, Decimal(6))
+    create(fuel, Decimal(6))
+    create(food, Decimal(6), date=datetime(2025, 4, 1))
+
+    for update in (
+        ExpenseUpdate(category_id=fuel.id),
+        ExpenseUpdate(date=datetime(2025, 4, 2)),
+    ):
+        with pytest.raises(InvalidInputError):
+            service.update_expense(expense.id, update)
+    assert service.totals.get_total(food.id, 2025, 3) == Decimal(6)
+    assert service.totals.verify() == []
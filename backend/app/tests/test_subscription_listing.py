@@ -0,0 +1,78 @@
+# fortuna/backend/app/tests/test_subscription_listing.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from schemas import AccountCreate, CategoryCreate, SubscriptionCreate
+from services import AccountService, CategoryService, SubscriptionService
+from utils.instrumentation import query_budget
+
+
+@pytest.fixture
+def subscriptions(db):
+    account = AccountService(db).create_account(
+        AccountCreate(name="Main", balance=Decimal(1000))
+    )
+    category = CategoryService(db).create_category(
+        CategoryCreate(name="Subscriptions", budget=Decimal(1000), type="expense")
+    )
+    service = SubscriptionService(db)
+    for weeks in range(1, 6):
+        # Due ``weeks`` times by now: ``weeks`` payments each
+        service.create_subscription(
+            SubscriptionCreate(
+                name=f"Weekly {weeks}",
+                amount=Decimal(5),
+                frequency="weekly",
+                next_payment=datetime.now() - timedelta(weeks=weeks - 1, hours=1),
+                category_id=category.id,
+                account_id=account.id,
+            )
+        )
+    service.create_subscription(
+        SubscriptionCreate(
+            name="Not due yet",
+            amount=Decimal(5),
+            frequency="monthly",
+            next_payment=datetime.now() + timedelta(days=3),
+            category_id=category.id,
+            account_id=account.id,
+        )
+    )
+    assert service.process_due_payments_batch().transactions == 15
+    db.expire_all()
+    return service
+
+
+def test_all_subscriptions_listing_is_one_query(subscriptions):
+    with query_budget(1):
+        listing = subscriptions.get_subscriptions_with_transactions()
+
+    counts = {item.subscription.name: len(item.transactions) for item in listing}
+    assert counts == {
+        "Not due yet": 0,
+        "Weekly 1": 1,
+        "Weekly 2": 2,
+        "Weekly 3": 3,
+        "Weekly 4": 4,
+        "Weekly 5": 5,
+    }
+    for item in listing:
+        dates = [transaction.date for transaction in item.transactions]
+        assert dates == sorted(dates, reverse=True)
+
+
+def test_limit_per_subscription_is_one_query(subscriptions):
+    with query_budget(1):
+        listing = subscriptions.get_subscriptions_with_transactions(
+            limit_per_subscription=2
+        )
+
+    assert [len(item.transactions) for item in listing] == [0, 1, 2, 2, 2, 2]
+
+
+def test_unloaded_relationship_raises(subscriptions):
+    subscription = subscriptions.get_all_subscriptions()[0]
+
+    with pytest.raises(InvalidRequestError):
+        subscription.transactions
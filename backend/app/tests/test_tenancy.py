@@ -0,0 +1,149 @@
+# fortuna/backend/app/tests/test_tenancy.py
+from datetime import datetime
+from decimal import Decimal
+import uuid
+import pytest
+from core.exceptions import NotFoundError
+from schemas import (
+    AccountCreate,
+    CategoryCreate,
+    ExpenseCreate,
+    ExpenseUpdate,
+    IncomeCreate,
+    IncomeUpdate,
+    SubscriptionCreate,
+    SubscriptionUpdate,
+    TransactionCreate,
+    TransactionUpdate,
+    UserCreate,
+)
+from services import (
+    AccountService,
+    CategoryService,
+    ExpenseService,
+    IncomeService,
+    SubscriptionService,
+    TransactionService,
+    UserService,
+)
+
+
+def _books(db):
+    # An account plus an expense and an income category
+    account = AccountService(db).create_account(
+        AccountCreate(name="Main", balance=Decimal(100))
+    )
+    categories = CategoryService(db)
+    expense, income = (
+        categories.create_category(
+            CategoryCreate(name=type_, budget=Decimal(100), type=type_)
+        )
+        for type_ in ("expense", "income")
+    )
+    return account, expense, income
+
+
+@pytest.fixture
+def other(connection):
+    # A second user's books, which the ``db`` user must not reach
+    with connection.new_session(None) as admin:
+        user = UserService(admin).create_user(
+            UserCreate(name=f"other-{uuid.uuid4().hex[:12]}")
+        )
+    session = connection.new_session(user.id)
+    yield _books(session)
+    session.close()
+
+
+def test_updates_cannot_point_at_another_users_rows(db, other):
+    account, expense_category, income_category = _books(db)
+    their_account, their_expense, their_income = other
+    date = datetime(2025, 3, 15)
+
+    expenses = ExpenseService(db)
+    expense = expenses.create_expense(
+        ExpenseCreate(
+            date=date,
+            amount=Decimal(5),
+            description="mine",
+            account_id=account.id,
+            category_id=expense_category.id,
+        )
+    )
+    for update in (
+        ExpenseUpdate(account_id=their_account.id),
+        ExpenseUpdate(category_id=their_expense.id),
+    ):
+        with pytest.raises(NotFoundError):
+            expenses.update_expense(expense.id, update)
+
+    incomes = IncomeService(db)
+    income = incomes.create_income(
+        IncomeCreate(
+            date=date,
+            amount=Decimal(5),
+            description="mine",
+            account_id=account.id,
+            category_id=income_category.id,
+        )
+    )
+    for update in (
+        IncomeUpdate(account_id=their_account.id),
+        IncomeUpdate(category_id=their_income.id),
+    ):
+        with pytest.raises(NotFoundError):
+            incomes.update_income(income.id, update)
+
+    subscriptions = SubscriptionService(db)
+    subscription = subscriptions.create_subscription(
+        SubscriptionCreate(
+            name="mine",
+            amount=Decimal(5),
+            frequency="monthly",
+            next_payment=date,
+            account_id=account.id,
+            category_id=expense_category.id,
+        )
+    )
+    for update in (
+        SubscriptionUpdate(account_id=their_account.id),
+        SubscriptionUpdate(category_id=their_expense.id),
+    ):
+        with pytest.raises(NotFoundError):
+            subscriptions.update_subscription(subscription.id, update)
+
+    db.expire_all()
+    assert expenses.get_expense(expense.id).account_id == account.id
+    assert expenses.get_expense(expense.id).category_id == expense_category.id
+    assert incomes.get_income(income.id).account_id == account.id
+    assert subscriptions.get_subscription(subscription.id).account_id == account.id
+
+
+def test_transactions_cannot_point_at_another_users_rows(db, other):
+    account, expense_category, _ = _books(db)
+    their_account, their_expense, _ = other
+    transactions = TransactionService(db)
+
+    def data(**ids):
+        return TransactionCreate(
+            date=datetime(2025, 3, 15),
+            amount=Decimal(5),
+            description="mine",
+            type="expense",
+            **{"account_id": account.id, "category_id": expense_category.id, **ids},
+        )
+
+    for create in (
+        data(account_id=their_account.id),
+        data(category_id=their_expense.id),
+    ):
+        with pytest.raises(NotFoundError):
+            transactions.create_transaction(create)
+
+    transaction = transactions.create_transaction(data())
+    for update in (
+        TransactionUpdate(account_id=their_account.id),
+        TransactionUpdate(category_id=their_expense.id),
+    ):
+        with pytest.raises(NotFoundError):
+            transactions.update_transaction(transaction.id, update)
@@ -0,0 +1,301 @@
+# fortuna/backend/app/utils/background_tasks.py
+import asyncio
+import heapq
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from core.config import get_settings
+from db import DatabaseConnection, Subscription as SubscriptionModel
+
+logger = logging.getLogger(__name__)
+
+# (next_payment, subscription_id, version)
+HeapEntry = Tuple[datetime, str, int]
+# (subscription_id, next_payment, user_id)
+ActiveRow = Tuple[str, datetime, str]
+
+# pg_try_advisory_lock key of the scheduler ("fortuna" in ASCII)
+_ADVISORY_LOCK_KEY = 0x666F7274756E61
+
+
+class RunnerLock:
+    """Held by the one process that runs the scheduler.
+
+    On Postgres a session-level advisory lock, kept on a connection of its
+    own, so it covers every host; elsewhere an exclusive lock on a file in
+    ``data_dir``, for the processes of one machine. Either way the lock
+    goes away with the process, so a crashed runner never blocks the next.
+    """
+
+    def __init__(self):
+        self._connection = None
+        self._file = None
+
+    def acquire(self) -> bool:
+        engine = DatabaseConnection().engine
+        if engine.dialect.name == "postgresql":
+            connection = engine.connect()
+            acquired = connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            )
+            connection.commit()
+            if acquired:
+                self._connection = connection
+            else:
+                connection.close()
+            return bool(acquired)
+
+        data_dir = get_settings().data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        lock_file = open(os.path.join(data_dir, "scheduler.lock"), "a+b")
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._connection is not None:
+            self._connection.close()  # Ends the session and its advisory lock
+            self._connection = None
+        if self._file is not None:
+            self._file.close()  # Closing the file releases its lock
+            self._file = None
+
+
+class SubscriptionScheduler:
+    """Charges subscriptions from inside the API process when they fall due.
+
+    Active subscriptions sit in a min-heap keyed on ``next_payment``; the
+    loop sleeps until the earliest one is due (or until :meth:`notify` wakes
+    it) instead of polling the table. Changes never search the heap: each
+    subscription has a version, and entries with an old version are dropped
+    when they surface. Database work runs on a single worker thread, so the
+    event loop never blocks and payments are never processed concurrently.
+    Due subscriptions are charged per user, each in a session acting for
+    their owner (db/tenancy.py).
+
+    Only one process runs it: :meth:`start` takes a :class:`RunnerLock`,
+    and in every other API worker it stays idle. (Payment processing is
+    safe against concurrent runners anyway, e.g. the CLI; the lock keeps
+    N workers from all doing the same work.)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        resync_seconds: float = 600.0,
+    ):
+        self.batch_size = batch_size
+        self.resync_seconds = resync_seconds
+        self._heap: List[HeapEntry] = []
+        # subscription_id -> current version; absent means not scheduled
+        self._versions: Dict[str, int] = {}
+        # subscription_id -> user_id of the scheduled ones
+        self._owners: Dict[str, str] = {}
+        self._counter = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = RunnerLock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="subscription-scheduler"
+        )
+        if not await self._in_thread(self._lock.acquire):
+            logger.info("Another process runs the subscription scheduler")
+            await self.stop()
+            return
+        await self._resync()
+        self._task = asyncio.create_task(self._run(), name="subscription-scheduler")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._lock.release()
+        self._loop = None
+
+    def notify(
+        self,
+        subscription_id: str,
+        next_payment: Optional[datetime],
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Reschedule a subscription of ``user_id``; ``None`` unschedules it
+        (deleted or inactive). Safe to call from any thread; a no-op when not
+        running.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(
+            self._schedule, subscription_id, next_payment, user_id
+        )
+
+    def _schedule(
+        self,
+        subscription_id: str,
+        next_payment: Optional[datetime],
+        user_id: Optional[str],
+    ) -> None:
+        # Event loop thread only, like every other method touching the heap
+        self._counter += 1
+        if next_payment is None or user_id is None:
+            self._versions.pop(subscription_id, None)
+            self._owners.pop(subscription_id, None)
+        else:
+            self._versions[subscription_id] = self._counter
+            self._owners[subscription_id] = user_id
+            heapq.heappush(self._heap, (next_payment, subscription_id, self._counter))
+        self._wakeup.set()
+
+    def _peek(self) -> Optional[HeapEntry]:
+        # Earliest live entry, discarding superseded ones on the way
+        while self._heap:
+            entry = self._heap[0]
+            if self._versions.get(entry[1]) == entry[2]:
+                return entry
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> Dict[str, List[str]]:
+        # Due subscription ids by owner
+        due = defaultdict(list)
+        while True:
+            entry = self._peek()
+            if entry is None or entry[0] > now:
+                return dict(due)
+            heapq.heappop(self._heap)
+            self._versions.pop(entry[1], None)
+            due[self._owners.pop(entry[1])].append(entry[1])
+
+    async def _run(self) -> None:
+        next_resync = time.monotonic() + self.resync_seconds
+        while True:
+            self._wakeup.clear()
+            now = datetime.now()
+            due = self._pop_due(now)
+            if due:
+                try:
+                    await self._in_thread(self._process, due, now)
+                except Exception:
+                    logger.exception("Processing due subscriptions failed")
+                    # Retry on the next resync rather than spinning on the error
+                continue
+            if time.monotonic() >= next_resync:
+                await self._resync()
+                next_resync = time.monotonic() + self.resync_seconds
+                continue
+
+            timeout = next_resync - time.monotonic()
+            entry = self._peek()
+            if entry is not None:
+                timeout = min(timeout, (entry[0] - now).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _in_thread(self, func, *args):
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    async def _resync(self) -> None:
+        rows = await self._in_thread(self._load_active)
+        self._counter += 1
+        self._versions = {row[0]: self._counter for row in rows}
+        self._owners = {row[0]: row[2] for row in rows}
+        self._heap = [
+            (next_payment, subscription_id, self._counter)
+            for subscription_id, next_payment, _ in rows
+        ]
+        heapq.heapify(self._heap)
+
+    # Worker thread only below this line
+
+    @staticmethod
+    def _active_query():
+        return select(
+            SubscriptionModel.id,
+            SubscriptionModel.next_payment,
+            SubscriptionModel.user_id,
+        ).where(SubscriptionModel.active == True)
+
+    def _load_active(self) -> List[ActiveRow]:
+        # Every user's, from each database they are kept in
+        rows = []
+        for session in DatabaseConnection().partitions():
+            rows.extend(session.execute(self._active_query()).all())
+        return rows
+
+    def _process(self, due: Dict[str, List[str]], now: datetime) -> None:
+        from services import SubscriptionService
+
+        for user_id, subscription_ids in due.items():
+            with DatabaseConnection().new_session(user_id) as session:
+                try:
+                    summary = SubscriptionService(session).process_due_payments_batch(
+                        now=now, batch_size=self.batch_size
+                    )
+                except Exception:
+                    # One user's failure must not hold up everyone else's
+                    # payments; theirs are retried on the next resync
+                    logger.exception("Processing subscriptions of %s failed", user_id)
+                    continue
+                logger.info(
+                    "Charged %d payments for %d subscriptions of user %s",
+                    summary.transactions,
+                    summary.subscriptions,
+                    user_id,
+                )
+                # Reschedule what was due; the processor has advanced
+                # next_payment. Anything still due could not be charged and
+                # waits for a change notification or the next resync.
+                rows = session.execute(
+                    self._active_query().where(
+                        SubscriptionModel.id.in_(subscription_ids)
+                    )
+                ).all()
+            for subscription_id, next_payment, _ in rows:
+                if next_payment > now:
+                    self.notify(subscription_id, next_payment, user_id)
+
+
+_settings = get_settings()
+
+# Process-wide scheduler, started by the API lifespan
+scheduler = SubscriptionScheduler(
+    batch_size=_settings.scheduler_batch_size,
+    resync_seconds=_settings.scheduler_resync_seconds,
+)
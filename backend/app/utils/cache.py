@@ -0,0 +1,123 @@
+# fortuna/backend/app/utils/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from core.config import get_settings
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache with a per-entry time to live.
+
+    Only hits are cached (loaders returning ``None`` are not remembered), so
+    a row created by another process is visible on the next lookup.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # Load outside the lock: a concurrent miss may load twice, which is
+        # cheaper than serialising every lookup behind one DB round trip
+        value = loader()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_if(self, predicate: Callable[[Any], bool]) -> int:
+        # Drop every entry whose value matches, e.g. all keys of one entity
+        with self._lock:
+            stale = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_settings = get_settings()
+
+# Process-wide caches of immutable Account / Category snapshots, keyed by
+# ("id", user_id, id) and ("name", user_id, lower(name)[, type]). Services
+# invalidate on write.
+account_cache = LRUCache(_settings.cache_maxsize, _settings.cache_ttl_seconds)
+category_cache = LRUCache(_settings.cache_maxsize, _settings.cache_ttl_seconds)
+# Serialized GET responses keyed by ETag (api/conditional.py). An ETag embeds
+# the resource versions, so entries never go stale, they just stop being hit.
+response_cache = LRUCache(
+    _settings.response_cache_maxsize, _settings.cache_ttl_seconds
+)
+# API key hash -> user id (services/user_service.py)
+user_cache = LRUCache(_settings.cache_maxsize, _settings.cache_ttl_seconds)
+# Database URL -> whether it has the full-text index (db/fts.py). The TTL
+# bounds how long an index created by another process goes unnoticed.
+fts_cache = LRUCache(_settings.cache_maxsize, _settings.cache_ttl_seconds)
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    return {
+        "accounts": account_cache.stats(),
+        "categories": category_cache.stats(),
+        "responses": response_cache.stats(),
+        "users": user_cache.stats(),
+        "fts": fts_cache.stats(),
+    }
+
+
+def clear_caches(entity: Optional[str] = None) -> None:
+    if entity in (None, "accounts"):
+        account_cache.clear()
+    if entity in (None, "categories"):
+        category_cache.clear()
+    if entity in (None, "responses"):
+        response_cache.clear()
+    if entity in (None, "users"):
+        user_cache.clear()
+    if entity in (None, "fts"):
+        fts_cache.clear()
@@ -0,0 +1,13 @@
+# fortuna/backend/app/utils/dates.py
+from datetime import datetime
+from typing import Tuple
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    # Half-open [start, end) bounds so date filters can seek an index
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
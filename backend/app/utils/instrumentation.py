@@ -0,0 +1,243 @@
+# fortuna/backend/app/utils/instrumentation.py
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+SECONDS_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram (thread-safe)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[Tuple[str, int]], int, float]:
+        # ([(le, cumulative count)], count, sum)
+        with self._lock:
+            cumulative, total = [], 0
+            for bound, count in zip(self.buckets, self.counts):
+                total += count
+                cumulative.append((repr(bound), total))
+            cumulative.append(("+Inf", total + self.counts[-1]))
+            return cumulative, self.count, self.sum
+
+
+@dataclass
+class CallStats:
+    # What one service call (or one query_budget block) did on the database
+    name: str
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    commits: int = 0
+    # Statement text is only kept when asked for (query budgets)
+    capture_sql: bool = False
+    sql: List[str] = field(default_factory=list)
+
+
+# name, buckets, help text; one histogram per (metric, service method)
+METRICS = {
+    "statements": (
+        "fortuna_service_statements",
+        STATEMENT_BUCKETS,
+        "SQL statements executed per service call",
+    ),
+    "db_seconds": (
+        "fortuna_service_db_seconds",
+        SECONDS_BUCKETS,
+        "Time spent in the database per service call",
+    ),
+    "rows": (
+        "fortuna_service_rows",
+        ROW_BUCKETS,
+        "Rows affected (DML) or ORM objects loaded per service call",
+    ),
+    "commits": (
+        "fortuna_service_commits",
+        STATEMENT_BUCKETS,
+        "Commits per service call",
+    ),
+    "seconds": (
+        "fortuna_service_seconds",
+        SECONDS_BUCKETS,
+        "Wall-clock duration of service calls",
+    ),
+}
+
+_histograms: Dict[Tuple[str, str], Histogram] = {}
+_histograms_lock = threading.Lock()
+# Every active CallStats of the current context, outermost first. Nested
+# service calls are inclusive: a statement counts for each enclosing call.
+_active: ContextVar[Tuple[CallStats, ...]] = ContextVar("fortuna_calls", default=())
+
+
+def _histogram(metric: str, name: str) -> Histogram:
+    key = (metric, name)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(key, Histogram(METRICS[metric][1]))
+    return histogram
+
+
+@contextmanager
+def track(
+    name: str, record: bool = True, capture_sql: bool = False
+) -> Iterator[CallStats]:
+    """Collect statement/time/row/commit counts for the enclosed block;
+    with ``record`` they also go into the per-name histograms.
+    """
+    stats = CallStats(name, capture_sql=capture_sql)
+    token = _active.set(_active.get() + (stats,))
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+        if record:
+            _histogram("seconds", name).observe(time.perf_counter() - start)
+            _histogram("statements", name).observe(stats.statements)
+            _histogram("db_seconds", name).observe(stats.db_seconds)
+            _histogram("rows", name).observe(stats.rows)
+            _histogram("commits", name).observe(stats.commits)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(
+    max_statements: int, max_commits: Optional[int] = None
+) -> Iterator[CallStats]:
+    """Fail the enclosed block if it runs more statements (or commits) than
+    allowed, e.g. ``with query_budget(5): service.create_expense(data)``.
+    The statements are listed in the error.
+    """
+    with track("query_budget", record=False, capture_sql=True) as stats:
+        yield stats
+    problems = []
+    if stats.statements > max_statements:
+        problems.append(f"{stats.statements} statements (budget {max_statements})")
+    if max_commits is not None and stats.commits > max_commits:
+        problems.append(f"{stats.commits} commits (budget {max_commits})")
+    if problems:
+        listing = "\n".join(f"  {sql}" for sql in stats.sql)
+        raise QueryBudgetExceeded(
+            f"Query budget exceeded: {', '.join(problems)}\n{listing}"
+        )
+
+
+def instrumented(cls):
+    """Class decorator: track every public method as ``Class.method``."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value):
+            continue
+        setattr(cls, attr, _wrap(value, f"{cls.__name__}.{attr}"))
+    return cls
+
+
+def _wrap(method, name: str):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with track(name):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument_engine(engine: Engine) -> None:
+    # Feed the active CallStats from the engine; no-op outside tracked calls
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _active.get():
+            conn.info.setdefault("fortuna_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        calls = _active.get()
+        if not calls:
+            return
+        started = conn.info.get("fortuna_query_start")
+        elapsed = time.perf_counter() - started.pop() if started else 0.0
+        # Affected rows for DML; SELECT rows are counted as ORM loads below,
+        # since not every driver reports them (SQLite gives -1)
+        is_dml = context is not None and (
+            context.isinsert or context.isupdate or context.isdelete
+        )
+        rows = max(cursor.rowcount, 0) if is_dml else 0
+        for stats in calls:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            stats.rows += rows
+            if stats.capture_sql:
+                stats.sql.append(" ".join(statement.split())[:200])
+
+    @event.listens_for(engine, "commit")
+    def _commit(conn):
+        for stats in _active.get():
+            stats.commits += 1
+
+
+def _count_loaded(target, context):
+    for stats in _active.get():
+        stats.rows += 1
+
+
+def instrument_orm(base) -> None:
+    # SELECT row counts are not reported by every driver; count loaded objects
+    if not event.contains(base, "load", _count_loaded):
+        event.listen(base, "load", _count_loaded, propagate=True)
+
+
+def render_prometheus() -> str:
+    """All service histograms in the Prometheus text exposition format."""
+    lines = []
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    for metric, (prom_name, _, help_text) in METRICS.items():
+        series = [(name, h) for (m, name), h in items if m == metric]
+        if not series:
+            continue
+        lines.append(f"# HELP {prom_name} {help_text}")
+        lines.append(f"# TYPE {prom_name} histogram")
+        for name, histogram in series:
+            buckets, count, total = histogram.snapshot()
+            label = f'method="{name}"'
+            for le, cumulative in buckets:
+                lines.append(f'{prom_name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{prom_name}_sum{{{label}}} {total}")
+            lines.append(f"{prom_name}_count{{{label}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    with _histograms_lock:
+        _histograms.clear()